@@ -1,8 +1,30 @@
 import streamlit as st
-import json
+import hmac
+import logging
 import os
+import time
+import uuid
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
-import streamlit.components.v1 as components
+from functools import partial
+
+import config
+from backup import BackupService
+from leaderboard import GAME_MODES, LeaderboardIndex
+from metrics import Metrics
+from piece_rng import RoundSeeds
+from player_stats import PlayerStats
+from replay_verifier import ReplayVerifier
+from score_analytics import PERCENTILES, ScoreAnalytics
+from score_export import FORMATS, date_range, export_filename, export_mime, export_to_file
+from score_store import open_store
+from score_writer import ScoreWriter
+from spectator import SharedSpectators, SpectatorHub
+from tetris_component import spectator_grid, tetris_game
+
+# 스크립트 재실행 시간 측정 시작 (끝까지 실행된 경우만 기록)
+_rerun_started = time.perf_counter()
 
 # 페이지 설정
 st.set_page_config(
@@ -11,22 +33,126 @@ st.set_page_config(
     layout="wide"
 )
 
-# 점수 데이터 파일 경로
-SCORES_FILE = "scores.json"
+# 점수 데이터 파일 경로 (이전 버전 형식, 최초 실행 시 가져오기)
+SCORES_FILE = config.SCORES_FILE
+
+@st.cache_resource
+def get_store():
+    """모든 세션이 함께 쓰는 점수 저장소 (SCORES_BACKEND: jsonl | sqlite)"""
+    store = open_store()
+    if os.path.exists(SCORES_FILE):
+        store.import_legacy_json(SCORES_FILE)
+    store.start_maintenance()
+    return store
+
+@st.cache_resource
+def get_metrics():
+    """실행 시간/저장소 계측 (DEBUG 또는 LOG_LEVEL=DEBUG일 때만 측정)"""
+    logging.basicConfig(format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    logging.getLogger("tetris").setLevel(config.LOG_LEVEL)
+    metrics = Metrics(enabled=config.METRICS_ENABLED)
+    metrics.add_gauges(lambda: {"store_" + key: value
+                                for key, value in get_store().storage_stats().items()})
+    metrics.start_reporter(config.METRICS_INTERVAL, config.METRICS_FILE or None)
+    return metrics
+
+@st.cache_resource
+def get_backup_service():
+    """주기적 백업 스레드 (BACKUP_ENABLED일 때만 호출)"""
+    service = BackupService(get_store(), config.BACKUP_DIR, interval=config.BACKUP_INTERVAL,
+                            keep=config.BACKUP_KEEP, metrics=get_metrics())
+    service.start()
+    return service
+
+@st.cache_resource
+def get_writer():
+    """모든 세션의 점수 제출을 모아 저장하는 단일 쓰기 스레드"""
+    return ScoreWriter(get_store())
+
+@st.cache_resource
+def get_verifier():
+    """제출 점수를 입력 기록 재실행으로 검증하는 프로세스 풀"""
+    return ReplayVerifier(workers=config.VERIFY_WORKERS or None)
+
+@st.cache_resource
+def get_round_seeds():
+    """서버가 게임마다 정해 주는 블록 순서 시드 (라운드 공유 가능)"""
+    # 작업 프로세스가 여러 개면 라운드를 파일로 나눠 모든 프로세스가 같은 라운드를 씀
+    path = os.path.join(config.RUNTIME_DIR, "round.json") if config.WORKERS > 1 else None
+    if path is not None:
+        os.makedirs(config.RUNTIME_DIR, exist_ok=True)
+    return RoundSeeds(config.PIECE_RANDOMIZER, shared=config.SHARED_ROUND_SEED, path=path)
+
+# 세션마다 기억해 두는 발급한 시드 수 (끝나지 않은 게임의 시드)
+ISSUED_SEEDS_KEPT = 8
+
+def current_game_seed():
+    """이 세션의 다음 게임 (시드 번호, 시드) - 공유 모드에서는 라운드가 바뀌면 새로 받음
+
+    발급한 시드는 번호별로 (시드, 블록 생성 방식)을 기억해 두고, 게임 결과는 결과에 든
+    번호의 시드로 검증합니다.
+    """
+    rounds = get_round_seeds()
+    if (st.session_state.game_seed is None
+            or (rounds.shared and st.session_state.game_round != rounds.round_id)):
+        st.session_state.game_round, st.session_state.game_seed = rounds.issue()
+        st.session_state.seed_serial += 1
+        issued = st.session_state.issued_seeds
+        issued[st.session_state.seed_serial] = (st.session_state.game_seed, rounds.randomizer)
+        while len(issued) > ISSUED_SEEDS_KEPT:
+            del issued[min(issued)]
+    return st.session_state.seed_serial, st.session_state.game_seed
+
+def renew_game_seed(used_id):
+    """게임이 지금 시드를 이미 써서 새 시드를 기다릴 때 - 새로 발급해 보냄"""
+    if used_id == st.session_state.seed_serial:
+        st.session_state.game_seed = None
+        st.rerun()
+
+@st.cache_resource
+def get_leaderboard():
+    """모든 세션이 함께 쓰는 순위표 인덱스 (모드별 상위 10개)"""
+    return LeaderboardIndex(get_store(), k=10)
+
+@st.cache_resource
+def get_player_stats():
+    """모든 세션이 함께 쓰는 학생별 집계 (저장할 때마다 해당 학생만 갱신)"""
+    stats = PlayerStats(get_store(), config.PLAYER_STATS_FILE, recent=config.PLAYER_RECENT_GAMES)
+    stats.start_saver()
+    return stats
+
+@st.cache_resource
+def get_spectator_hub():
+    """학생 게임 보드를 모아 교사 화면에 보여 주는 관전 허브"""
+    return SpectatorHub(max_sessions=config.SPECTATOR_MAX_SESSIONS, ttl=config.SPECTATOR_TTL)
+
+@st.cache_resource
+def get_shared_spectators():
+    """작업 프로세스가 여러 개일 때 관전 보드를 파일로 나눔 (교사가 어느 프로세스에 붙어도 전체가 보임)"""
+    shared = SharedSpectators(get_spectator_hub(), config.RUNTIME_DIR, config.WORKER_ID,
+                              interval=config.SPECTATOR_REFRESH_SECONDS)
+    shared.start()
+    return shared
+
+def spectator_view():
+    """교사 화면용 (version, boards, students) - 모든 작업 프로세스의 학생"""
+    if config.WORKERS > 1:
+        return get_shared_spectators().view()
+    return get_spectator_hub().view()
+
+@st.cache_resource
+def get_score_analytics():
+    """모든 세션이 함께 쓰는 점수 분석 (열 배열, 저장소 버전별 결과 캐시)"""
+    return ScoreAnalytics(get_store())
 
 def load_scores():
     """점수 데이터 로드"""
-    if os.path.exists(SCORES_FILE):
-        try:
-            with open(SCORES_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            return []
-    return []
-
-def save_score(name, mode, level, score, lines):
-    """점수 저장"""
-    scores = load_scores()
+    with get_metrics().timer("load_scores"):
+        return get_store().load()
+
+def save_score(name, mode, level, score, lines, start_level=None, seed=None,
+               randomizer=None, verified=None, hinted=False):
+    """점수 저장 (쓰기 스레드에 제출하고 저장 완료까지 대기)"""
     new_score = {
         "timestamp": datetime.now().isoformat(),
         "name": name,
@@ -35,20 +161,255 @@ def save_score(name, mode, level, score, lines):
         "score": score,
         "lines": lines
     }
-    scores.append(new_score)
-    
-    with open(SCORES_FILE, 'w', encoding='utf-8') as f:
-        json.dump(scores, f, ensure_ascii=False, indent=2)
+    if start_level is not None:
+        new_score["start_level"] = start_level
+    if seed is not None:
+        new_score["seed"] = seed
+    if randomizer is not None:
+        new_score["randomizer"] = randomizer
+    if verified is not None:
+        new_score["verified"] = verified
+    if hinted:
+        new_score["hinted"] = True
+    metrics = get_metrics()
+    with metrics.timer("save_score"):
+        get_writer().submit(new_score).result(timeout=30)
+    metrics.incr("scores_saved")
+
+def ranking_name(record):
+    """순위표에 보일 이름 (힌트를 본 게임은 💡 표시)"""
+    return record['name'] + (" 💡" if record.get("hinted") else "")
 
 def get_rankings(mode=None):
-    """순위 가져오기"""
-    scores = load_scores()
-    if mode:
-        scores = [s for s in scores if s.get('mode') == mode]
-    
-    # 점수 기준으로 정렬
-    scores.sort(key=lambda x: x.get('score', 0), reverse=True)
-    return scores[:10]  # 상위 10명만
+    """순위 가져오기 (상위 10명)"""
+    with get_metrics().timer("get_rankings"):
+        return get_leaderboard().top(mode)
+
+@st.fragment(run_every=config.LEADERBOARD_REFRESH_SECONDS)
+def leaderboard_panel():
+    """순위표 탭 - 스크립트 전체를 다시 실행하지 않고 주기적으로 갱신"""
+    # 순위표 내용이 바뀐 경우에만 다시 조회 (etag 비교)
+    etag = get_leaderboard().etag()
+    cached = st.session_state.get("leaderboard_cache")
+    if cached is None or cached[0] != etag:
+        get_metrics().incr("leaderboard_cache_miss")
+        cached = (etag, {mode: get_rankings(mode) for mode in (None,) + GAME_MODES})
+        st.session_state.leaderboard_cache = cached
+    else:
+        get_metrics().incr("leaderboard_cache_hit")
+    rankings_by_mode = cached[1]
+
+    # 순위표 탭
+    tabs = st.tabs(["전체"] + list(GAME_MODES))
+
+    with tabs[0]:
+        rankings = rankings_by_mode[None]
+        if rankings:
+            for i, record in enumerate(rankings, 1):
+                with st.container():
+                    st.write(f"**{i}위** {ranking_name(record)}")
+                    st.caption(f"점수: {record['score']:,} | 레벨: {record['level']} | 모드: {record['mode']}")
+        else:
+            st.info("아직 기록이 없습니다!")
+
+    for tab, mode in zip(tabs[1:], GAME_MODES):
+        with tab:
+            rankings = rankings_by_mode[mode]
+            if rankings:
+                for i, record in enumerate(rankings, 1):
+                    st.write(f"**{i}위** {ranking_name(record)} - {record['score']:,}점")
+            else:
+                st.info(f"{mode} 모드 기록이 없습니다!")
+
+def player_panel():
+    """학생별 기록 - 누적 집계를 바로 읽음 (전체 기록을 훑지 않음)"""
+    with get_metrics().timer("player_stats"):
+        stats = get_player_stats()
+        names = stats.names()
+        if not names:
+            st.info("아직 기록이 없습니다!")
+            return
+        last = st.session_state.last_player
+        selected = st.selectbox("학생", names,
+                                index=names.index(last) if last in names else 0)
+        player = stats.get(selected)
+    if player is None:
+        return
+
+    stat_col1, stat_col2 = st.columns(2)
+    with stat_col1:
+        st.metric("게임 수", f"{player['games']:,}")
+        st.metric("최고 레벨", player['max_level'])
+    with stat_col2:
+        st.metric("최고 점수", f"{player['best_score']:,}")
+        st.metric("누적 라인", f"{player['total_lines']:,}")
+    st.metric(f"최근 {len(player['recent'])}게임 평균", f"{player['recent_average']:,.0f}",
+              delta=None if player['trend'] is None else f"{player['trend']:+,.0f}")
+    st.caption(" | ".join(f"{mode} 최고 {score:,}" for mode, score in sorted(player['best'].items())))
+    if len(player['recent']) > 1:
+        st.line_chart([score for _, _, score in player['recent']], height=150)
+
+def publish_board(frame):
+    """게임이 보낸 관전 프레임을 허브에 반영"""
+    sid = st.session_state.spectator_id
+    label = st.session_state.last_player or f"학생 {sid[:4]}"
+    if get_spectator_hub().publish(sid, label, frame):
+        get_metrics().incr("spectator_frames")
+    if config.WORKERS > 1:
+        # 이 프로세스의 보드를 파일로 나누는 스레드 시작 (처음 한 번)
+        get_shared_spectators()
+
+@st.fragment
+def game_panel(game_mode, start_level):
+    """게임 화면 - 관전 프레임이 올 때는 이 부분만 다시 실행"""
+    # 테트리스 게임 컴포넌트 (정적 파일, 결과는 반환값으로 전달)
+    seed_id, seed = current_game_seed()
+    game_result = tetris_game(game_mode, start_level, seed=seed, seed_id=seed_id,
+                              on_seed_request=renew_game_seed,
+                              randomizer=get_round_seeds().randomizer,
+                              simulation=config.GAME_SIMULATION,
+                              das_ms=config.DAS_MS, arr_ms=config.ARR_MS,
+                              hints=config.HINTS_ENABLED,
+                              spectate_ms=config.SPECTATE_MS,
+                              board_ack=get_spectator_hub().ack(st.session_state.spectator_id),
+                              on_board=publish_board, key="tetris")
+    if game_result and game_result.get("id") != st.session_state.last_game_id:
+        st.session_state.last_game_id = game_result["id"]
+        st.session_state.game_over = True
+        st.session_state.final_score = game_result["score"]
+        st.session_state.final_level = game_result["level"]
+        st.session_state.final_lines = game_result["lines"]
+        st.session_state.final_mode = game_result["mode"]
+        st.session_state.final_start_level = game_result.get("start_level")
+        st.session_state.final_seed = game_result.get("seed")
+        st.session_state.final_randomizer = game_result.get("randomizer")
+        st.session_state.final_hinted = bool(game_result.get("hinted"))
+        # 이 게임에 발급한 시드 (한 번만 쓸 수 있도록 꺼냄)
+        issued = st.session_state.issued_seeds.pop(game_result.get("seed_id"), None)
+        # 이름을 입력하는 동안 미리 검증 시작 (서버가 이 게임에 정한 시드로 했는지도 확인)
+        if config.VERIFY_SCORES:
+            if issued is None:
+                st.session_state.verification_args = None
+                st.session_state.verification = get_verifier().reject(
+                    "서버가 이 게임에 정한 시드가 아닙니다")
+            else:
+                st.session_state.verification_args = (game_result,) + issued
+                st.session_state.verification = get_verifier().submit(
+                    game_result, expected_seed=issued[0], expected_randomizer=issued[1])
+        # 다음 게임은 새 시드로 (방금 끝난 게임이 지금 시드를 썼을 때)
+        if game_result.get("seed_id") == st.session_state.seed_serial:
+            st.session_state.game_seed = None
+        st.rerun()
+
+@st.fragment(run_every=config.SPECTATOR_REFRESH_SECONDS)
+def spectator_panel():
+    """교사용 관전 격자 - 보드마다 25바이트만 보냄"""
+    _, boards, students = spectator_view()
+    st.caption(f"게임 중인 학생 {len(students)}명")
+    spectator_grid(boards, students, columns=10, key="spectator")
+
+def analytics_table(rows):
+    """점수 분석 표 (모드/시작 레벨별 한 줄)"""
+    table = []
+    for row in rows:
+        item = {"모드": row["mode"]}
+        if "start_level" in row:
+            item["시작 레벨"] = row["start_level"]
+        item["게임 수"] = f"{row['games']:,}"
+        item["평균"] = f"{row['mean']:,.0f}"
+        for q in PERCENTILES:
+            item["중앙값" if q == 50 else f"{q}백분위"] = f"{row[f'p{q}']:,.0f}"
+        item["최고"] = f"{row['max']:,.0f}"
+        item["레벨당 라인"] = f"{row['lines_per_level']:.1f}"
+        table.append(item)
+    st.table(table)
+
+def analytics_panel():
+    """점수 분석 - 저장소가 바뀌지 않았으면 캐시된 결과를 그대로 표시"""
+    with get_metrics().timer("score_analytics"):
+        report = get_score_analytics().report()
+    if not report["records"]:
+        st.info("아직 기록이 없습니다!")
+        return
+
+    activity = report["activity"]
+    stat_col1, stat_col2, stat_col3 = st.columns(3)
+    with stat_col1:
+        st.metric("전체 게임", f"{report['records']:,}")
+    with stat_col2:
+        st.metric("학생 수", f"{report['students']:,}")
+    with stat_col3:
+        st.metric("활동한 날", f"{sum(1 for games in activity['games'] if games):,}")
+
+    st.subheader("모드별 점수")
+    analytics_table(report["modes"])
+    with st.expander("모드 × 시작 레벨별"):
+        analytics_table(report["groups"])
+
+    st.subheader("점수 분포")
+    histogram = report["histogram"]
+    st.bar_chart(dict({"점수": histogram["edges"][:-1]}, **histogram["counts"]), x="점수")
+
+    if activity["dates"]:
+        st.subheader("날짜별 활동")
+        st.line_chart({"날짜": activity["dates"], "게임 수": activity["games"],
+                       "학생 수": activity["students"]}, x="날짜")
+    st.caption(f"기록 {report['records']:,}개 계산 {report['compute_ms']:.0f}ms "
+               "(기록이 바뀔 때만 다시 계산)")
+
+def export_download(store, metrics, fmt, compress, conditions):
+    """내려받기 버튼을 눌렀을 때 만드는 내보내기 파일"""
+    with metrics.timer("export_scores"):
+        return export_to_file(store, fmt, compress, **conditions)
+
+def export_panel():
+    """점수 기록 내보내기 - 거른 기록을 한 건씩 읽어 파일로 (전체 기록을 메모리에 올리지 않음)"""
+    period = st.date_input("기간 (비우면 전체)", value=(), key="export_period")
+    filter_col1, filter_col2 = st.columns(2)
+    with filter_col1:
+        mode = st.selectbox("모드", ["전체"] + list(GAME_MODES), key="export_mode")
+    with filter_col2:
+        name = st.selectbox("학생", ["전체"] + get_player_stats().names(), key="export_name")
+    format_col, gzip_col = st.columns(2)
+    with format_col:
+        fmt = st.radio("형식", FORMATS, horizontal=True, key="export_format",
+                       format_func=lambda value: {"csv": "CSV (Excel)", "jsonl": "JSONL"}[value])
+    with gzip_col:
+        compress = st.checkbox("gzip 압축", value=True, key="export_gzip",
+                               help="기록이 많으면 파일이 열 배 가까이 작아집니다")
+
+    since, until = date_range(period[0] if period else None,
+                              period[1] if len(period) > 1 else None)
+    conditions = {"mode": None if mode == "전체" else mode,
+                  "name": None if name == "전체" else name,
+                  "since": since, "until": until}
+    file_name = export_filename(fmt, compress, **conditions)
+    # 파일은 누를 때 임시 파일로 만들어 넘김 (세션 상태에는 내용을 두지 않음)
+    st.download_button(f"⬇️ {file_name}",
+                       partial(export_download, get_store(), get_metrics(), fmt, compress,
+                               conditions),
+                       file_name=file_name, mime=export_mime(fmt, compress),
+                       on_click="ignore")
+
+def teacher_page():
+    """교사용 화면 - 관전, 점수 분석, 내보내기 (?view=teacher, 관리자 비밀번호 필요)"""
+    st.title("👀 교사용 화면")
+    if not st.session_state.get("teacher_ok"):
+        password = st.text_input("관리자 비밀번호", type="password", key="teacher_password")
+        if st.button("입장"):
+            if config.ADMIN_PASSWORD and hmac.compare_digest(password, config.ADMIN_PASSWORD):
+                st.session_state.teacher_ok = True
+                st.rerun()
+            else:
+                st.error("비밀번호가 올바르지 않습니다!")
+        return
+    spectate_tab, analytics_tab, export_tab = st.tabs(["👀 관전", "📊 점수 분석", "📥 내보내기"])
+    with spectate_tab:
+        spectator_panel()
+    with analytics_tab:
+        analytics_panel()
+    with export_tab:
+        export_panel()
 
 # 세션 상태 초기화
 if 'game_over' not in st.session_state:
@@ -59,6 +420,42 @@ if 'final_level' not in st.session_state:
     st.session_state.final_level = 1
 if 'final_lines' not in st.session_state:
     st.session_state.final_lines = 0
+if 'final_mode' not in st.session_state:
+    st.session_state.final_mode = None
+if 'final_start_level' not in st.session_state:
+    st.session_state.final_start_level = None
+if 'final_seed' not in st.session_state:
+    st.session_state.final_seed = None
+if 'final_randomizer' not in st.session_state:
+    st.session_state.final_randomizer = None
+if 'final_hinted' not in st.session_state:
+    st.session_state.final_hinted = False
+if 'game_seed' not in st.session_state:
+    st.session_state.game_seed = None
+if 'game_round' not in st.session_state:
+    st.session_state.game_round = None
+if 'seed_serial' not in st.session_state:
+    st.session_state.seed_serial = 0
+if 'issued_seeds' not in st.session_state:
+    st.session_state.issued_seeds = {}
+if 'verification' not in st.session_state:
+    st.session_state.verification = None
+if 'verification_args' not in st.session_state:
+    st.session_state.verification_args = None
+if 'last_game_id' not in st.session_state:
+    st.session_state.last_game_id = None
+if 'last_player' not in st.session_state:
+    st.session_state.last_player = None
+if 'spectator_id' not in st.session_state:
+    st.session_state.spectator_id = uuid.uuid4().hex
+
+# 교사용 관전 화면은 게임 화면 대신 표시
+if st.query_params.get("view") == "teacher":
+    teacher_page()
+    st.stop()
+
+if config.BACKUP_ENABLED:
+    get_backup_service()
 
 # 메인 타이틀
 st.title("🎮 학생들과 함께하는 테트리스")
@@ -89,6 +486,50 @@ with st.sidebar:
     - **스페이스** : 한번에 떨어뜨리기
     """)
 
+    # 라운드 (모든 학생이 같은 블록 순서로 경기)
+    rounds = get_round_seeds()
+    if rounds.shared:
+        with st.expander(f"🏁 라운드 {rounds.round_id}"):
+            st.caption("이번 라운드에는 모든 학생에게 같은 순서로 블록이 나옵니다.")
+            admin_password = st.text_input("관리자 비밀번호", type="password", key="round_password")
+            if st.button("새 라운드 시작"):
+                if config.ADMIN_PASSWORD and hmac.compare_digest(admin_password, config.ADMIN_PASSWORD):
+                    rounds.new_round()
+                    st.rerun()
+                else:
+                    st.error("비밀번호가 올바르지 않습니다!")
+
+    # 점수 검증 현황
+    if config.VERIFY_SCORES:
+        with st.expander("🔍 점수 검증"):
+            stats = get_verifier().stats()
+            st.write(f"통과 {stats['verified']}건 | 거부 {stats['rejected']}건")
+            if stats["p50_ms"] is not None:
+                st.caption(f"검증 시간: p50 {stats['p50_ms']:.0f}ms | p99 {stats['p99_ms']:.0f}ms")
+
+    # 계측 패널 (DEBUG=true)
+    if config.DEBUG:
+        with st.expander("🛠️ 디버그 계측"):
+            snapshot = get_metrics().snapshot()
+            st.table([
+                {"구간": name, "횟수": summary["count"],
+                 "p50 ms": summary["p50_ms"], "p99 ms": summary["p99_ms"],
+                 "최대 ms": summary["max_ms"]}
+                for name, summary in sorted(snapshot["timers"].items())
+            ])
+            for name, value in sorted(snapshot["counters"].items()):
+                st.caption(f"{name}: {value:,}")
+            for name, value in sorted(snapshot["gauges"].items()):
+                if value is not None:
+                    st.caption(f"{name}: {value:,}")
+            if config.BACKUP_ENABLED:
+                service = get_backup_service()
+                if service.last_error:
+                    st.caption(f"백업 실패: {service.last_error}")
+                elif service.last:
+                    st.caption(f"마지막 백업: {service.last['file']} "
+                               f"({service.last['bytes']:,}바이트, {service.last['seconds']:.2f}초)")
+
 # 메인 영역
 col1, col2 = st.columns([2, 1])
 
@@ -105,457 +546,14 @@ with col1:
         with status_col3:
             st.metric("목표", f"{start_level * 10} 라인")
     
-    # 테트리스 게임 HTML
-    tetris_html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <style>
-            body {{
-                margin: 0;
-                padding: 20px;
-                background: #222;
-                color: white;
-                font-family: Arial, sans-serif;
-                display: flex;
-                justify-content: center;
-                align-items: center;
-                min-height: 80vh;
-            }}
-            .game-container {{
-                display: flex;
-                gap: 20px;
-                align-items: flex-start;
-            }}
-            .game-board {{
-                border: 3px solid #fff;
-                background: #000;
-            }}
-            .info-panel {{
-                background: #333;
-                padding: 20px;
-                border-radius: 10px;
-                min-width: 200px;
-            }}
-            .next-piece {{
-                width: 80px;
-                height: 80px;
-                border: 2px solid #666;
-                background: #111;
-                margin: 10px 0;
-            }}
-            .score {{
-                font-size: 18px;
-                margin: 10px 0;
-            }}
-            .game-over {{
-                position: absolute;
-                top: 50%;
-                left: 50%;
-                transform: translate(-50%, -50%);
-                background: rgba(0,0,0,0.9);
-                padding: 30px;
-                border-radius: 15px;
-                text-align: center;
-                border: 3px solid #ff4444;
-            }}
-            button {{
-                background: #4CAF50;
-                color: white;
-                border: none;
-                padding: 10px 20px;
-                font-size: 16px;
-                border-radius: 5px;
-                cursor: pointer;
-                margin: 5px;
-            }}
-            button:hover {{
-                background: #45a049;
-            }}
-            .restart-btn {{
-                background: #ff4444;
-            }}
-            .restart-btn:hover {{
-                background: #cc3333;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="game-container">
-            <canvas id="gameCanvas" class="game-board" width="300" height="600"></canvas>
-            <div class="info-panel">
-                <h3>게임 정보</h3>
-                <div class="score">점수: <span id="score">0</span></div>
-                <div class="score">레벨: <span id="level">{start_level}</span></div>
-                <div class="score">라인: <span id="lines">0</span></div>
-                <div class="score">모드: {game_mode}</div>
-                
-                <h4>다음 블록</h4>
-                <canvas id="nextCanvas" class="next-piece" width="80" height="80"></canvas>
-                
-                <button onclick="startGame()">게임 시작</button>
-                <button onclick="pauseGame()">일시정지</button>
-                <button class="restart-btn" onclick="restartGame()">다시시작</button>
-            </div>
-        </div>
-        
-        <div id="gameOverModal" class="game-over" style="display: none;">
-            <h2>🎯 게임 종료!</h2>
-            <p>최종 점수: <span id="finalScore">0</span></p>
-            <p>도달 레벨: <span id="finalLevel">1</span></p>
-            <p>제거 라인: <span id="finalLines">0</span></p>
-            <button onclick="saveScore()">점수 저장하기</button>
-            <button class="restart-btn" onclick="restartGame()">다시 게임</button>
-        </div>
-
-        <script>
-            const canvas = document.getElementById('gameCanvas');
-            const ctx = canvas.getContext('2d');
-            const nextCanvas = document.getElementById('nextCanvas');
-            const nextCtx = nextCanvas.getContext('2d');
-            
-            const BOARD_WIDTH = 10;
-            const BOARD_HEIGHT = 20;
-            const CELL_SIZE = 30;
-            
-            let board = Array(BOARD_HEIGHT).fill().map(() => Array(BOARD_WIDTH).fill(0));
-            let currentPiece = null;
-            let nextPiece = null;
-            let score = 0;
-            let level = {start_level};
-            let lines = 0;
-            let gameRunning = false;
-            let gameLoop = null;
-            
-            // 게임 속도 설정
-            const speeds = {{
-                'Easy': 800,
-                'Normal': 500,
-                'Hard': 300
-            }};
-            let dropSpeed = speeds['{game_mode}'];
-            
-            // 테트리스 블록 정의
-            const pieces = [
-                // I
-                [[[1,1,1,1]]],
-                // O  
-                [[[1,1],[1,1]]],
-                // T
-                [[[0,1,0],[1,1,1]], [[1,0],[1,1],[1,0]], [[1,1,1],[0,1,0]], [[0,1],[1,1],[0,1]]],
-                // S
-                [[[0,1,1],[1,1,0]], [[1,0],[1,1],[0,1]]],
-                // Z
-                [[[1,1,0],[0,1,1]], [[0,1],[1,1],[1,0]]],
-                // J
-                [[[1,0,0],[1,1,1]], [[1,1],[1,0],[1,0]], [[1,1,1],[0,0,1]], [[0,1],[0,1],[1,1]]],
-                // L
-                [[[0,0,1],[1,1,1]], [[1,0],[1,0],[1,1]], [[1,1,1],[1,0,0]], [[1,1],[0,1],[0,1]]]
-            ];
-            
-            const colors = ['#00f', '#0f0', '#f00', '#ff0', '#f0f', '#0ff', '#ffa500'];
-            
-            function createPiece() {{
-                const pieceIndex = Math.floor(Math.random() * pieces.length);
-                return {{
-                    shape: pieces[pieceIndex][0],
-                    x: Math.floor(BOARD_WIDTH / 2) - 1,
-                    y: 0,
-                    color: colors[pieceIndex],
-                    rotations: pieces[pieceIndex],
-                    currentRotation: 0
-                }};
-            }}
-            
-            function drawCell(ctx, x, y, color) {{
-                ctx.fillStyle = color;
-                ctx.fillRect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE);
-                ctx.strokeStyle = '#333';
-                ctx.strokeRect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE);
-            }}
-            
-            function drawBoard() {{
-                ctx.clearRect(0, 0, canvas.width, canvas.height);
-                
-                // 고정된 블록 그리기
-                for (let y = 0; y < BOARD_HEIGHT; y++) {{
-                    for (let x = 0; x < BOARD_WIDTH; x++) {{
-                        if (board[y][x]) {{
-                            drawCell(ctx, x, y, board[y][x]);
-                        }}
-                    }}
-                }}
-                
-                // 현재 블록 그리기
-                if (currentPiece) {{
-                    for (let y = 0; y < currentPiece.shape.length; y++) {{
-                        for (let x = 0; x < currentPiece.shape[y].length; x++) {{
-                            if (currentPiece.shape[y][x]) {{
-                                drawCell(ctx, currentPiece.x + x, currentPiece.y + y, currentPiece.color);
-                            }}
-                        }}
-                    }}
-                }}
-            }}
-            
-            function drawNextPiece() {{
-                nextCtx.clearRect(0, 0, nextCanvas.width, nextCanvas.height);
-                if (nextPiece) {{
-                    const cellSize = 15;
-                    for (let y = 0; y < nextPiece.shape.length; y++) {{
-                        for (let x = 0; x < nextPiece.shape[y].length; x++) {{
-                            if (nextPiece.shape[y][x]) {{
-                                nextCtx.fillStyle = nextPiece.color;
-                                nextCtx.fillRect(x * cellSize + 10, y * cellSize + 10, cellSize, cellSize);
-                            }}
-                        }}
-                    }}
-                }}
-            }}
-            
-            function canMove(piece, dx, dy, rotation = null) {{
-                const shape = rotation !== null ? piece.rotations[rotation] : piece.shape;
-                for (let y = 0; y < shape.length; y++) {{
-                    for (let x = 0; x < shape[y].length; x++) {{
-                        if (shape[y][x]) {{
-                            const newX = piece.x + x + dx;
-                            const newY = piece.y + y + dy;
-                            
-                            if (newX < 0 || newX >= BOARD_WIDTH || newY >= BOARD_HEIGHT) {{
-                                return false;
-                            }}
-                            if (newY >= 0 && board[newY][newX]) {{
-                                return false;
-                            }}
-                        }}
-                    }}
-                }}
-                return true;
-            }}
-            
-            function placePiece() {{
-                for (let y = 0; y < currentPiece.shape.length; y++) {{
-                    for (let x = 0; x < currentPiece.shape[y].length; x++) {{
-                        if (currentPiece.shape[y][x]) {{
-                            board[currentPiece.y + y][currentPiece.x + x] = currentPiece.color;
-                        }}
-                    }}
-                }}
-                
-                // 라인 체크 및 제거
-                clearLines();
-                
-                // 새 블록 생성
-                currentPiece = nextPiece;
-                nextPiece = createPiece();
-                
-                // 게임 오버 체크
-                if (!canMove(currentPiece, 0, 0)) {{
-                    gameOver();
-                }}
-            }}
-            
-            function clearLines() {{
-                let linesCleared = 0;
-                for (let y = BOARD_HEIGHT - 1; y >= 0; y--) {{
-                    if (board[y].every(cell => cell !== 0)) {{
-                        board.splice(y, 1);
-                        board.unshift(Array(BOARD_WIDTH).fill(0));
-                        linesCleared++;
-                        y++; // 같은 줄 다시 체크
-                    }}
-                }}
-                
-                if (linesCleared > 0) {{
-                    lines += linesCleared;
-                    score += linesCleared * 100 * level;
-                    level = Math.floor(lines / 10) + {start_level};
-                    
-                    // 레벨에 따른 속도 조정
-                    dropSpeed = Math.max(speeds['{game_mode}'] - (level - {start_level}) * 50, 100);
-                    
-                    updateDisplay();
-                }}
-            }}
-            
-            function updateDisplay() {{
-                document.getElementById('score').textContent = score;
-                document.getElementById('level').textContent = level;
-                document.getElementById('lines').textContent = lines;
-            }}
-            
-            function gameLoop() {{
-                if (!gameRunning) return;
-                
-                if (canMove(currentPiece, 0, 1)) {{
-                    currentPiece.y++;
-                }} else {{
-                    placePiece();
-                }}
-                
-                drawBoard();
-                drawNextPiece();
-                
-                setTimeout(() => {{
-                    if (gameRunning) {{
-                        gameLoop();
-                    }}
-                }}, dropSpeed);
-            }}
-            
-            function startGame() {{
-                if (!gameRunning) {{
-                    gameRunning = true;
-                    if (!currentPiece) {{
-                        currentPiece = createPiece();
-                        nextPiece = createPiece();
-                    }}
-                    gameLoop();
-                }}
-            }}
-            
-            function pauseGame() {{
-                gameRunning = !gameRunning;
-                if (gameRunning) {{
-                    gameLoop();
-                }}
-            }}
-            
-            function restartGame() {{
-                board = Array(BOARD_HEIGHT).fill().map(() => Array(BOARD_WIDTH).fill(0));
-                currentPiece = null;
-                nextPiece = null;
-                score = 0;
-                level = {start_level};
-                lines = 0;
-                gameRunning = false;
-                document.getElementById('gameOverModal').style.display = 'none';
-                updateDisplay();
-                drawBoard();
-            }}
-            
-            function gameOver() {{
-                gameRunning = false;
-                document.getElementById('finalScore').textContent = score;
-                document.getElementById('finalLevel').textContent = level;
-                document.getElementById('finalLines').textContent = lines;
-                document.getElementById('gameOverModal').style.display = 'block';
-                
-                // Streamlit에 게임 결과 전달
-                window.parent.postMessage({{
-                    type: 'gameOver',
-                    score: score,
-                    level: level,
-                    lines: lines,
-                    mode: '{game_mode}'
-                }}, '*');
-            }}
-            
-            function saveScore() {{
-                window.parent.postMessage({{
-                    type: 'saveScore',
-                    score: score,
-                    level: level,
-                    lines: lines,
-                    mode: '{game_mode}'
-                }}, '*');
-            }}
-            
-            // 키보드 이벤트
-            document.addEventListener('keydown', (e) => {{
-                if (!gameRunning || !currentPiece) return;
-                
-                switch(e.key) {{
-                    case 'ArrowLeft':
-                        e.preventDefault();
-                        if (canMove(currentPiece, -1, 0)) {{
-                            currentPiece.x--;
-                            drawBoard();
-                        }}
-                        break;
-                    case 'ArrowRight':
-                        e.preventDefault();
-                        if (canMove(currentPiece, 1, 0)) {{
-                            currentPiece.x++;
-                            drawBoard();
-                        }}
-                        break;
-                    case 'ArrowDown':
-                        e.preventDefault();
-                        if (canMove(currentPiece, 0, 1)) {{
-                            currentPiece.y++;
-                            drawBoard();
-                        }}
-                        break;
-                    case 'ArrowUp':
-                        e.preventDefault();
-                        const nextRotation = (currentPiece.currentRotation + 1) % currentPiece.rotations.length;
-                        if (canMove(currentPiece, 0, 0, nextRotation)) {{
-                            currentPiece.currentRotation = nextRotation;
-                            currentPiece.shape = currentPiece.rotations[nextRotation];
-                            drawBoard();
-                        }}
-                        break;
-                    case ' ':
-                        e.preventDefault();
-                        while (canMove(currentPiece, 0, 1)) {{
-                            currentPiece.y++;
-                        }}
-                        drawBoard();
-                        break;
-                }}
-            }});
-            
-            // 초기 화면 그리기
-            drawBoard();
-            updateDisplay();
-        </script>
-    </body>
-    </html>
-    """
-    
-    # 게임 컴포넌트 렌더링
-    game_component = components.html(tetris_html, height=700)
+    game_panel(game_mode, start_level)
 
 with col2:
     st.header("🏆 실시간 순위표")
-    
-    # 순위표 탭
-    tab1, tab2, tab3, tab4 = st.tabs(["전체", "Easy", "Normal", "Hard"])
-    
-    with tab1:
-        rankings = get_rankings()
-        if rankings:
-            for i, record in enumerate(rankings, 1):
-                with st.container():
-                    st.write(f"**{i}위** {record['name']}")
-                    st.caption(f"점수: {record['score']:,} | 레벨: {record['level']} | 모드: {record['mode']}")
-        else:
-            st.info("아직 기록이 없습니다!")
-    
-    with tab2:
-        rankings = get_rankings("Easy")
-        if rankings:
-            for i, record in enumerate(rankings, 1):
-                st.write(f"**{i}위** {record['name']} - {record['score']:,}점")
-        else:
-            st.info("Easy 모드 기록이 없습니다!")
-    
-    with tab3:
-        rankings = get_rankings("Normal")  
-        if rankings:
-            for i, record in enumerate(rankings, 1):
-                st.write(f"**{i}위** {record['name']} - {record['score']:,}점")
-        else:
-            st.info("Normal 모드 기록이 없습니다!")
-    
-    with tab4:
-        rankings = get_rankings("Hard")
-        if rankings:
-            for i, record in enumerate(rankings, 1):
-                st.write(f"**{i}위** {record['name']} - {record['score']:,}점")
-        else:
-            st.info("Hard 모드 기록이 없습니다!")
+    leaderboard_panel()
+
+    st.header("👤 학생별 기록")
+    player_panel()
 
 # 점수 저장 처리
 if st.session_state.game_over:
@@ -574,34 +572,44 @@ if st.session_state.game_over:
             st.metric("제거 라인", st.session_state.final_lines)
         
         if st.form_submit_button("점수 저장", use_container_width=True):
-            if player_name.strip():
+            verified, reason, pending = None, "", None
+            if st.session_state.verification is not None:
+                try:
+                    verified, reason = st.session_state.verification.result(timeout=30)
+                except FutureTimeoutError:
+                    # 검증은 계속 진행 중 - 기록은 그대로 두고 다시 누르면 이어서 기다림
+                    pending = "점수를 검증하는 중입니다."
+                except BrokenProcessPool:
+                    # 검증 프로세스가 멈춤 - 새 풀에 다시 맡기고 다시 누르면 그 결과를 기다림
+                    pending = "점수 검증 프로세스가 멈춰 다시 검증합니다."
+                    game_result, seed, randomizer = st.session_state.verification_args
+                    st.session_state.verification = get_verifier().submit(
+                        game_result, expected_seed=seed, expected_randomizer=randomizer)
+            if pending:
+                st.error(f"{pending} 잠시 뒤 다시 '점수 저장'을 눌러 주세요.")
+            elif not player_name.strip():
+                st.error("이름을 입력해주세요!")
+            elif verified is False:
+                st.error(f"점수를 검증하지 못해 저장할 수 없습니다: {reason}")
+            else:
                 save_score(
                     player_name.strip(),
-                    game_mode,
+                    st.session_state.final_mode or game_mode,
                     st.session_state.final_level,
                     st.session_state.final_score,
-                    st.session_state.final_lines
+                    st.session_state.final_lines,
+                    start_level=st.session_state.final_start_level,
+                    seed=st.session_state.final_seed,
+                    randomizer=st.session_state.final_randomizer,
+                    verified=verified,
+                    hinted=st.session_state.final_hinted
                 )
                 st.success(f"{player_name}님의 점수가 저장되었습니다!")
+                st.session_state.last_player = player_name.strip()
                 st.session_state.game_over = False
+                st.session_state.verification = None
+                st.session_state.verification_args = None
                 st.rerun()
-            else:
-                st.error("이름을 입력해주세요!")
-
-# JavaScript 메시지 수신 처리
-components.html("""
-<script>
-window.addEventListener('message', function(event) {
-    if (event.data.type === 'gameOver') {
-        // 게임 오버 정보를 Streamlit에 전달
-        console.log('Game Over:', event.data);
-    } else if (event.data.type === 'saveScore') {
-        // 점수 저장 요청
-        console.log('Save Score:', event.data);
-    }
-});
-</script>
-""", height=0)
 
 # 푸터
 st.divider()
@@ -610,4 +618,6 @@ st.markdown("""
     <p>🎮 학생들과 함께하는 테트리스 게임 | Made with ❤️ using Streamlit</p>
     <p>키보드 조작: ←→ 이동, ↑ 회전, ↓ 빠른 낙하, 스페이스 즉시 낙하</p>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+get_metrics().observe("rerun", time.perf_counter() - _rerun_started)
\ No newline at end of file
@@ -0,0 +1,268 @@
+"""점수 저장소 백업 - 주기적 압축 스냅샷(전체 + 증분)과 복원
+
+백업 폴더에는 gzip으로 압축한 JSONL 파일과 목록(manifest.json)이 있습니다.
+전체 백업 뒤에는 그 사이에 추가된 기록만 담은 증분 백업이 이어지며, 전체 백업
+하나와 뒤따르는 증분 백업들을 묶어 '체인'이라 부릅니다. 오래된 체인은 keep개만
+남기고 지웁니다.
+
+python backup.py backup            # 지금 백업
+python backup.py list              # 백업 목록
+python backup.py restore [파일]    # 해당 시점(기본: 마지막 백업)으로 복원
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+
+from file_lock import FileLock
+from score_store import _dump_line, _parse_jsonl
+
+logger = logging.getLogger("tetris.backup")
+
+MANIFEST = "manifest.json"
+
+
+def load_manifest(directory):
+    """백업 목록 {"entries": [...], "force_full": bool}"""
+    path = os.path.join(directory, MANIFEST)
+    if not os.path.exists(path):
+        return {"entries": [], "force_full": False}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_manifest(directory, manifest):
+    path = os.path.join(directory, MANIFEST)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+
+
+def _store_identity(store):
+    """저장소 종류와 위치 (백엔드나 저장 파일이 바뀌면 달라짐)"""
+    location = next((getattr(store, attr) for attr in ("path", "directory", "log_path")
+                     if getattr(store, attr, None)), "")
+    return "%s:%s" % (type(store).__name__, os.path.abspath(location) if location else "")
+
+
+def _fingerprint(record):
+    return hashlib.sha1(_dump_line(record).encode("utf-8")).hexdigest()
+
+
+def _read_backup_file(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return _parse_jsonl(f)
+
+
+def restore_records(directory, upto=None):
+    """upto(백업 파일 이름, 기본: 마지막) 시점의 전체 기록"""
+    entries = load_manifest(directory)["entries"]
+    if upto is not None:
+        names = [entry["file"] for entry in entries]
+        if upto not in names:
+            raise ValueError("백업 목록에 없는 파일입니다: %s" % upto)
+        entries = entries[:names.index(upto) + 1]
+    if not entries:
+        raise ValueError("%s: 백업이 없습니다" % directory)
+    chain = entries[-1]["chain"]
+    records = []
+    for entry in entries:
+        if entry["chain"] == chain:
+            records.extend(_read_backup_file(os.path.join(directory, entry["file"])))
+    return records
+
+
+class BackupService:
+    """백그라운드 백업 스레드
+
+    저장소의 records_after()로 지난 백업 뒤에 추가된 기록만 읽어 압축하므로 기록이
+    많아도 저장/화면 갱신을 오래 막지 않습니다. 여러 프로세스가 같은 폴더를 써도
+    잠금 파일로 한 번에 하나만 백업하고, 다른 프로세스가 방금 백업했으면 건너뜁니다.
+    """
+
+    def __init__(self, store, directory="backups", interval=3600, keep=5, full_every=24,
+                 metrics=None):
+        self.store = store
+        self.directory = directory
+        self.interval = interval
+        self.keep = keep
+        self.full_every = full_every
+        self.metrics = metrics
+        self.last = None
+        self.last_error = None
+        os.makedirs(directory, exist_ok=True)
+        self._lock = FileLock(os.path.join(directory, ".lock"))
+        self._thread_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def backup(self, full=False, min_age=0):
+        """백업 한 번 → 목록 항목 dict (min_age초 안에 백업이 있었으면 None)"""
+        with self._thread_lock, self._lock:
+            manifest = load_manifest(self.directory)
+            entries = manifest["entries"]
+            store_kind = type(self.store).__name__
+            identity = _store_identity(self.store)
+            last = entries[-1] if entries else None
+            if last is not None and time.time() - last["created"] < min_age:
+                return None
+
+            started = time.perf_counter()
+            kind = "full"
+            if not (full or last is None or manifest.get("force_full")
+                    or last.get("identity") != identity
+                    or sum(e["chain"] == last["chain"] for e in entries) > self.full_every):
+                records, position = self._records_since(last)
+                if records is not None:
+                    kind = "incremental"
+            if kind == "full":
+                records, position = self.store.records_after(0)
+            name = "scores-%s-%s.jsonl.gz" % (datetime.now().strftime("%Y%m%d-%H%M%S-%f"), kind)
+            path = os.path.join(self.directory, name)
+            with gzip.open(path + ".tmp", "wt", encoding="utf-8") as f:
+                for record in records:
+                    f.write(_dump_line(record))
+            os.replace(path + ".tmp", path)
+            entry = {
+                "file": name,
+                "kind": kind,
+                "chain": name if kind == "full" else last["chain"],
+                "store": store_kind,
+                "identity": identity,
+                "position": position,
+                "last_record": _fingerprint(records[-1]) if records else (
+                    last["last_record"] if kind == "incremental" else None),
+                "records": len(records),
+                "bytes": os.path.getsize(path),
+                "seconds": time.perf_counter() - started,
+                "created": time.time(),
+            }
+            entries.append(entry)
+            manifest["force_full"] = False
+            self._rotate(manifest)
+            _save_manifest(self.directory, manifest)
+
+        self.last = entry
+        logger.info("백업 %s: 기록 %d개, %d바이트, %.2f초", name, entry["records"],
+                    entry["bytes"], entry["seconds"])
+        if self.metrics is not None:
+            self.metrics.observe("backup", entry["seconds"])
+            self.metrics.incr("backup_bytes", entry["bytes"])
+        return entry
+
+    def _records_since(self, last):
+        """지난 백업 뒤의 기록과 전체 기록 수 - 저장소가 그 백업과 이어지지 않으면
+        (기록이 줄었거나 지난 백업의 마지막 기록이 달라졌으면) (None, None)
+
+        지난 백업의 마지막 기록부터 읽어, 복원/교체로 기록 수가 같거나 많아도 내용이
+        바뀐 경우를 알아냅니다.
+        """
+        position = last["position"]
+        if position == 0:
+            return self.store.records_after(0)
+        records, count = self.store.records_after(position - 1)
+        if count < position or not records or _fingerprint(records[0]) != last.get("last_record"):
+            logger.warning("저장소가 지난 백업(%s)과 이어지지 않아 전체 백업합니다 "
+                           "(기록 %d개, 백업 위치 %d)", last["file"], count, position)
+            return None, None
+        return records[1:], count
+
+    def _rotate(self, manifest):
+        """최근 keep개 체인만 남기고 오래된 백업 파일 삭제"""
+        chains = []
+        for entry in manifest["entries"]:
+            if entry["chain"] not in chains:
+                chains.append(entry["chain"])
+        expired = set(chains[:-self.keep]) if self.keep > 0 else set()
+        kept = []
+        for entry in manifest["entries"]:
+            if entry["chain"] in expired:
+                path = os.path.join(self.directory, entry["file"])
+                if os.path.exists(path):
+                    os.remove(path)
+            else:
+                kept.append(entry)
+        manifest["entries"] = kept
+
+    def start(self):
+        """interval초마다 백업하는 스레드 시작"""
+        if self._thread is not None:
+            return
+
+        def run():
+            while not self._stop.wait(self.interval):
+                try:
+                    self.backup(min_age=self.interval / 2)
+                    self.last_error = None
+                except Exception as exc:
+                    # 다음 주기에 다시 시도
+                    self.last_error = str(exc)
+                    logger.exception("백업 실패")
+
+        self._thread = threading.Thread(target=run, name="score-backup", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def main():
+    import config
+    from score_store import BACKENDS, open_store
+
+    parser = argparse.ArgumentParser(description="점수 저장소 백업/복원")
+    parser.add_argument("--backend", choices=BACKENDS, default=config.SCORES_BACKEND,
+                        help="저장소 종류 (기본값: SCORES_BACKEND)")
+    parser.add_argument("--dir", default=config.BACKUP_DIR, help="백업 폴더 (기본값: BACKUP_DIR)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    backup_parser = sub.add_parser("backup", help="지금 백업")
+    backup_parser.add_argument("--full", action="store_true", help="증분이 아닌 전체 백업")
+    sub.add_parser("list", help="백업 목록")
+    restore_parser = sub.add_parser("restore", help="백업 시점으로 저장소 복원")
+    restore_parser.add_argument("file", nargs="?", help="복원할 백업 파일 이름 (기본: 마지막)")
+    restore_parser.add_argument("--yes", action="store_true", help="확인 없이 바로 복원")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for entry in load_manifest(args.dir)["entries"]:
+            print("%s  %-11s 기록 %7d개  %9d바이트  %.2f초" % (
+                entry["file"], entry["kind"], entry["records"], entry["bytes"], entry["seconds"]))
+        return
+
+    store = open_store(args.backend)
+    try:
+        if args.command == "backup":
+            service = BackupService(store, args.dir, keep=config.BACKUP_KEEP)
+            entry = service.backup(full=args.full)
+            print("%s: 기록 %d개, %d바이트, %.2f초" % (
+                entry["file"], entry["records"], entry["bytes"], entry["seconds"]))
+        elif args.command == "restore":
+            records = restore_records(args.dir, args.file)
+            if not args.yes:
+                answer = input("현재 기록 %d개를 백업의 기록 %d개로 바꿉니다. 계속할까요? [y/N] "
+                               % (len(store.load()), len(records)))
+                if answer.strip().lower() != "y":
+                    print("취소했습니다")
+                    return
+            store.replace_all(records)
+            # 복원 뒤에는 기존 증분 체인과 이어지지 않으므로 다음 백업은 전체 백업
+            with FileLock(os.path.join(args.dir, ".lock")):
+                manifest = load_manifest(args.dir)
+                manifest["force_full"] = True
+                _save_manifest(args.dir, manifest)
+            print("%d개 기록을 복원했습니다" % len(records))
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
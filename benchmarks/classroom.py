@@ -0,0 +1,319 @@
+"""교실 부하 테스트 - 학생 여러 명이 동시에 순위를 보고 점수를 저장할 때의 app.py 성능
+
+Streamlit의 AppTest로 세션을 여러 개 띄워 한 프로세스 안에서 번갈아 실행합니다.
+(st.cache_resource로 만든 저장소/쓰기 스레드를 실제 서버처럼 모든 세션이 함께 씀)
+AppTest는 여러 스레드에서 동시에 실행할 수 없으므로 재실행은 한 번에 하나씩이고, 동시
+저장은 저장소 단계에서 재현합니다: 다른 작업 프로세스처럼 같은 저장소에 직접 점수를
+저장하는 프로세스 --writers개를 세션과 함께 돌립니다.
+
+저장은 화면의 저장 처리가 끝난(게임 종료 화면이 닫힌) 것만 세고, 끝난 뒤 저장소를 새로
+열어 세션과 저장 프로세스가 저장한 이름이 모두 있는지 확인합니다. 데이터 크기마다 새
+프로세스에서 가상 scores.json을 가져온 뒤 측정하며, 결과는 JSON으로 출력하므로 버전
+사이의 회귀를 비교할 수 있습니다.
+
+python benchmarks/classroom.py --sizes 1000,100000,1000000 --sessions 30 --writers 4 --output bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app.py")
+
+# AppTest 실행은 스레드 사이에서 안전하지 않으므로 한 번에 하나씩
+_RUN_LOCK = threading.Lock()
+
+
+def percentiles(values):
+    """ms 단위 p50/p99/최댓값"""
+    values = sorted(values)
+    if not values:
+        return {"count": 0, "p50_ms": None, "p99_ms": None, "max_ms": None}
+    return {
+        "count": len(values),
+        "p50_ms": values[len(values) // 2] * 1000,
+        "p99_ms": values[min(len(values) - 1, int(len(values) * 0.99))] * 1000,
+        "max_ms": values[-1] * 1000,
+    }
+
+
+def parse_metrics_file(path):
+    """metrics.format_text 형식 파일 → {이름: 값}"""
+    values = {}
+    if not os.path.exists(path):
+        return values
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("#") or not line.strip():
+                continue
+            name, value = line.rsplit(" ", 1)
+            values[name] = float(value)
+    return values
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Session:
+    """학생 한 명 - 순위를 보다가 게임이 끝나면 점수를 저장"""
+
+    def __init__(self, number, timeout):
+        from streamlit.testing.v1 import AppTest
+
+        self.number = number
+        self.app = AppTest.from_file(APP, default_timeout=timeout)
+        self.rerun_times = []
+        self.save_times = []
+        self.saved = []
+        self.errors = []
+
+    def _run(self, times):
+        """재실행 한 번 → 예외 없이 끝났는지 (기다린 시간은 빼고 실행 시간만 잼)"""
+        with _RUN_LOCK:
+            started = time.perf_counter()
+            self.app.run()
+            times.append(time.perf_counter() - started)
+        if self.app.exception:
+            self.errors.append(str(self.app.exception[0].message))
+            return False
+        return True
+
+    def view(self):
+        self._run(self.rerun_times)
+
+    def finish_game(self, round_number):
+        """게임 종료 화면으로 바꾸고 이름을 입력해 점수 저장"""
+        state = self.app.session_state
+        state["game_over"] = True
+        state["final_score"] = 1000 + self.number * 10 + round_number
+        state["final_level"] = 1
+        state["final_lines"] = 10
+        state["final_mode"] = "Normal"
+        state["verification"] = None
+        if not self._run(self.rerun_times):
+            return
+
+        name = "bench-%03d-%03d" % (self.number, round_number)
+        inputs = [w for w in self.app.text_input if w.label == "플레이어 이름"]
+        buttons = [w for w in self.app.button if w.label == "점수 저장"]
+        if not inputs or not buttons:
+            self.errors.append("점수 저장 화면이 없습니다")
+            return
+        inputs[0].input(name)
+        buttons[0].click()
+        if not self._run(self.save_times):
+            return
+        # 저장에 성공하면 게임 종료 화면이 닫힘 (실패하면 st.error와 함께 그대로 남음)
+        if self.app.session_state["game_over"]:
+            self.errors.append("점수가 저장되지 않았습니다: %s" % (
+                "; ".join(w.value for w in self.app.error) or name))
+            return
+        self.saved.append(name)
+
+
+def run_writer(backend, writer_id, stop_path, start_at, interval):
+    """다른 작업 프로세스처럼 stop_path가 생길 때까지 interval초마다 저장소에 직접 저장
+    (별도 프로세스) → 결과 dict"""
+    from datetime import datetime
+
+    from score_store import open_store
+
+    store = open_store(backend)
+    time.sleep(max(0.0, start_at - time.time()))
+    saved, save_times, errors = [], [], []
+    i = 0
+    while not os.path.exists(stop_path):
+        time.sleep(interval)
+        name = "writer-%03d-%04d" % (writer_id, i)
+        i += 1
+        started = time.perf_counter()
+        try:
+            store.append({"timestamp": datetime.now().isoformat(), "name": name,
+                          "mode": "Normal", "level": 1, "score": 500 + i, "lines": 5})
+        except Exception as exc:
+            errors.append("%s: %s" % (type(exc).__name__, exc))
+            continue
+        save_times.append(time.perf_counter() - started)
+        saved.append(name)
+    store.close()
+    return {"saved": saved, "save_times": save_times, "errors": errors}
+
+
+def run_one(size, sessions, rounds, backend, timeout, writers=0, writer_interval=0.05):
+    """이 프로세스에서 size개 기록으로 한 번 측정 → 결과 dict"""
+    sys.path.insert(0, ROOT)
+    from benchmarks.synthetic_scores import write_legacy_json
+
+    workdir = tempfile.mkdtemp(prefix="tetris-bench-")
+    scores_file = os.path.join(workdir, "scores.json")
+    metrics_file = os.path.join(workdir, "metrics.txt")
+    started = time.perf_counter()
+    write_legacy_json(scores_file, size)
+    dataset_seconds = time.perf_counter() - started
+
+    # config는 처음 import할 때 환경 변수를 읽으므로 AppTest 실행 전에 설정
+    os.environ.update({
+        "SCORES_FILE": scores_file,
+        "SCORES_BACKEND": backend,
+        "SCORES_DB": os.path.join(workdir, "scores.db"),
+        "VERIFY_SCORES": "false",
+        "DEBUG": "false",
+        "LOG_LEVEL": "DEBUG",
+        "METRICS_FILE": metrics_file,
+        "METRICS_INTERVAL": "1",
+    })
+
+    # 첫 실행: 기존 데이터 가져오기 + 순위표 인덱스 생성 포함
+    first = Session(-1, timeout)
+    started = time.perf_counter()
+    first.view()
+    first_run_seconds = time.perf_counter() - started
+
+    students = [Session(i, timeout) for i in range(sessions)]
+    barrier = threading.Barrier(sessions)
+
+    def play(session):
+        barrier.wait()
+        session.view()
+        for round_number in range(rounds):
+            session.view()
+            session.finish_game(round_number)
+
+    # 저장 프로세스는 저장소를 여는 시간이 있으므로 시작 시각을 정해 함께 시작
+    start_at = time.time() + 2 + size / 100000
+    stop_path = os.path.join(workdir, "stop")
+    processes = [subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--backend", backend,
+         "--writer-interval", str(writer_interval),
+         "--run-writer", str(i), stop_path, str(start_at)],
+        cwd=ROOT, stdout=subprocess.PIPE, text=True) for i in range(writers)]
+    time.sleep(max(0.0, start_at - time.time()))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        list(pool.map(play, students))
+    open(stop_path, "w").close()
+    writer_results = []
+    for process in processes:
+        out, _ = process.communicate()
+        if process.returncode == 0:
+            writer_results.append(json.loads(out.strip().splitlines()[-1]))
+    elapsed = time.perf_counter() - started
+
+    # 저장된 기록을 새로 열어 확인 (앱이 쓰는 캐시와 별개)
+    from score_store import open_store
+
+    store = open_store(backend)
+    records = store.load()
+    store.close()
+    names = {record.get("name") for record in records}
+    saved = [name for session in students for name in session.saved]
+    written = [name for result in writer_results for name in result["saved"]]
+    lost = [name for name in saved + written if name not in names]
+
+    errors = [error for session in [first] + students for error in session.errors]
+    errors.extend(error for result in writer_results for error in result["errors"])
+    if len(writer_results) < writers:
+        errors.append("저장 프로세스 %d개가 실패했습니다" % (writers - len(writer_results)))
+
+    time.sleep(1.5)  # 계측 보고 주기(1초) 한 번 기다리기
+    app_metrics = parse_metrics_file(metrics_file)
+
+    return {
+        "records": size,
+        "backend": backend,
+        "sessions": sessions,
+        "writers": writers,
+        "rounds": rounds,
+        "dataset_seconds": dataset_seconds,
+        "first_run_ms": first_run_seconds * 1000,
+        "rerun": percentiles([t for s in students for t in s.rerun_times]),
+        "save_rerun": percentiles([t for s in students for t in s.save_times]),
+        "writer_save": percentiles([t for result in writer_results for t in result["save_times"]]),
+        "saves": len(saved),
+        "writer_saves": len(written),
+        "save_throughput_per_s": (len(saved) + len(written)) / elapsed if elapsed else None,
+        "lost_writes": len(lost),
+        "expected_records": size + len(saved) + len(written),
+        "final_records": len(records),
+        "errors": errors,
+        "app_metrics": {name: value for name, value in app_metrics.items()
+                        if name.startswith("timer_") and name.endswith(("_p50_ms", "_p99_ms"))
+                        or name.startswith("gauge_")},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="교실 동시 접속 부하 테스트")
+    parser.add_argument("--sizes", default="1000,100000,1000000",
+                        help="기존 기록 수 목록 (쉼표로 구분)")
+    parser.add_argument("--sessions", type=int, default=30, help="동시 세션(학생) 수")
+    parser.add_argument("--rounds", type=int, default=3, help="세션마다 저장할 점수 수")
+    parser.add_argument("--writers", type=int, default=4,
+                        help="저장소에 직접 동시에 저장하는 프로세스 수 (다른 작업 프로세스 역할)")
+    parser.add_argument("--writer-interval", type=float, default=0.05,
+                        help="저장 프로세스가 저장하는 간격(초)")
+    parser.add_argument("--backend", choices=("jsonl", "sqlite"), default="jsonl")
+    parser.add_argument("--timeout", type=float, default=600, help="재실행 한 번의 제한 시간(초)")
+    parser.add_argument("--output", help="결과 JSON 파일 (기본: 표준 출력)")
+    parser.add_argument("--run-one", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--run-writer", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_writer:
+        sys.path.insert(0, ROOT)
+        writer_id, stop_path, start_at = args.run_writer
+        result = run_writer(args.backend, int(writer_id), stop_path, float(start_at),
+                            args.writer_interval)
+        print(json.dumps(result, ensure_ascii=False))
+        return
+    if args.run_one is not None:
+        result = run_one(args.run_one, args.sessions, args.rounds, args.backend, args.timeout,
+                         args.writers, args.writer_interval)
+        print(json.dumps(result, ensure_ascii=False))
+        return
+
+    # 크기마다 새 프로세스 (설정과 st.cache_resource 캐시를 새로 시작)
+    results = []
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        command = [sys.executable, os.path.abspath(__file__), "--run-one", str(size),
+                   "--sessions", str(args.sessions), "--rounds", str(args.rounds),
+                   "--writers", str(args.writers), "--writer-interval", str(args.writer_interval),
+                   "--backend", args.backend,
+                   "--timeout", str(args.timeout)]
+        print("기록 %d개 측정 중..." % size, file=sys.stderr)
+        out = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+        if out.returncode:
+            print(out.stderr, file=sys.stderr)
+            results.append({"records": size, "backend": args.backend, "failed": True})
+            continue
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    report = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
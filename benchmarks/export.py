@@ -0,0 +1,160 @@
+"""점수 내보내기 측정 - 기록 수별 처리량과 최대 메모리 증가량
+
+가상 기록으로 저장소를 만든 뒤 형식(csv/jsonl) × 압축 여부마다 새 프로세스에서
+score_export.export_store로 전체 기록을 내보내고, 비교용으로 전체 기록을 query()로
+한 번에 읽어 내보내는 방식(load)도 측정합니다. 메모리는 저장소를 연 뒤의 RSS에서
+내보내기가 끝날 때까지의 최대 RSS가 늘어난 양입니다.
+
+python benchmarks/export.py --sizes 100000,1000000 --backend jsonl --output export.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = (("csv", False), ("csv", True), ("jsonl", False), ("jsonl", True))
+
+
+def _open(backend, path):
+    if backend == "sqlite":
+        from sqlite_store import SqliteScoreStore
+        return SqliteScoreStore(os.path.join(path, "scores.db"))
+    from score_store import JsonlScoreStore
+    return JsonlScoreStore(os.path.join(path, "scores"))
+
+
+def populate(backend, path, size):
+    """가상 기록 size개 저장 (jsonl은 스냅샷 + 최근 1% 로그)"""
+    from benchmarks.synthetic_scores import synthetic_records
+
+    store = _open(backend, path)
+    try:
+        recent = size // 100
+        if backend == "jsonl":
+            store.replace_all(synthetic_records(size - recent))
+        else:
+            batch = []
+            for record in synthetic_records(size - recent):
+                batch.append(record)
+                if len(batch) == 10000:
+                    store.append_many(batch)
+                    batch = []
+            store.append_many(batch)
+        store.append_many(list(synthetic_records(recent, seed=1)))
+    finally:
+        store.close()
+
+
+def _memory_kb():
+    """(지금 RSS, 최대 RSS) KB
+
+    ru_maxrss는 fork한 부모(기록을 만들던 프로세스)의 최댓값을 물려받으므로
+    Linux에서는 이 프로세스의 값인 /proc/self/status의 VmRSS/VmHWM을 씁니다.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+        return int(fields["VmRSS"].split()[0]), int(fields["VmHWM"].split()[0])
+    except (OSError, KeyError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak, peak
+
+
+def run_one(backend, path, fmt, compress, load):
+    """한 경우 측정 (별도 프로세스) → 결과 dict"""
+    from score_export import export_chunks, export_store
+
+    store = _open(backend, path)
+    rss_before, _ = _memory_kb()
+    started = time.perf_counter()
+    if load:
+        chunks = export_chunks(iter(store.query()), fmt, compress)
+    else:
+        chunks = export_store(store, fmt, compress)
+    written = 0
+    with open(os.devnull, "wb") as out:
+        for chunk in chunks:
+            out.write(chunk)
+            written += len(chunk)
+    elapsed = time.perf_counter() - started
+    _, rss_peak = _memory_kb()
+    records = store.storage_stats()["records"]
+    store.close()
+    return {
+        "method": "load" if load else "stream",
+        "format": fmt,
+        "gzip": compress,
+        "records": records,
+        "seconds": elapsed,
+        "records_per_second": records / elapsed,
+        "output_mb": written / 1e6,
+        "peak_rss_growth_mb": (rss_peak - rss_before) / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="점수 내보내기 측정")
+    parser.add_argument("--sizes", default="100000,1000000", help="기록 수 목록 (쉼표로 구분)")
+    parser.add_argument("--backend", choices=("jsonl", "sqlite"), default="jsonl")
+    parser.add_argument("--output", help="결과 JSON 파일 (기본: 표준 출력)")
+    parser.add_argument("--run-one", nargs=4, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    sys.path.insert(0, ROOT)
+
+    if args.run_one:
+        path, fmt, compress, load = args.run_one
+        result = run_one(args.backend, path, fmt, compress == "1", load == "1")
+        print(json.dumps(result, ensure_ascii=False))
+        return
+
+    from benchmarks.classroom import git_revision
+
+    results = []
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        workdir = tempfile.mkdtemp(prefix="tetris-export-")
+        try:
+            print("기록 %d개 만드는 중..." % size, file=sys.stderr)
+            populate(args.backend, workdir, size)
+            cases = [(fmt, compress, False) for fmt, compress in CASES] + [("csv", False, True)]
+            for fmt, compress, load in cases:
+                command = [sys.executable, os.path.abspath(__file__), "--backend", args.backend,
+                           "--run-one", workdir, fmt, str(int(compress)), str(int(load))]
+                out = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+                if out.returncode:
+                    print(out.stderr, file=sys.stderr)
+                    results.append({"records": size, "format": fmt, "gzip": compress,
+                                    "failed": True})
+                    continue
+                result = json.loads(out.stdout.strip().splitlines()[-1])
+                print("  %(method)s %(format)s gzip=%(gzip)s: %(records_per_second).0f건/초, "
+                      "%(output_mb).1fMB, 메모리 +%(peak_rss_growth_mb).1fMB" % result,
+                      file=sys.stderr)
+                results.append(result)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "backend": args.backend,
+        "results": results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
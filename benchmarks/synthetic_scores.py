@@ -0,0 +1,50 @@
+"""벤치마크용 가상 점수 데이터 생성
+
+python benchmarks/synthetic_scores.py 100000 scores.json  # 이전 버전 형식(JSON 배열)으로 저장
+"""
+import argparse
+import json
+import random
+from datetime import datetime, timedelta
+
+MODES = ("Easy", "Normal", "Hard")
+
+
+def synthetic_records(count, students=100, seed=0):
+    """학생 students명이 count판 플레이한 기록 (시드가 같으면 항상 같은 데이터)"""
+    rng = random.Random(seed)
+    start = datetime(2024, 3, 1)
+    step = timedelta(days=180) / max(count, 1)
+    for i in range(count):
+        level = rng.randint(1, 15)
+        lines = rng.randint(0, 150)
+        yield {
+            "timestamp": (start + step * i).isoformat(),
+            "name": "학생%03d" % rng.randrange(students),
+            "mode": rng.choice(MODES),
+            "level": level,
+            "score": lines * 100 * level + rng.randrange(100) * 10,
+            "lines": lines,
+        }
+
+
+def write_legacy_json(path, count, students=100, seed=0):
+    """기존 scores.json 형식으로 저장 (앱을 처음 실행하면 저장소로 가져옴)"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(list(synthetic_records(count, students, seed)), f, ensure_ascii=False,
+                  separators=(",", ":"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가상 점수 데이터 생성")
+    parser.add_argument("count", type=int, help="기록 수")
+    parser.add_argument("path", nargs="?", default="scores.json")
+    parser.add_argument("--students", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write_legacy_json(args.path, args.count, args.students, args.seed)
+    print("%s: %d개 기록" % (args.path, args.count))
+
+
+if __name__ == "__main__":
+    main()
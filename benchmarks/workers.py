@@ -0,0 +1,166 @@
+"""작업 프로세스 수별 처리량 - serve.py처럼 여러 프로세스가 같은 저장소를 나눠 쓸 때
+
+작업 프로세스마다 app.py의 재실행에서 하는 저장소 일(순위표 etag/상위 기록, 학생
+목록과 학생 한 명의 집계 조회)을 seconds초 동안 반복하고, save_every번에 한 번씩
+점수를 저장합니다. 다른 프로세스가 저장하면 각 프로세스의 캐시는 변경 번호를 보고
+새 기록만 따라잡으므로, CPU 코어가 충분하면 전체 처리량이 프로세스 수에 거의 비례해야
+합니다 (Streamlit 자체의 비용은 빠짐).
+
+python benchmarks/workers.py --workers 1,2,4 --records 100000 --seconds 10 --output workers.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _open(backend, path):
+    if backend == "sqlite":
+        from sqlite_store import SqliteScoreStore
+        return SqliteScoreStore(os.path.join(path, "scores.db"))
+    if backend == "partitioned":
+        from partitioned_store import PartitionedScoreStore
+        return PartitionedScoreStore(os.path.join(path, "scores"))
+    from score_store import JsonlScoreStore
+    return JsonlScoreStore(os.path.join(path, "scores"))
+
+
+def populate(backend, path, size):
+    from benchmarks.synthetic_scores import synthetic_records
+
+    store = _open(backend, path)
+    try:
+        batch = []
+        for record in synthetic_records(size):
+            batch.append(record)
+            if len(batch) == 10000:
+                store.append_many(batch)
+                batch = []
+        store.append_many(batch)
+        if backend == "jsonl":
+            store.compact()
+    finally:
+        store.close()
+
+
+def run_one(backend, path, worker_id, start_at, seconds, save_every):
+    """작업 프로세스 하나 (별도 프로세스) → 결과 dict"""
+    from benchmarks.classroom import percentiles
+    from leaderboard import LeaderboardIndex
+    from player_stats import PlayerStats
+
+    store = _open(backend, path)
+    leaderboard = LeaderboardIndex(store, k=10)
+    stats = PlayerStats(store, None)
+    # 처음 읽기는 측정에서 뺌
+    leaderboard.etag()
+    names = stats.names()
+    time.sleep(max(0.0, start_at - time.time()))
+
+    rerun_times = []
+    saves = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        leaderboard.etag()
+        leaderboard.top()
+        names = stats.names() or names
+        if names:
+            stats.get(names[len(rerun_times) % len(names)])
+        if len(rerun_times) % save_every == save_every - 1:
+            store.append({"timestamp": datetime.now().isoformat(),
+                          "name": "작업%d-%d" % (worker_id, saves % 30), "mode": "Normal",
+                          "level": 1, "score": len(rerun_times), "lines": 1})
+            saves += 1
+        rerun_times.append(time.perf_counter() - started)
+    store.close()
+    result = {"worker": worker_id, "reruns": len(rerun_times), "saves": saves,
+              "reruns_per_second": len(rerun_times) / seconds}
+    result.update(percentiles(rerun_times))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="작업 프로세스 수별 처리량 측정")
+    parser.add_argument("--workers", default="1,2,4", help="작업 프로세스 수 목록 (쉼표로 구분)")
+    parser.add_argument("--records", type=int, default=100000, help="미리 넣어 둘 기록 수")
+    parser.add_argument("--seconds", type=float, default=10, help="측정 시간 (초)")
+    parser.add_argument("--save-every", type=int, default=20, help="재실행 몇 번에 한 번 저장할지")
+    parser.add_argument("--backend", choices=("jsonl", "sqlite", "partitioned"), default="jsonl")
+    parser.add_argument("--output", help="결과 JSON 파일 (기본: 표준 출력)")
+    parser.add_argument("--run-one", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    sys.path.insert(0, ROOT)
+
+    if args.run_one:
+        path, worker_id, start_at = args.run_one
+        result = run_one(args.backend, path, int(worker_id), float(start_at), args.seconds,
+                         args.save_every)
+        print(json.dumps(result, ensure_ascii=False))
+        return
+
+    from benchmarks.classroom import git_revision
+
+    results = []
+    for workers in (int(n) for n in args.workers.split(",") if n.strip()):
+        workdir = tempfile.mkdtemp(prefix="tetris-workers-")
+        try:
+            populate(args.backend, workdir, args.records)
+            # 모든 프로세스가 처음 읽기를 마친 뒤 함께 시작하도록 시작 시각을 넉넉히
+            start_at = time.time() + 5 + args.records / 50000
+            processes = [subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), "--backend", args.backend,
+                 "--seconds", str(args.seconds), "--save-every", str(args.save_every),
+                 "--run-one", workdir, str(i), str(start_at)],
+                cwd=ROOT, stdout=subprocess.PIPE, text=True) for i in range(workers)]
+            per_worker = []
+            for process in processes:
+                out, _ = process.communicate()
+                if process.returncode == 0:
+                    per_worker.append(json.loads(out.strip().splitlines()[-1]))
+            total = sum(r["reruns_per_second"] for r in per_worker)
+            result = {
+                "workers": workers,
+                "failed": workers - len(per_worker),
+                "reruns_per_second": total,
+                "p99_ms": max((r["p99_ms"] for r in per_worker if r["p99_ms"] is not None),
+                              default=None),
+                "per_worker": per_worker,
+            }
+            results.append(result)
+            print("  작업 프로세스 %d개: 초당 재실행 %.0f번 (p99 %.2fms)" % (
+                workers, total, result["p99_ms"] or 0), file=sys.stderr)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if results and results[0]["reruns_per_second"]:
+        for result in results:
+            result["scaling"] = result["reruns_per_second"] / results[0]["reruns_per_second"]
+
+    report = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "backend": args.backend,
+        "records": args.records,
+        "results": results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""자동 플레이 봇 - 순위표 채우기와 부하 테스트용 (프로세스 풀)
+
+봇은 placement_search로 고른 자리까지 실제 입력(회전, 좌우 이동, 즉시 낙하, 중력)을
+넣어 게임을 진행하므로, 결과의 입력 기록은 브라우저 게임처럼 서버 검증을 통과합니다.
+
+python bot.py --games 1000                # 1000판 실행하고 속도/점수 요약
+python bot.py --games 200 --save          # 결과를 점수 저장소에 기록
+python bot.py --games 200 --verify        # 입력 기록 재실행 검증까지
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from piece_rng import piece_source
+from placement_search import best_placement
+from tetris_engine import ACTIONS, MASKS, PIECES, SPEEDS, BOARD_WIDTH, TetrisGame
+
+
+def _moves(game, rotation, x):
+    """등장한 블록을 (rotation, x)로 보내는 입력 문자열 (회전 먼저, 그다음 좌우 이동)"""
+    dx = x - game.x
+    return "U" * rotation + ("R" * dx if dx > 0 else "L" * -dx) + "HG"
+
+
+def play_game(seed, mode="Normal", start_level=1, randomizer="random", max_pieces=500,
+              lookahead=False, epsilon=0.0):
+    """봇 한 판 → 결과 dict (app.py에 제출하는 게임 결과와 같은 항목 + over, pieces)
+
+    epsilon 확률로 가장 좋은 자리 대신 무작위 자리에 놓으며, max_pieces개를 놓으면
+    게임이 끝나지 않았어도 멈춥니다 (over=False, 검증 불가).
+    """
+    game = TetrisGame(mode, start_level, piece_source(seed, randomizer))
+    rng = random.Random(seed)
+    log = []
+    while not game.over and game.pieces_placed < max_pieces:
+        choice = best_placement(game.board, game.columns, game.piece, game.y,
+                                game.next_piece if lookahead else None)
+        if choice is None:
+            # 놓을 자리가 없음 - 그대로 떨어뜨려 게임 종료
+            moves = "HG"
+        elif epsilon and rng.random() < epsilon:
+            rotation = rng.randrange(len(PIECES[game.piece]))
+            x = rng.randrange(BOARD_WIDTH)
+            while MASKS[game.piece][rotation][x] is None:
+                x -= 1
+            moves = _moves(game, rotation, x)
+        else:
+            moves = _moves(game, choice["rotation"], choice["x"])
+        for action in moves:
+            ACTIONS[action](game)
+        log.append(moves)
+    return {
+        "id": seed,
+        "score": game.score,
+        "level": game.level,
+        "lines": game.lines,
+        "mode": mode,
+        "start_level": start_level,
+        "seed": seed,
+        "randomizer": randomizer,
+        "log": "".join(log),
+        "over": game.over,
+        "pieces": game.pieces_placed,
+    }
+
+
+def _run(task):
+    """작업 프로세스: 봇 한 판 (+ 요청하면 재실행 검증)"""
+    seed, options, verify = task
+    started = time.perf_counter()
+    result = play_game(seed, **options)
+    result["seconds"] = time.perf_counter() - started
+    if verify:
+        from replay_verifier import verify_submission
+
+        result["verified"] = verify_submission(result)[0]
+    return result
+
+
+def run_bots(games, workers=None, seed=0, verify=False, **options):
+    """games판을 프로세스 풀에서 실행 → 결과 목록 (시드 seed, seed+1, ...)"""
+    workers = workers or os.cpu_count() or 1
+    tasks = [(seed + i, options, verify) for i in range(games)]
+    # Streamlit 서버 안에서 불려도 안전하도록 replay_verifier와 같이 spawn 사용
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context("spawn")) as pool:
+        # 작업을 묶어 보내 프로세스 간 통신 횟수를 줄임 (작업자마다 8묶음 정도)
+        return list(pool.map(_run, tasks, chunksize=max(1, games // (workers * 8))))
+
+
+def main():
+    import config
+    from score_store import BACKENDS, open_store
+
+    parser = argparse.ArgumentParser(description="자동 플레이 봇")
+    parser.add_argument("--games", type=int, default=100, help="게임 수")
+    parser.add_argument("--workers", type=int, default=0, help="작업 프로세스 수 (0 = CPU 수)")
+    parser.add_argument("--seed", type=int, default=0, help="첫 게임의 블록 순서 시드")
+    parser.add_argument("--mode", choices=sorted(SPEEDS), default="Normal")
+    parser.add_argument("--start-level", type=int, default=1)
+    parser.add_argument("--randomizer", choices=("random", "bag"), default=config.PIECE_RANDOMIZER)
+    parser.add_argument("--max-pieces", type=int, default=500, help="한 판에 놓을 최대 블록 수")
+    parser.add_argument("--lookahead", action="store_true", help="다음 블록까지 보고 자리 고르기")
+    parser.add_argument("--epsilon", type=float, default=0.0,
+                        help="무작위 자리에 놓을 확률 (점수를 다양하게, 게임이 끝나도록)")
+    parser.add_argument("--verify", action="store_true", help="입력 기록 재실행 검증")
+    parser.add_argument("--save", action="store_true", help="끝난 게임을 점수 저장소에 기록")
+    parser.add_argument("--name", default="봇", help="저장할 이름 앞부분 (이름-번호)")
+    parser.add_argument("--players", type=int, default=30, help="저장할 봇 이름 수")
+    parser.add_argument("--backend", choices=BACKENDS, default=config.SCORES_BACKEND,
+                        help="저장소 종류 (기본값: SCORES_BACKEND)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = run_bots(args.games, workers=args.workers or None, seed=args.seed,
+                       verify=args.verify, mode=args.mode, start_level=args.start_level,
+                       randomizer=args.randomizer, max_pieces=args.max_pieces,
+                       lookahead=args.lookahead, epsilon=args.epsilon)
+    elapsed = time.perf_counter() - started
+
+    finished = [r for r in results if r["over"]]
+    scores = sorted(r["score"] for r in results)
+    pieces = sum(r["pieces"] for r in results)
+    print("%d판 %.1f초: 분당 %.0f판, 초당 블록 %.0f개" % (
+        len(results), elapsed, len(results) / elapsed * 60, pieces / elapsed))
+    print("점수 평균 %.0f, 중앙값 %d, 최고 %d | 게임 종료 %d판 (나머지는 블록 %d개에서 멈춤)" % (
+        sum(scores) / len(scores), scores[len(scores) // 2], scores[-1], len(finished),
+        args.max_pieces))
+    if args.verify:
+        print("검증 통과 %d / %d판" % (sum(r["verified"] for r in finished), len(finished)))
+
+    if args.save:
+        now = datetime.now().isoformat()
+        records = [{
+            "timestamp": now,
+            "name": "%s-%02d" % (args.name, i % args.players),
+            "mode": r["mode"],
+            "level": r["level"],
+            "score": r["score"],
+            "lines": r["lines"],
+            "start_level": r["start_level"],
+            "seed": r["seed"],
+            "randomizer": r["randomizer"],
+        } for i, r in enumerate(finished)]
+        store = open_store(args.backend)
+        try:
+            store.append_many(records)
+        finally:
+            store.close()
+        print("%d개 기록을 저장했습니다" % len(records))
+
+
+if __name__ == "__main__":
+    main()
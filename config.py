@@ -0,0 +1,103 @@
+"""환경 설정 - 환경 변수와 .env 파일에서 읽기"""
+import os
+
+ENV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
+
+
+def _load_env_file(path):
+    """.env 파일의 KEY=VALUE 줄을 환경 변수로 등록 (이미 있는 값은 유지)"""
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            key, value = line.split("=", 1)
+            os.environ.setdefault(key.strip(), value.strip().strip("'\""))
+
+
+def get_str(name, default):
+    return os.environ.get(name, default)
+
+
+def get_int(name, default):
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    return int(value)
+
+
+def get_bool(name, default):
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+_load_env_file(ENV_FILE)
+
+# 데이터 저장 설정
+SCORES_FILE = get_str("SCORES_FILE", "scores.json")
+SCORES_BACKEND = get_str("SCORES_BACKEND", "jsonl")
+SCORES_BASE = os.path.splitext(SCORES_FILE)[0]
+SCORES_DB = get_str("SCORES_DB", SCORES_BASE + ".db")
+# partitioned 저장소: SCORES_DIR 폴더에 구간(day | month | term=학기)별 파일
+SCORES_DIR = get_str("SCORES_DIR", SCORES_BASE)
+SCORES_PARTITION = get_str("SCORES_PARTITION", "month")
+# 학생별 통계 집계 파일 (최근 PLAYER_RECENT_GAMES게임의 점수로 추세 계산)
+PLAYER_STATS_FILE = get_str("PLAYER_STATS_FILE", SCORES_BASE + ".players.json")
+PLAYER_RECENT_GAMES = get_int("PLAYER_RECENT_GAMES", 10)
+
+# 여러 작업 프로세스로 실행 (python serve.py): WORKERS개의 Streamlit 프로세스가 WORKER_PORT부터
+# 차례로 포트를 쓰고 같은 점수 저장소를 나눠 씀. 라운드와 관전 보드는 RUNTIME_DIR 폴더의
+# 파일로 주고받음 (WORKER_ID는 serve.py가 프로세스마다 정함)
+WORKERS = get_int("WORKERS", 1)
+WORKER_PORT = get_int("WORKER_PORT", 8501)
+WORKER_ID = get_str("WORKER_ID", "0")
+RUNTIME_DIR = get_str("RUNTIME_DIR", SCORES_BASE + ".run")
+
+# 백업 설정 (BACKUP_INTERVAL초마다 BACKUP_DIR에 압축 백업, 최근 BACKUP_KEEP개 전체 백업 체인 보관)
+BACKUP_ENABLED = get_bool("BACKUP_ENABLED", False)
+BACKUP_INTERVAL = get_int("BACKUP_INTERVAL", 3600)
+BACKUP_DIR = get_str("BACKUP_DIR", "backups")
+BACKUP_KEEP = get_int("BACKUP_KEEP", 5)
+
+# 점수 검증 설정 (VERIFY_WORKERS=0이면 CPU 수만큼)
+VERIFY_SCORES = get_bool("VERIFY_SCORES", True)
+VERIFY_WORKERS = get_int("VERIFY_WORKERS", 0)
+
+# 블록 순서 설정
+# PIECE_RANDOMIZER: random (매번 무작위) | bag (7-bag)
+# SHARED_ROUND_SEED=true이면 한 라운드 동안 모든 학생이 같은 블록 순서로 경기
+PIECE_RANDOMIZER = get_str("PIECE_RANDOMIZER", "random")
+SHARED_ROUND_SEED = get_bool("SHARED_ROUND_SEED", False)
+
+# 보안 설정
+ADMIN_PASSWORD = get_str("ADMIN_PASSWORD", "")
+
+# 개발 모드 / 계측
+# DEBUG=true 또는 LOG_LEVEL=DEBUG이면 실행 시간과 저장소 크기를 측정해
+# METRICS_INTERVAL초마다 로그와 METRICS_FILE(비우면 파일 없음)에 기록
+DEBUG = get_bool("DEBUG", False)
+LOG_LEVEL = get_str("LOG_LEVEL", "INFO").upper()
+METRICS_ENABLED = DEBUG or LOG_LEVEL == "DEBUG"
+METRICS_FILE = get_str("METRICS_FILE", "metrics.txt")
+METRICS_INTERVAL = get_int("METRICS_INTERVAL", 60)
+
+# 화면 설정
+LEADERBOARD_REFRESH_SECONDS = get_int("LEADERBOARD_REFRESH_SECONDS", 5)
+# 게임 진행 위치: worker (Web Worker, 페이지가 바빠도 입력 지연 일정) | main
+GAME_SIMULATION = get_str("GAME_SIMULATION", "worker")
+# 이동 키 자동 반복 (ms): 누르고 DAS_MS 뒤부터 ARR_MS마다 한 칸 (ARR_MS=0이면 벽까지 바로)
+DAS_MS = get_int("DAS_MS", 170)
+ARR_MS = get_int("ARR_MS", 50)
+# 힌트(H 키): 다음 블록까지 본 추천 자리 표시 (기본은 끔, 힌트를 본 게임은 기록에 hinted)
+HINTS_ENABLED = get_bool("HINTS_ENABLED", False)
+
+# 교사용 관전 (?view=teacher): 게임은 SPECTATE_MS마다 한 번 바뀐 보드 줄만 보냄 (0이면 끔)
+# 허브는 학생 SPECTATOR_MAX_SESSIONS명까지, SPECTATOR_TTL초 동안 소식이 없으면 지움
+SPECTATE_MS = get_int("SPECTATE_MS", 1000)
+SPECTATOR_MAX_SESSIONS = get_int("SPECTATOR_MAX_SESSIONS", 100)
+SPECTATOR_TTL = get_int("SPECTATOR_TTL", 60)
+SPECTATOR_REFRESH_SECONDS = get_int("SPECTATOR_REFRESH_SECONDS", 1)
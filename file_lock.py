@@ -0,0 +1,57 @@
+"""프로세스 간 파일 잠금"""
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """잠금 파일을 이용한 프로세스 간 배타적 잠금
+
+    같은 프로세스 안의 스레드 간 잠금은 제공하지 않으므로 threading 잠금과
+    함께 사용합니다. 같은 스레드에서 중첩해서 잡을 수 있습니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._depth = 0
+
+    def acquire(self):
+        self._depth += 1
+        if self._depth > 1:
+            return
+        self._file = open(self.path, "a+")
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            return
+        while True:
+            try:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+                return
+            except OSError:
+                time.sleep(0.01)
+
+    def release(self):
+        self._depth -= 1
+        if self._depth > 0 or self._file is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
@@ -0,0 +1,109 @@
+"""모드별 상위 K개 순위 인덱스"""
+import heapq
+import threading
+
+GAME_MODES = ("Easy", "Normal", "Hard")
+
+
+class LeaderboardIndex:
+    """모든 세션이 공유하는 순위표 인덱스
+
+    전체/모드별로 크기 K의 최소 힙을 유지합니다. 저장소에 기록이 추가되면
+    힙만 갱신하고, 다른 프로세스가 기록을 추가한 경우에는 그 뒤의 기록만 읽어
+    따라잡습니다 (기록이 줄었으면 전체를 다시 읽고, 색인이 있는 저장소는 상위 K개를
+    다시 조회).
+    """
+
+    def __init__(self, store, k=10):
+        self.store = store
+        self.k = k
+        self._lock = threading.Lock()
+        self._heaps = {}
+        self._sorted = {}
+        self._seq = 0
+        self._version = None
+        self._etag = 0
+        store.subscribe(self._on_change)
+
+    def _push(self, record):
+        """기록 한 건을 전체/해당 모드 힙에 반영"""
+        # 같은 점수면 먼저 저장된 기록이 앞 순위 (-seq가 클수록 앞)
+        item = (record.get("score", 0), -self._seq, record)
+        self._seq += 1
+        for key in (None, record.get("mode")):
+            heap = self._heaps.setdefault(key, [])
+            if len(heap) < self.k:
+                heapq.heappush(heap, item)
+            elif item[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, item)
+            else:
+                continue
+            self._sorted.pop(key, None)
+            self._etag += 1
+
+    def _rebuild(self):
+        """저장소에서 다시 읽어 인덱스 재구성"""
+        self._heaps = {}
+        self._sorted = {}
+        self._seq = 0
+        self._etag += 1
+        if self.store.supports_ordered_queries:
+            # 색인이 있는 저장소는 모드별 상위 K개만 조회
+            version = self.store.version()
+            for key in (None,) + GAME_MODES:
+                ranked = self.store.top(key, self.k)
+                self._heaps[key] = [(r.get("score", 0), -i, r) for i, r in enumerate(ranked)]
+                heapq.heapify(self._heaps[key])
+            self._seq = self.k
+        else:
+            records, version = self.store.load_with_version()
+            for record in records:
+                self._push(record)
+        self._version = version
+
+    def _on_change(self, records, before, after):
+        """저장소 변경 알림 처리"""
+        with self._lock:
+            if self._version == before:
+                for record in records:
+                    self._push(record)
+                self._version = after
+            # 그 밖에는 알림을 놓친 상태 (다른 프로세스가 저장) - _version이 저장소와
+            # 달라졌으므로 다음 조회 때 따라잡음
+
+    def _catch_up(self):
+        """반영한 기록 수(_seq) 뒤의 기록만 읽어 힙에 반영 (저장소 잠금과 인덱스 잠금을 잡은 상태)"""
+        version = self.store.version()
+        records, count = self.store.records_after(self._seq)
+        if count < self._seq:
+            self._rebuild()
+            return
+        for record in records:
+            self._push(record)
+        self._version = version
+
+    def _refresh(self):
+        """저장소가 바뀌었으면 다시 읽기 (저장소 잠금과 인덱스 잠금을 잡은 상태)"""
+        if self.store.version() == self._version:
+            return
+        if self._version is None or self.store.supports_ordered_queries:
+            # 색인이 있는 저장소는 상위 K개 조회가 따라잡기보다 빠름
+            self._rebuild()
+        else:
+            self._catch_up()
+
+    def etag(self):
+        """순위표 내용 버전 - 상위 K개가 바뀔 때마다 증가"""
+        # 잠금 순서는 항상 저장소 → 인덱스 (변경 알림과 같은 순서)
+        with self.store.lock, self._lock:
+            self._refresh()
+            return "%x-%d" % (id(self), self._etag)
+
+    def top(self, mode=None):
+        """상위 K개 기록 (mode가 None이면 전체)"""
+        with self.store.lock, self._lock:
+            self._refresh()
+            if mode not in self._sorted:
+                heap = self._heaps.get(mode, [])
+                self._sorted[mode] = [item[2] for item in sorted(heap, key=lambda item: item[:2], reverse=True)]
+            return self._sorted[mode]
@@ -0,0 +1,180 @@
+"""실행 시간/저장소 계측 - 최근 측정값 히스토그램과 카운터
+
+DEBUG=true 또는 LOG_LEVEL=DEBUG일 때만 측정합니다. 꺼져 있으면 timer()는
+아무것도 하지 않는 컨텍스트를 돌려주므로 계측 코드를 그대로 두어도 부담이 없습니다.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+
+logger = logging.getLogger("tetris.metrics")
+
+_NULL_TIMER = nullcontext()
+
+
+class _Timer:
+    __slots__ = ("metrics", "name", "started")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class Histogram:
+    """최근 history개 측정값(초)의 백분위"""
+
+    def __init__(self, history=1000):
+        self._values = deque(maxlen=history)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value):
+        self._values.append(value)
+        self.count += 1
+        self.total += value
+
+    def summary(self):
+        """건수, 평균과 최근 값의 p50/p90/p99/최댓값 (ms)"""
+        values = sorted(self._values)
+        summary = {"count": self.count, "mean_ms": None, "p50_ms": None, "p90_ms": None,
+                   "p99_ms": None, "max_ms": None}
+        if values:
+            summary["mean_ms"] = self.total / self.count * 1000
+            for name, q in (("p50_ms", 0.5), ("p90_ms", 0.9), ("p99_ms", 0.99)):
+                summary[name] = values[min(len(values) - 1, int(len(values) * q))] * 1000
+            summary["max_ms"] = values[-1] * 1000
+        return summary
+
+
+class Metrics:
+    """이름별 시간 히스토그램, 카운터, 게이지 모음
+
+    게이지는 보고할 때 호출되는 함수(이름 → 값 dict 반환)로 등록합니다. 파일 크기나
+    기록 수처럼 구하는 데 시간이 드는 값이므로 gauge_interval초 동안은 지난 값을 씁니다.
+    """
+
+    def __init__(self, enabled=True, history=1000, gauge_interval=10):
+        self.enabled = enabled
+        self.history = history
+        self.gauge_interval = gauge_interval
+        self._lock = threading.Lock()
+        self._timers = {}
+        self._counters = {}
+        self._gauges = []
+        self._gauge_values = {}
+        self._gauges_at = None
+        self._stop = threading.Event()
+        self._reporter = None
+
+    # ---- 측정 ----
+
+    def observe(self, name, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._timers.get(name)
+            if histogram is None:
+                histogram = self._timers[name] = Histogram(self.history)
+            histogram.observe(seconds)
+
+    def timer(self, name):
+        """with metrics.timer("save_score"): ... 구간 실행 시간 측정"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def incr(self, name, amount=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def add_gauges(self, collect):
+        """보고 시점에 호출할 게이지 수집 함수 등록"""
+        self._gauges.append(collect)
+
+    # ---- 보고 ----
+
+    def snapshot(self):
+        """{"timers": {이름: 요약}, "counters": {...}, "gauges": {...}}"""
+        with self._lock:
+            timers = {name: histogram.summary() for name, histogram in self._timers.items()}
+            counters = dict(self._counters)
+        return {"timestamp": time.time(), "timers": timers, "counters": counters,
+                "gauges": self._collect_gauges()}
+
+    def _collect_gauges(self):
+        now = time.monotonic()
+        if self._gauges_at is not None and now - self._gauges_at < self.gauge_interval:
+            return dict(self._gauge_values)
+        gauges = {}
+        for collect in self._gauges:
+            try:
+                gauges.update(collect())
+            except Exception:
+                logger.exception("게이지 수집 실패")
+        self._gauge_values, self._gauges_at = gauges, now
+        return dict(gauges)
+
+    def report(self, path=None):
+        """구조화 로그(JSON 한 줄)를 남기고, path가 있으면 텍스트 지표 파일로도 저장"""
+        snapshot = self.snapshot()
+        logger.info("metrics %s", json.dumps(snapshot, ensure_ascii=False, sort_keys=True))
+        if path:
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(format_text(snapshot))
+            os.replace(tmp_path, path)
+        return snapshot
+
+    def start_reporter(self, interval=60, path=None):
+        """interval초마다 report() 하는 백그라운드 스레드 시작"""
+        if not self.enabled or self._reporter is not None:
+            return
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.report(path)
+                except OSError:
+                    logger.exception("지표 파일 저장 실패")
+
+        self._reporter = threading.Thread(target=run, name="metrics-reporter", daemon=True)
+        self._reporter.start()
+
+    def close(self):
+        self._stop.set()
+        if self._reporter is not None:
+            self._reporter.join()
+            self._reporter = None
+
+
+def format_text(snapshot):
+    """snapshot()을 '이름 값' 형식의 텍스트 지표로 변환 (한 줄에 하나)"""
+    lines = ["# timestamp %d" % snapshot["timestamp"]]
+    for name, summary in sorted(snapshot["timers"].items()):
+        for key, value in sorted(summary.items()):
+            if value is not None:
+                lines.append("timer_%s_%s %s" % (name, key, _format_value(value)))
+    for name, value in sorted(snapshot["counters"].items()):
+        lines.append("counter_%s %s" % (name, _format_value(value)))
+    for name, value in sorted(snapshot["gauges"].items()):
+        if value is not None:
+            lines.append("gauge_%s %s" % (name, _format_value(value)))
+    return "\n".join(lines) + "\n"
+
+
+def _format_value(value):
+    return "%.3f" % value if isinstance(value, float) else str(value)
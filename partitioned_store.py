@@ -0,0 +1,525 @@
+"""기간별로 나눈 점수 저장소 - 지난 기간은 요약(rollup)만 읽음
+
+기록은 시각에 따라 구간(day/month/term) 파일 <dir>/<구간>.jsonl에 덧붙이고, 저장한
+순서는 order.log에 (구간, 건수) 줄로 남깁니다.
+가장 최근 구간을 뺀 모든 구간은 rollup.json에 건수, 모드별 상위 K개, 학생별 최고
+기록으로 요약해 두므로, 순위 조회는 요약과 최근 구간 파일만 읽습니다. 지난 구간
+파일은 그대로 보관되며 전체 조회나 기간 조회 때만 읽습니다.
+저장하는 동안에는 append.pending에 저장 전 파일 크기를 적어 두어, 도중에 멈추면
+다음에 열 때(또는 다음 저장 때) 구간 파일과 order.log를 맞춥니다.
+"""
+import bisect
+import glob
+import itertools
+import json
+import os
+
+from file_lock import FileLock
+from score_store import (ScoreStore, _claim_legacy, _dump_line, _iter_jsonl, _matches,
+                         _parse_jsonl, _read_jsonl, _read_lines)
+from version_file import VersionFile
+
+PERIODS = ("day", "month", "term")
+
+# 요약에서 전체(모드 구분 없음) 상위 기록의 키
+ALL_MODES = "*"
+
+# 시각이 없는 기록의 구간 (가장 앞에 정렬)
+UNDATED = "0000"
+
+# 요약 형식 (2: 상위 기록마다 구간 안 위치를 함께 저장)
+ROLLUP_FORMAT = 2
+
+
+def partition_key(timestamp, period="month"):
+    """기록 시각(ISO 문자열) → 구간 이름
+
+    day: 2024-03-01, month: 2024-03, term: 2024-1 (3~8월) / 2024-2 (9월~다음 해 2월).
+    구간 이름은 문자열 순서가 곧 시간 순서입니다.
+    """
+    if not timestamp or len(timestamp) < 10:
+        return UNDATED
+    if period == "day":
+        return timestamp[:10]
+    if period == "month":
+        return timestamp[:7]
+    if period == "term":
+        year, month = int(timestamp[:4]), int(timestamp[5:7])
+        if month >= 9:
+            return "%d-2" % year
+        if month >= 3:
+            return "%d-1" % year
+        return "%d-2" % (year - 1)
+    raise ValueError("알 수 없는 구간 단위: %s (%s 중 하나)" % (period, ", ".join(PERIODS)))
+
+
+def _score(record):
+    return record.get("score", 0)
+
+
+def summarize(records, k, summary=None):
+    """구간 요약에 기록 추가 → {"count", "top": {모드: 상위 k개}, "best": {이름: 최고 기록}}
+
+    records는 구간 파일에 덧붙인 순서이며, top의 항목은 [구간 안 위치, 기록]입니다.
+    같은 점수는 먼저 저장된 기록이 앞에 오도록 기존 목록 뒤에 붙여 안정 정렬합니다.
+    """
+    if summary is None:
+        summary = {"count": 0, "top": {}, "best": {}}
+    first = summary["count"]
+    summary["count"] += len(records)
+    top = summary["top"]
+    best = summary["best"]
+    touched = set()
+    for index, record in enumerate(records, first):
+        for key in (ALL_MODES, record.get("mode", "")):
+            top.setdefault(key, []).append([index, record])
+            touched.add(key)
+        name = record.get("name", "")
+        if name not in best or _score(record) > _score(best[name]):
+            best[name] = record
+    for key in touched:
+        top[key] = sorted(top[key], key=lambda item: _score(item[1]), reverse=True)[:k]
+    return summary
+
+
+class PartitionedScoreStore(ScoreStore):
+    """구간 파일 + 요약(rollup.json) 점수 저장소
+
+    요약은 '가장 최근 구간을 뺀 모든 구간'을 항상 담고 있습니다. 새 구간의 기록이
+    들어오면 직전 구간을 한 번 읽어 요약에 넣고, 지난 구간에 늦게 들어온 기록은
+    요약에 바로 더합니다.
+
+    기록의 위치(records_after의 position)는 구간 순서가 아닌 저장 순서입니다. 지난
+    구간에 늦게 들어온 기록이 뒤 구간 기록의 위치를 밀어내지 않도록, 저장할 때마다
+    order.log에 "구간 건수" 줄을 덧붙이고 위치는 이 기록을 따라 셉니다. 조회(query,
+    iter_query)와 순위(top, 같은 점수는 먼저 저장된 순)도 모두 이 순서를 따릅니다.
+    """
+
+    supports_ordered_queries = True
+
+    def __init__(self, directory="scores", period="month", rollup_k=10):
+        super().__init__()
+        if period not in PERIODS:
+            raise ValueError("알 수 없는 구간 단위: %s (%s 중 하나)" % (period, ", ".join(PERIODS)))
+        self.directory = directory
+        self.period = period
+        self.rollup_k = rollup_k
+        os.makedirs(directory, exist_ok=True)
+        self.rollup_path = os.path.join(directory, "rollup.json")
+        self.order_path = os.path.join(directory, "order.log")
+        self.pending_path = os.path.join(directory, "append.pending")
+        self._file_lock = FileLock(os.path.join(directory, ".lock"))
+        self._version_file = VersionFile(os.path.join(directory, "version"))
+        self._rollup_cache = (None, None)
+        # 가장 최근 구간의 기록 (구간, inode, 읽은 바이트, 기록 목록)
+        self._latest_cache = (None, None, 0, [])
+        # 저장 순서 (inode, 읽은 바이트, runs, ends, 구간별 건수)
+        self._order_cache = (None, 0, [], [], {})
+        with self.lock, self._file_lock:
+            self._recover()
+            self._repair_rollup()
+
+    # ---- 파일 ----
+
+    def _partition_path(self, key):
+        return os.path.join(self.directory, key + ".jsonl")
+
+    def _partitions(self):
+        """구간 이름 목록 (시간 순)"""
+        return sorted(os.path.basename(path)[:-len(".jsonl")]
+                      for path in glob.glob(os.path.join(glob.escape(self.directory), "*.jsonl")))
+
+    def _read_partition(self, key):
+        return _read_jsonl(self._partition_path(key))
+
+    def _read_latest(self, key):
+        """가장 최근 구간의 기록 (잠금을 잡은 상태, 돌려받은 목록은 고치지 않음)
+
+        구간 파일은 덧붙이기만 하므로 지난번에 읽은 곳 뒤에 덧붙은 줄만 읽어 이어
+        붙입니다. 순위 조회와 다른 프로세스의 저장 따라잡기가 매번 구간 전체를 읽지 않도록.
+        """
+        try:
+            f = open(self._partition_path(key), "rb")
+        except FileNotFoundError:
+            return []
+        with f:
+            info = os.fstat(f.fileno())
+            cached_key, cached_ino, offset, records = self._latest_cache
+            if (cached_key, cached_ino) != (key, info.st_ino) or info.st_size < offset:
+                offset, records = 0, []
+            f.seek(offset)
+            data = f.read()
+        # 쓰다 만 마지막 줄은 다음에 이어서 읽음 (전체를 읽을 때와 같은 결과)
+        data = data[:data.rfind(b"\n") + 1]
+        records.extend(_parse_jsonl(data.decode("utf-8").splitlines()))
+        self._latest_cache = (key, info.st_ino, offset + len(data), records)
+        return records
+
+    def _read_rollup(self):
+        """요약 읽기 (잠금을 잡은 상태, 파일이 바뀌지 않았으면 지난번에 읽은 것)
+
+        이전 형식의 요약(상위 기록에 구간 안 위치가 없음)은 구간 파일로 새로 만듭니다.
+        """
+        try:
+            info = os.stat(self.rollup_path)
+        except FileNotFoundError:
+            return {"format": ROLLUP_FORMAT, "period": self.period, "k": self.rollup_k,
+                    "partitions": {}}
+        signature = (info.st_mtime_ns, info.st_size, info.st_ino)
+        if self._rollup_cache[0] != signature:
+            with open(self.rollup_path, "r", encoding="utf-8") as f:
+                self._rollup_cache = (signature, json.load(f))
+        if self._rollup_cache[1].get("format") != ROLLUP_FORMAT:
+            return self._build_rollup()
+        return self._rollup_cache[1]
+
+    def _build_rollup(self):
+        """구간 파일을 모두 읽어 요약을 새로 쓰기 (잠금을 잡은 상태)"""
+        keys = self._partitions()
+        rollup = {"format": ROLLUP_FORMAT, "period": self.period, "k": self.rollup_k,
+                  "partitions": {key: summarize(self._read_partition(key), self.rollup_k)
+                                 for key in keys[:-1]}}
+        self._write_rollup(rollup)
+        return rollup
+
+    def _write_rollup(self, rollup):
+        tmp_path = self.rollup_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(rollup, f, ensure_ascii=False, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.rollup_path)
+
+    def _write_order(self, counts):
+        """저장 순서 기록을 (구간, 건수) 목록으로 새로 쓰기 (잠금을 잡은 상태)"""
+        tmp_path = self.order_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("".join("%s %d\n" % (key, count) for key, count in counts if count))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.order_path)
+        self._order_cache = (None, 0, [], [], {})
+
+    def _order(self):
+        """저장 순서 → (runs, ends) (잠금을 잡은 상태, 돌려받은 목록은 고치지 않음)
+
+        runs[i] = (구간, 구간 파일 안의 시작 위치, 건수)이고 ends[i]는 runs[i]까지의
+        누적 건수입니다. order.log는 덧붙이기만 하므로 지난번에 읽은 곳 뒤만 읽습니다.
+        order.log가 없는 폴더(이전 버전이 만든 것)는 지금까지의 기록을 구간 순서대로
+        저장한 것으로 보고 새로 만듭니다.
+        """
+        try:
+            f = open(self.order_path, "rb")
+        except FileNotFoundError:
+            self._write_order([(key, len(self._read_partition(key))) for key in self._partitions()])
+            f = open(self.order_path, "rb")
+        with f:
+            info = os.fstat(f.fileno())
+            ino, offset, runs, ends, totals = self._order_cache
+            if ino != info.st_ino or info.st_size < offset:
+                offset, runs, ends, totals = 0, [], [], {}
+            f.seek(offset)
+            data = f.read()
+        data = data[:data.rfind(b"\n") + 1]
+        for line in data.decode("utf-8").splitlines():
+            key, count = line.rsplit(" ", 1)
+            count = int(count)
+            start = totals.get(key, 0)
+            totals[key] = start + count
+            if runs and runs[-1][0] == key:
+                # 같은 구간에 이어서 저장한 것은 한 덩어리로
+                runs[-1] = (key, runs[-1][1], runs[-1][2] + count)
+                ends[-1] += count
+            else:
+                runs.append((key, start, count))
+                ends.append((ends[-1] if ends else 0) + count)
+        self._order_cache = (info.st_ino, offset + len(data), runs, ends, totals)
+        return runs, ends
+
+    def _positions(self, runs, ends, keys):
+        """구간 안 위치 → 저장 순서 위치로 바꾸는 함수 (keys 구간만)"""
+        starts = {key: ([], []) for key in keys}
+        for (key, start, count), end in zip(runs, ends):
+            if key in starts:
+                starts[key][0].append(start)
+                starts[key][1].append(end - count)
+
+        def position(key, index):
+            local, ordered = starts[key]
+            i = max(bisect.bisect_right(local, index) - 1, 0)
+            return (ordered[i] if ordered else 0) + index - (local[i] if local else 0)
+        return position
+
+    def version(self):
+        """변경 번호 (어느 프로세스든 기록을 바꾸면 값이 달라짐, 파일 하나만 읽음)"""
+        return self._version_file.read()
+
+    # ---- 저장하다 멈춘 경우 ----
+
+    def _recover(self):
+        """append.pending이 남아 있으면 정리 (잠금을 잡은 상태) → 정리했는지
+
+        order.log까지 다 쓴 저장은 그대로 두고, 그 전에 멈춘 저장은 구간 파일과
+        order.log를 저장 전 크기로 되돌립니다 (저장을 마치지 못했으므로 기록도 없던 것).
+        """
+        try:
+            with open(self.pending_path, "r", encoding="utf-8") as f:
+                pending = json.load(f)
+        except FileNotFoundError:
+            return False
+        except ValueError:
+            # 흔적을 다 쓰기 전에 멈춤 (다른 파일은 바뀌지 않음)
+            pending = None
+        if pending is not None:
+            before, after = pending["order"]
+            order_size = os.path.getsize(self.order_path) if os.path.exists(self.order_path) else 0
+            if order_size < after:
+                for key, size in pending["partitions"].items():
+                    path = self._partition_path(key)
+                    if size is None:
+                        if os.path.exists(path):
+                            os.remove(path)
+                    elif os.path.exists(path):
+                        os.truncate(path, size)
+                if os.path.exists(self.order_path):
+                    os.truncate(self.order_path, before)
+                self._latest_cache = (None, None, 0, [])
+                self._order_cache = (None, 0, [], [], {})
+                self._version_file.bump()
+        os.remove(self.pending_path)
+        self._repair_rollup()
+        return True
+
+    def _repair_rollup(self):
+        """요약의 건수가 order.log와 다른 지난 구간을 다시 요약 (잠금을 잡은 상태)
+
+        저장은 order.log를 쓴 뒤에 요약을 고치므로, 그 사이에 멈췄으면 요약이 모자랍니다.
+        """
+        self._order()
+        totals = self._order_cache[4]
+        rollup = self._read_rollup()
+        partitions = rollup["partitions"]
+        stale = [key for key in self._partitions()[:-1]
+                 if key in partitions and partitions[key]["count"] != totals.get(key, 0)]
+        for key in stale:
+            partitions[key] = summarize(self._read_partition(key), self.rollup_k)
+        if stale:
+            self._write_rollup(rollup)
+
+    # ---- 쓰기 ----
+
+    def _group(self, records):
+        groups = {}
+        for record in records:
+            key = partition_key(record.get("timestamp", ""), self.period)
+            groups.setdefault(key, []).append(record)
+        return groups
+
+    def append_many(self, records):
+        """점수 기록 추가 (구간마다 한 번의 write + fsync)"""
+        groups = self._group(records)
+        order = "".join("%s %d\n" % (key, len(group)) for key, group in sorted(groups.items()))
+        with self.lock, self._file_lock:
+            self._recover()
+            before = self.version()
+            # order.log가 없으면 이번 기록을 쓰기 전에 만들어 둠
+            self._order()
+            keys = self._partitions()
+            current = keys[-1] if keys else None
+            # 저장 전 크기를 먼저 남겨 두고 구간 파일 → order.log 순서로 씀
+            order_size = os.path.getsize(self.order_path)
+            sizes = {key: os.path.getsize(self._partition_path(key)) if key in keys else None
+                     for key in groups}
+            with open(self.pending_path, "w", encoding="utf-8") as f:
+                json.dump({"order": [order_size, order_size + len(order.encode("utf-8"))],
+                           "partitions": sizes}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            for key, group in sorted(groups.items()):
+                with open(self._partition_path(key), "a", encoding="utf-8") as f:
+                    f.write("".join(_dump_line(record) for record in group))
+                    f.flush()
+                    os.fsync(f.fileno())
+            with open(self.order_path, "a", encoding="utf-8") as f:
+                f.write(order)
+                f.flush()
+                os.fsync(f.fileno())
+            os.remove(self.pending_path)
+            newest = max([key for key in (current,) if key is not None] + list(groups))
+
+            # 요약 갱신: 지난 구간에 들어온 기록과, 새 구간이 생겨 지난 구간이 된 직전 구간
+            rollup = self._read_rollup()
+            partitions = rollup["partitions"]
+            changed = set(groups) | ({current} if current is not None else set())
+            changed.discard(newest)
+            for key in sorted(changed):
+                if key in partitions:
+                    summarize(groups.get(key, []), self.rollup_k, partitions[key])
+                else:
+                    partitions[key] = summarize(self._read_partition(key), self.rollup_k)
+            if changed:
+                self._write_rollup(rollup)
+            self._version_file.bump()
+            # 구독자에게도 order.log와 같은 순서로
+            self._notify([record for _, group in sorted(groups.items()) for record in group],
+                         before, self.version())
+
+    def rebuild_rollup(self):
+        """구간 파일을 모두 읽어 요약을 새로 만들기 → 요약한 구간 수"""
+        with self.lock, self._file_lock:
+            return len(self._build_rollup()["partitions"])
+
+    def replace_all(self, records):
+        with self.lock, self._file_lock:
+            self._recover()
+            self._latest_cache = (None, None, 0, [])
+            for key in self._partitions():
+                os.remove(self._partition_path(key))
+            if os.path.exists(self.rollup_path):
+                os.remove(self.rollup_path)
+            groups = sorted(self._group(records).items())
+            for key, group in groups:
+                with open(self._partition_path(key), "w", encoding="utf-8") as f:
+                    f.write("".join(_dump_line(record) for record in group))
+            self._write_order([(key, len(group)) for key, group in groups])
+            self.rebuild_rollup()
+            self._version_file.bump()
+
+    def import_legacy_json(self, legacy_path):
+        """기존 scores.json(JSON 배열)을 구간 파일로 나눠 가져오기
+
+        가져온 파일은 '.imported'를 붙여 이름을 바꾸므로 한 번만 실행됩니다.
+        """
+        legacy, claimed = _claim_legacy(legacy_path)
+        if legacy is None:
+            return 0
+        with self.lock, self._file_lock:
+            self.append_many(legacy)
+            os.replace(claimed, legacy_path + ".imported")
+        return len(legacy)
+
+    # ---- 읽기 ----
+
+    def load_with_version(self):
+        """모든 구간의 기록을 저장 순서로 (지난 구간 파일도 모두 읽음)"""
+        with self.lock, self._file_lock:
+            records, _ = self.records_after(0)
+            return records, self.version()
+
+    def top(self, mode=None, k=10):
+        """점수 상위 k개 - 지난 구간은 요약, 최근 구간은 파일에서
+
+        후보마다 (구간, 구간 안 위치)를 order.log의 저장 순서 위치로 바꿔, 같은 점수는
+        먼저 저장된 기록이 앞에 오게 합니다 (지난 구간에 늦게 들어온 기록은 뒤).
+        """
+        if k > self.rollup_k:
+            return super().top(mode, k)
+        with self.lock, self._file_lock:
+            keys = self._partitions()
+            if not keys:
+                return []
+            runs, ends = self._order()
+            totals = self._order_cache[4]
+            partitions = self._read_rollup()["partitions"]
+            candidates = []
+            for key in keys[:-1]:
+                summary = partitions.get(key)
+                if summary is None:
+                    # 요약이 아직 없는 구간 (다른 버전이 만든 파일 등)
+                    candidates.extend((key, i, r) for i, r in enumerate(self._read_partition(key))
+                                      if _matches(r, mode=mode))
+                else:
+                    candidates.extend((key, i, r) for i, r in
+                                      summary["top"].get(ALL_MODES if mode is None else mode, []))
+            # order.log에 아직 없는 줄(다른 프로세스가 저장하다 멈춤)은 빼고
+            latest = self._read_latest(keys[-1])[:totals.get(keys[-1], 0)]
+            candidates.extend((keys[-1], i, r) for i, r in enumerate(latest) if _matches(r, mode=mode))
+            position = self._positions(runs, ends, keys)
+        candidates.sort(key=lambda item: (-_score(item[2]), position(item[0], item[1])))
+        return [record for _, _, record in candidates[:k]]
+
+    def query(self, mode=None, name=None, since=None, until=None, limit=None):
+        """조건에 맞는 기록을 저장 순서(order.log)로 - iter_query()를 limit건까지 모음"""
+        records = self.iter_query(mode, name, since, until)
+        try:
+            return list(itertools.islice(records, limit))
+        finally:
+            records.close()
+
+    def iter_query(self, mode=None, name=None, since=None, until=None):
+        """query()처럼 구간을 건너뛰며 저장 순서(order.log)로 한 줄씩 읽음
+
+        잠금을 잡은 동안 필요한 구간 파일을 모두 열고 크기와 저장 순서를 재 둡니다.
+        구간 파일은 덧붙이기만 하고 replace_all()도 파일을 지운 뒤 새로 만들므로, 열어 둔
+        파일에서 그 크기 안의 줄만 읽으면 잠금 없이도 한 시점의 기록을 얻습니다.
+        (구간마다 파일을 하나씩 열어 두므로 기간을 주면 열린 파일 수가 줄어듦)
+        """
+        low = partition_key(since, self.period) if since is not None else None
+        high = partition_key(until, self.period) if until is not None else None
+        files = {}
+        try:
+            with self.lock, self._file_lock:
+                runs, _ = self._order()
+                runs = list(runs)
+                partitions = self._read_rollup()["partitions"]
+                for key in self._partitions():
+                    if (low is not None and key < low) or (high is not None and key > high):
+                        continue
+                    summary = partitions.get(key)
+                    if name is not None and summary is not None and name not in summary["best"]:
+                        continue
+                    f = open(self._partition_path(key), "rb")
+                    files[key] = (f, os.fstat(f.fileno()).st_size)
+        except BaseException:
+            for f, _ in files.values():
+                f.close()
+            raise
+        return self._iter_runs(runs, files, (mode, name, since, until))
+
+    def _iter_runs(self, runs, files, conditions):
+        """열어 둔 구간 파일들에서 runs 순서대로 기록을 한 건씩"""
+        try:
+            readers = {key: _iter_jsonl(_read_lines(f, size)) for key, (f, size) in files.items()}
+            for key, _, count in runs:
+                reader = readers.get(key)
+                if reader is None:
+                    continue
+                # 한 구간의 runs는 파일 안의 위치 순이므로 이어서 count건만 읽으면 됨
+                for record in itertools.islice(reader, count):
+                    if _matches(record, *conditions):
+                        yield record
+        finally:
+            for f, _ in files.values():
+                f.close()
+
+    def records_after(self, position):
+        """position = 지금까지 읽은 기록 수 (저장 순서, order.log로 필요한 구간만 읽음)
+
+        지난 구간에 늦게 들어온 기록도 맨 뒤 위치를 받으므로 앞서 읽은 위치가 밀리지 않습니다.
+        """
+        with self.lock, self._file_lock:
+            runs, ends = self._order()
+            keys = self._partitions()
+            latest = keys[-1] if keys else None
+            partitions = {}
+            records = []
+            for i in range(bisect.bisect_right(ends, position), len(runs)):
+                key, start, count = runs[i]
+                if key not in partitions:
+                    partitions[key] = (self._read_latest(key) if key == latest
+                                       else self._read_partition(key))
+                skip = max(0, position - (ends[i] - count))
+                records.extend(partitions[key][start + skip:start + count])
+            return records, ends[-1] if ends else 0
+
+    def storage_stats(self):
+        with self.lock, self._file_lock:
+            keys = self._partitions()
+            _, ends = self._order()
+            count = ends[-1] if ends else 0
+            paths = [self._partition_path(key) for key in keys] + [self.rollup_path,
+                                                                  self.order_path]
+            size = sum(os.path.getsize(path) for path in paths if os.path.exists(path))
+            return {"records": count, "bytes": size, "partitions": len(keys),
+                    "rollup_bytes": os.path.getsize(self.rollup_path)
+                    if os.path.exists(self.rollup_path) else 0}
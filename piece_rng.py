@@ -0,0 +1,136 @@
+"""블록 순서 생성기 - 브라우저(rng.js)와 같은 시드면 같은 순서"""
+import json
+import os
+import secrets
+import threading
+
+from file_lock import FileLock
+
+MASK32 = 0xFFFFFFFF
+PIECE_COUNT = 7
+
+# random: 매번 7개 중 하나 (기존 방식) | bag: 7개를 섞은 묶음을 차례로 (7-bag)
+RANDOMIZERS = ("random", "bag")
+
+
+def new_seed():
+    """새 32비트 시드"""
+    return secrets.randbits(32)
+
+
+def mulberry32(seed):
+    """Mulberry32 난수 생성기 → 호출할 때마다 32비트 부호 없는 정수
+
+    rng.js의 mulberry32와 비트 단위로 같은 결과를 내도록 모든 연산을 2^32로
+    나눈 나머지로 계산합니다 (Math.imul → 곱셈 후 하위 32비트).
+    """
+    state = seed & MASK32
+
+    def next_uint32():
+        nonlocal state
+        state = (state + 0x6D2B79F5) & MASK32
+        t = ((state ^ (state >> 15)) * (1 | state)) & MASK32
+        t = ((t + (((t ^ (t >> 7)) * (61 | t)) & MASK32)) & MASK32) ^ t
+        return t ^ (t >> 14)
+
+    return next_uint32
+
+
+def _below(next_uint32, n):
+    """0 이상 n 미만 정수 (rng.js의 below와 같은 계산)"""
+    return (next_uint32() * n) >> 32
+
+
+def piece_source(seed, randomizer="random"):
+    """시드로 블록 번호(0~6)를 차례로 돌려주는 함수"""
+    next_uint32 = mulberry32(seed)
+    if randomizer == "random":
+        return lambda: _below(next_uint32, PIECE_COUNT)
+    if randomizer != "bag":
+        raise ValueError("알 수 없는 블록 생성 방식: %s" % randomizer)
+
+    bag = []
+
+    def next_from_bag():
+        if not bag:
+            # Fisher-Yates 섞기 후 뒤에서부터 꺼냄
+            pieces = list(range(PIECE_COUNT))
+            for i in range(PIECE_COUNT - 1, 0, -1):
+                j = _below(next_uint32, i + 1)
+                pieces[i], pieces[j] = pieces[j], pieces[i]
+            bag.extend(reversed(pieces))
+        return bag.pop()
+
+    return next_from_bag
+
+
+class RoundSeeds:
+    """서버가 정하는 블록 순서 시드
+
+    shared=True이면 한 라운드 동안 모든 학생이 같은 시드(같은 블록 순서)로
+    경기하고, False이면 게임마다 새 시드를 받습니다. path를 주면 라운드를 그
+    파일에 두어 여러 작업 프로세스가 같은 라운드를 씁니다 (어느 프로세스에서
+    새 라운드를 시작해도 모두 바뀜).
+    """
+
+    def __init__(self, randomizer="random", shared=False, path=None):
+        if randomizer not in RANDOMIZERS:
+            raise ValueError("알 수 없는 블록 생성 방식: %s" % randomizer)
+        self.randomizer = randomizer
+        self.shared = shared
+        self.path = path
+        self._lock = threading.Lock()
+        self._round = (1, new_seed())
+        self._file_lock = None
+        if path is not None:
+            self._file_lock = FileLock(path + ".lock")
+            with self._file_lock:
+                if not os.path.exists(path):
+                    self._write(self._round)
+
+    def _write(self, current):
+        tmp_path = "%s.%d.tmp" % (self.path, os.getpid())
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"round_id": current[0], "round_seed": current[1]}, f)
+        os.replace(tmp_path, self.path)
+
+    def _current(self):
+        """(라운드 번호, 시드) - 파일을 쓰면 다른 프로세스가 바꾼 값을 읽음"""
+        if self.path is not None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self._round = (int(data["round_id"]), int(data["round_seed"]))
+            except (OSError, ValueError, KeyError):
+                # 읽지 못하면 지난번 값 그대로
+                pass
+        return self._round
+
+    @property
+    def round_id(self):
+        with self._lock:
+            return self._current()[0]
+
+    @property
+    def round_seed(self):
+        with self._lock:
+            return self._current()[1]
+
+    def new_round(self):
+        """새 라운드 시작 (공유 시드 교체)"""
+        with self._lock:
+            if self._file_lock is None:
+                self._round = (self._round[0] + 1, new_seed())
+                return self._round[0]
+            with self._file_lock:
+                self._round = (self._current()[0] + 1, new_seed())
+                self._write(self._round)
+                return self._round[0]
+
+    def issue(self):
+        """다음 게임에 쓸 (라운드 번호, 시드)"""
+        with self._lock:
+            round_id, round_seed = self._current()
+            if self.shared:
+                return round_id, round_seed
+            return round_id, new_seed()
@@ -0,0 +1,171 @@
+"""배치 탐색 - 자동 플레이 봇용 (tetris_component/frontend/search.js와 같은 평가)
+
+현재 블록의 모든 회전 × 열을 곧바로 떨어뜨린 자리를 높이 합, 지운 줄, 구멍,
+울퉁불퉁함(이웃 열 높이 차 합)으로 평가합니다. 줄이 지워지지 않는 자리는 보드를
+복사하지 않고 블록이 닿는 열의 비트만으로 지표의 변화를 계산하며, 다음 블록까지 볼
+때는 현재 블록을 보드에 놓았다가 되돌립니다. 평가 순서와 동점 처리가 search.js와
+같으므로 같은 보드에서는 같은 자리를 고릅니다.
+"""
+from tetris_engine import BOARD_HEIGHT, BOARD_WIDTH, FULL_ROW, MASKS, PIECES, SKIRTS
+
+# 가중치: 높이 합, 지운 줄, 구멍, 이웃 열 높이 차 합
+WEIGHTS = {"height": -0.510066, "lines": 0.760666, "holes": -0.35663, "bumpiness": -0.184483}
+
+_W_HEIGHT = WEIGHTS["height"]
+_W_LINES = WEIGHTS["lines"]
+_W_HOLES = WEIGHTS["holes"]
+_W_BUMPINESS = WEIGHTS["bumpiness"]
+
+# 10비트 값의 1의 개수 (열은 20비트이므로 두 번 찾음)
+_POPCOUNT = [bin(value).count("1") for value in range(1 << 10)]
+
+
+def column_height(col):
+    """열 비트(비트 y = y번째 줄) → 높이 (가장 위 칸부터 바닥까지)"""
+    return BOARD_HEIGHT - ((col & -col).bit_length() - 1) if col else 0
+
+
+def _column_holes(col, height):
+    return height - _POPCOUNT[col & 0x3FF] - _POPCOUNT[col >> 10]
+
+
+def analyze(columns):
+    """열 비트 목록 → (열 높이 목록, 열 구멍 목록, 높이 합, 구멍 합, 울퉁불퉁함)"""
+    heights = [column_height(col) for col in columns]
+    holes = [_column_holes(col, h) for col, h in zip(columns, heights)]
+    bumpiness = sum(abs(heights[x] - heights[x - 1]) for x in range(1, BOARD_WIDTH))
+    return heights, holes, sum(heights), sum(holes), bumpiness
+
+
+def _weigh(height, lines, holes, bumpiness):
+    return _W_HEIGHT * height + _W_LINES * lines + _W_HOLES * holes + _W_BUMPINESS * bumpiness
+
+
+def _fits(board, rows, y):
+    if rows is None or y + len(rows) > BOARD_HEIGHT:
+        return False
+    for i, bits in enumerate(rows):
+        if board[y + i] & bits:
+            return False
+    return True
+
+
+def _drop_distance(columns, skirt, x, y):
+    distance = BOARD_HEIGHT
+    for dx, bottom, _ in skirt:
+        start = y + bottom + 1
+        below = columns[x + dx] >> start
+        gap = (below & -below).bit_length() - 1 if below else BOARD_HEIGHT - start
+        if gap < distance:
+            distance = gap
+    return distance
+
+
+def _full_rows(board, rows, y):
+    return [y + i for i, bits in enumerate(rows) if board[y + i] | bits == FULL_ROW]
+
+
+def _cleared_columns(columns, skirt, x, y, full):
+    """블록을 놓고 full 줄(위에서부터)을 지운 뒤의 열 비트 목록 (새 목록)"""
+    columns = list(columns)
+    for dx, _, cells in skirt:
+        columns[x + dx] |= cells << y
+    for row in full:
+        above = (1 << row) - 1
+        for c in range(BOARD_WIDTH):
+            col = columns[c]
+            columns[c] = ((col & above) << 1) | (col >> (row + 1) << (row + 1))
+    return columns
+
+
+def evaluate(board, columns, metrics, piece, rotation, x, y):
+    """board/columns(지표 metrics = analyze(columns))에 블록을 (x, y)에 놓은 뒤의 평가값
+
+    board와 columns는 바꾸지 않습니다.
+    """
+    skirt = SKIRTS[piece][rotation]
+    full = _full_rows(board, MASKS[piece][rotation][x], y)
+    if full:
+        _, _, height, holes, bumpiness = analyze(_cleared_columns(columns, skirt, x, y, full))
+        return _weigh(height, len(full), holes, bumpiness)
+
+    # 블록이 닿는 열만 높이/구멍을 다시 계산
+    heights, column_holes, height, holes, bumpiness = metrics
+    left = x
+    right = x + len(skirt) - 1
+    for c in range(max(left - 1, 0), min(right, BOARD_WIDTH - 2) + 1):
+        bumpiness -= abs(heights[c + 1] - heights[c])
+    before = heights[left - 1] if left > 0 else 0
+    for dx, _, cells in skirt:
+        c = x + dx
+        col = columns[c] | (cells << y)
+        h = column_height(col)
+        height += h - heights[c]
+        holes += _column_holes(col, h) - column_holes[c]
+        if c > 0:
+            bumpiness += abs(h - before)
+        before = h
+    if right < BOARD_WIDTH - 1:
+        bumpiness += abs(heights[right + 1] - before)
+    return _weigh(height, 0, holes, bumpiness)
+
+
+def _candidates(board, columns, piece, y):
+    """y줄에서 곧바로 떨어뜨릴 수 있는 (회전, 열, 착지 줄) - search.js와 같은 순서"""
+    for rotation in range(len(PIECES[piece])):
+        masks = MASKS[piece][rotation]
+        skirt = SKIRTS[piece][rotation]
+        for x in range(BOARD_WIDTH):
+            if _fits(board, masks[x], y):
+                yield rotation, x, y + _drop_distance(columns, skirt, x, y)
+
+
+def _best_single(board, columns, piece, y):
+    metrics = analyze(columns)
+    best = None
+    for rotation, x, land_y in _candidates(board, columns, piece, y):
+        score = evaluate(board, columns, metrics, piece, rotation, x, land_y)
+        if best is None or score > best["score"]:
+            best = {"piece": piece, "rotation": rotation, "x": x, "y": land_y, "score": score}
+    return best
+
+
+def best_placement(board, columns, piece, y=0, next_piece=None):
+    """가장 좋은 자리 {"piece", "rotation", "x", "y", "score", "next"} (놓을 자리가 없으면 None)
+
+    board는 줄 비트, columns는 열 비트 목록입니다 (TetrisGame.board/columns).
+    next_piece가 있으면 다음 블록(등장 위치 0줄)까지 놓아 본 합계로 고르고 next에 그 자리를
+    담습니다. 탐색 중에 board/columns를 잠시 바꾸지만 끝나면 원래대로 돌려놓습니다.
+    """
+    if next_piece is None:
+        return _best_single(board, columns, piece, y)
+
+    best = None
+    for rotation, x, land_y in list(_candidates(board, columns, piece, y)):
+        rows = MASKS[piece][rotation][x]
+        skirt = SKIRTS[piece][rotation]
+        full = _full_rows(board, rows, land_y)
+        if full:
+            after_columns = _cleared_columns(columns, skirt, x, land_y, full)
+            placed = list(board)
+            for i, bits in enumerate(rows):
+                placed[land_y + i] |= bits
+            after_board = [0] * len(full) + [row for row in placed if row != FULL_ROW]
+            following = _best_single(after_board, after_columns, next_piece, 0)
+        else:
+            for i, bits in enumerate(rows):
+                board[land_y + i] |= bits
+            for dx, _, cells in skirt:
+                columns[x + dx] |= cells << land_y
+            following = _best_single(board, columns, next_piece, 0)
+            # 제자리에 놓았던 블록 되돌리기 (놓기 전에는 빈칸이었음)
+            for i, bits in enumerate(rows):
+                board[land_y + i] &= ~bits
+            for dx, _, cells in skirt:
+                columns[x + dx] &= ~(cells << land_y)
+        # 다음 블록을 놓을 자리가 없으면 게임 오버 - 가장 나쁜 점수
+        score = _W_LINES * len(full) + (following["score"] if following else -1e9)
+        if best is None or score > best["score"]:
+            best = {"piece": piece, "rotation": rotation, "x": x, "y": land_y, "score": score,
+                    "next": following}
+    return best
@@ -0,0 +1,236 @@
+"""학생별 누적 통계와 개인 최고 기록
+
+점수가 저장될 때마다 그 학생의 집계(게임 수, 모드별 최고 점수, 최고 레벨, 누적
+라인, 최근 점수)만 갱신하므로 학생 기록 화면은 전체 기록을 훑지 않고 바로 읽습니다.
+집계는 반영한 기록 수와 함께 파일로 저장해 두고, 다시 시작하면 그 뒤에 추가된
+기록만 읽어 따라잡습니다.
+
+python player_stats.py rebuild     # 전체 기록으로 집계 다시 만들기
+python player_stats.py show 이름   # 한 학생의 집계 보기
+"""
+import argparse
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger("tetris.player_stats")
+
+
+def new_player():
+    return {"games": 0, "best": {}, "max_level": 0, "total_lines": 0, "total_score": 0,
+            "first": None, "last": None, "recent": []}
+
+
+def add_record(player, record, recent=10):
+    """기록 한 건을 학생 집계에 반영"""
+    score = record.get("score", 0)
+    mode = record.get("mode", "")
+    timestamp = record.get("timestamp")
+    player["games"] += 1
+    if score > player["best"].get(mode, -1):
+        player["best"][mode] = score
+    player["max_level"] = max(player["max_level"], record.get("level", 0))
+    player["total_lines"] += record.get("lines", 0)
+    player["total_score"] += score
+    if player["first"] is None:
+        player["first"] = timestamp
+    player["last"] = timestamp
+    player["recent"].append([timestamp, mode, score])
+    del player["recent"][:-recent]
+
+
+def summary(player):
+    """화면 표시용 값 - 평균, 최근 평균과 그 이전 평균 대비 변화(trend)"""
+    recent_scores = [score for _, _, score in player["recent"]]
+    result = dict(player, best=dict(player["best"]), recent=list(player["recent"]))
+    result["best_score"] = max(player["best"].values()) if player["best"] else 0
+    result["average"] = player["total_score"] / player["games"] if player["games"] else 0
+    result["recent_average"] = sum(recent_scores) / len(recent_scores) if recent_scores else 0
+    earlier = player["games"] - len(recent_scores)
+    result["trend"] = (result["recent_average"]
+                       - (player["total_score"] - sum(recent_scores)) / earlier
+                       if earlier else None)
+    return result
+
+
+class PlayerStats:
+    """모든 세션이 공유하는 학생별 집계
+
+    저장소 변경 알림으로 새 기록만 반영합니다. 다른 프로세스가 기록을 추가해 알림을
+    놓치면 records_after()로 반영한 기록 수 뒤의 기록만 읽고, 기록 수가 줄었으면
+    (백업 복원 등) 처음부터 다시 집계합니다.
+    """
+
+    def __init__(self, store, path=None, recent=10):
+        self.store = store
+        self.path = path
+        self.recent = recent
+        self._lock = threading.Lock()
+        self._players = {}
+        self._count = 0
+        self._version = None
+        self._names = None
+        self._dirty = False
+        self._stop = threading.Event()
+        self._saver = None
+        if path and os.path.exists(path):
+            self._load_file()
+        store.subscribe(self._on_change)
+
+    # ---- 집계 ----
+
+    def _add(self, records):
+        for record in records:
+            name = record.get("name", "")
+            player = self._players.get(name)
+            if player is None:
+                player = self._players[name] = new_player()
+                self._names = None
+            add_record(player, record, self.recent)
+        self._count += len(records)
+        self._dirty = self._dirty or bool(records)
+
+    def _reset(self):
+        self._players = {}
+        self._count = 0
+        self._names = None
+        self._dirty = True
+
+    def _catch_up(self):
+        """반영한 기록 수 뒤의 기록 읽기 (저장소 잠금과 집계 잠금을 잡은 상태)"""
+        version = self.store.version()
+        records, count = self.store.records_after(self._count)
+        if count < self._count:
+            # 기록이 줄었음 - 처음부터 다시 집계
+            self._reset()
+            records, count = self.store.records_after(0)
+        self._add(records)
+        self._version = version
+
+    def _on_change(self, records, before, after):
+        """저장소 변경 알림 처리"""
+        with self._lock:
+            if self._version == before:
+                self._add(records)
+                self._version = after
+            elif self._version != after:
+                # 알림을 놓친 상태 - 다음 조회 때 따라잡기
+                self._version = None
+
+    def _refresh(self):
+        if self.store.version() != self._version:
+            self._catch_up()
+
+    def rebuild(self):
+        """전체 기록으로 집계 다시 만들기 → 학생 수"""
+        with self.store.lock, self._lock:
+            self._reset()
+            self._catch_up()
+            count = len(self._players)
+        self.save()
+        return count
+
+    # ---- 조회 ----
+
+    def get(self, name):
+        """학생 한 명의 summary() (기록이 없으면 None)"""
+        with self.store.lock, self._lock:
+            self._refresh()
+            player = self._players.get(name)
+            return summary(player) if player is not None else None
+
+    def names(self):
+        """기록이 있는 학생 이름 (정렬, 새 학생이 생길 때만 다시 정렬)"""
+        with self.store.lock, self._lock:
+            self._refresh()
+            if self._names is None:
+                self._names = sorted(self._players)
+            return self._names
+
+    # ---- 파일 ----
+
+    def _load_file(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("recent") == self.recent:
+                self._players, self._count = data["players"], data["count"]
+        except (OSError, ValueError, KeyError):
+            logger.exception("학생별 집계 파일을 읽지 못해 새로 집계합니다: %s", self.path)
+
+    def save(self):
+        """집계를 파일로 저장 (바뀐 것이 없으면 건너뜀)"""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            text = json.dumps({"count": self._count, "recent": self.recent,
+                               "players": self._players},
+                              ensure_ascii=False, separators=(",", ":"))
+            self._dirty = False
+        # 작업 프로세스 여러 개가 같은 파일에 저장해도 임시 파일이 겹치지 않도록
+        tmp_path = "%s.%d.tmp" % (self.path, os.getpid())
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, self.path)
+
+    def start_saver(self, interval=30):
+        """interval초마다 바뀐 집계를 저장하는 스레드 시작
+
+        저장 파일은 다시 시작할 때 따라잡을 양을 줄이는 용도라 잠깐 늦어도 됩니다.
+        """
+        if self._saver is not None or not self.path:
+            return
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.save()
+                except OSError:
+                    logger.exception("학생별 집계 저장 실패")
+
+        self._saver = threading.Thread(target=run, name="player-stats-saver", daemon=True)
+        self._saver.start()
+
+    def close(self):
+        self._stop.set()
+        if self._saver is not None:
+            self._saver.join()
+            self._saver = None
+        self.save()
+
+
+def main():
+    import config
+    from score_store import BACKENDS, open_store
+
+    parser = argparse.ArgumentParser(description="학생별 통계 관리")
+    parser.add_argument("--backend", choices=BACKENDS, default=config.SCORES_BACKEND,
+                        help="저장소 종류 (기본값: SCORES_BACKEND)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("rebuild", help="전체 기록으로 집계 다시 만들기")
+    show_parser = sub.add_parser("show", help="한 학생의 집계 보기")
+    show_parser.add_argument("name")
+    args = parser.parse_args()
+
+    store = open_store(args.backend)
+    try:
+        stats = PlayerStats(store, config.PLAYER_STATS_FILE, recent=config.PLAYER_RECENT_GAMES)
+        if args.command == "rebuild":
+            count = stats.rebuild()
+            print("학생 %d명의 집계를 다시 만들었습니다" % count)
+        elif args.command == "show":
+            player = stats.get(args.name)
+            if player is None:
+                print("%s: 기록이 없습니다" % args.name)
+            else:
+                print(json.dumps(player, ensure_ascii=False, indent=1))
+            stats.save()
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
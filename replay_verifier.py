@@ -0,0 +1,112 @@
+"""제출된 점수를 입력 기록 재실행으로 검증 (프로세스 풀)"""
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from tetris_engine import SPEEDS, replay
+
+# 기록 길이 상한 (1초에 입력 50개씩 1시간)
+MAX_LOG_LENGTH = 50 * 60 * 60
+
+
+def verify_submission(submission, expected_seed=None, expected_randomizer=None):
+    """제출 내용을 재실행해 (통과 여부, 사유) 반환 - 작업 프로세스에서 실행
+
+    expected_seed/expected_randomizer는 서버가 그 게임에 지정한 값입니다.
+    """
+    if expected_seed is not None and submission.get("seed") != expected_seed:
+        return False, "서버가 지정한 블록 순서가 아닙니다"
+    randomizer = submission.get("randomizer", "random")
+    if expected_randomizer is not None and randomizer != expected_randomizer:
+        return False, "서버가 지정한 블록 생성 방식이 아닙니다"
+    log = submission.get("log")
+    if not isinstance(log, str) or not log:
+        return False, "입력 기록이 없습니다"
+    if len(log) > MAX_LOG_LENGTH:
+        return False, "입력 기록이 너무 깁니다"
+    if submission.get("mode") not in SPEEDS:
+        return False, "알 수 없는 게임 모드입니다"
+    try:
+        game = replay(int(submission["seed"]), log, submission["mode"],
+                      int(submission["start_level"]), randomizer)
+    except (KeyError, TypeError, ValueError) as exc:
+        return False, str(exc)
+    if not game.over:
+        return False, "게임이 끝나지 않은 기록입니다"
+    claimed = (submission.get("score"), submission.get("level"), submission.get("lines"))
+    if claimed != (game.score, game.level, game.lines):
+        return False, "기록과 점수가 다릅니다 (재실행 결과 %d점)" % game.score
+    return True, ""
+
+
+class ReplayVerifier:
+    """검증 작업을 프로세스 풀에 나눠 맡기고 처리 시간/거부 건수를 집계"""
+
+    def __init__(self, workers=None, history=1000):
+        self.workers = workers
+        self._pool = self._new_pool()
+        self._pool_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=history)
+        self.verified = 0
+        self.rejected = 0
+
+    def _new_pool(self):
+        # Streamlit 서버는 스레드가 많으므로 fork 대신 spawn으로 작업 프로세스 생성
+        return ProcessPoolExecutor(max_workers=self.workers,
+                                   mp_context=multiprocessing.get_context("spawn"))
+
+    def submit(self, submission, expected_seed=None, expected_randomizer=None):
+        """검증 시작 → (통과 여부, 사유)를 결과로 갖는 Future
+
+        작업 프로세스가 죽어 풀이 깨졌으면 새 풀을 만들어 맡깁니다. 깨진 풀에서 기다리던
+        검증은 BrokenProcessPool로 끝나므로 호출한 쪽이 다시 submit하면 됩니다.
+        """
+        started = time.perf_counter()
+        args = (verify_submission, submission, expected_seed, expected_randomizer)
+        with self._pool_lock:
+            try:
+                future = self._pool.submit(*args)
+            except BrokenProcessPool:
+                self._pool.shutdown(wait=False)
+                self._pool = self._new_pool()
+                future = self._pool.submit(*args)
+
+        def record(done):
+            if isinstance(done.exception(), BrokenProcessPool):
+                return  # 거부가 아니라 다시 맡길 검증
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._latencies.append(elapsed)
+                if done.exception() is None and done.result()[0]:
+                    self.verified += 1
+                else:
+                    self.rejected += 1
+
+        future.add_done_callback(record)
+        return future
+
+    def reject(self, reason):
+        """재실행할 필요 없이 거부 → submit()처럼 (False, reason)을 결과로 갖는 Future"""
+        with self._lock:
+            self.rejected += 1
+        future = Future()
+        future.set_result((False, reason))
+        return future
+
+    def stats(self):
+        """검증 통계 (건수와 최근 처리 시간 백분위, ms)"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            verified, rejected = self.verified, self.rejected
+        stats = {"verified": verified, "rejected": rejected, "p50_ms": None, "p99_ms": None}
+        if latencies:
+            stats["p50_ms"] = latencies[len(latencies) // 2] * 1000
+            stats["p99_ms"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+        return stats
+
+    def close(self):
+        self._pool.shutdown()
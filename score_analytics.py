@@ -0,0 +1,324 @@
+"""점수 기록 분석 - 교사용 통계 (점수 분포, 모드/시작 레벨별 백분위, 레벨당 라인, 날짜별 활동)
+
+기록을 열 단위 NumPy 배열(점수, 라인, 레벨, 시작 레벨, 모드/이름 번호, 날짜)로 한 번만
+읽어 두고 저장소 변경 알림으로 새 기록만 덧붙입니다. 통계는 배열 전체에 대한 정렬 한
+번과 bincount/reduceat 몇 번으로 계산하며, 저장소 version()이 같으면 지난 결과를 그대로
+돌려줍니다.
+
+python score_analytics.py                  # 저장소 통계 출력 (JSON)
+python score_analytics.py --bench 1000000  # 가상 기록으로 적재/계산 시간 측정
+"""
+import argparse
+import json
+import threading
+import time
+
+import numpy as np
+
+from leaderboard import GAME_MODES
+
+PERCENTILES = (25, 50, 75, 90)
+_EPOCH_DAY = np.datetime64("1970-01-01", "D")
+_NO_DAY = -1
+# 그룹 통계에서 점수가 차지하는 아래쪽 비트 (이보다 큰 점수는 최댓값으로 취급)
+_SCORE_BITS = 40
+_SCORE_MASK = (1 << _SCORE_BITS) - 1
+_DAY_DIGITS = [0, 1, 2, 3, 5, 6, 8, 9]
+
+
+def _parse_day(text):
+    try:
+        return np.datetime64(text, "D")
+    except ValueError:
+        return np.datetime64("NaT")
+
+
+def _day_numbers(days):
+    """'YYYY-MM-DD' 문자열 목록 → 1970-01-01부터의 일 수 배열 (날짜가 아니면 _NO_DAY)
+
+    모양(숫자와 '-' 자리)은 배열 한 번으로 확인합니다. NumPy는 "today"나 "2024" 같은
+    문자열도 날짜로 읽으므로 모양이 맞는 것만 변환하고, 2월 30일처럼 없는 날짜가
+    섞여 변환이 실패하면 그때만 하나씩 변환합니다.
+    """
+    text = np.array(days, dtype="U10")
+    chars = text.view(np.uint32).reshape(len(days), 10)
+    digits = (chars >= ord("0")) & (chars <= ord("9"))
+    valid = (digits[:, _DAY_DIGITS].all(axis=1)
+             & (chars[:, 4] == ord("-")) & (chars[:, 7] == ord("-")))
+    if not valid.all():
+        days = text[valid].tolist()
+    try:
+        day = np.array(days, dtype="datetime64[D]")
+    except ValueError:
+        day = np.array([_parse_day(value) for value in days], dtype="datetime64[D]")
+    numbers = np.full(len(text), _NO_DAY, np.int64)
+    numbers[valid] = np.where(np.isnat(day), _NO_DAY, (day - _EPOCH_DAY).astype(np.int64))
+    return numbers
+
+
+class ScoreColumns:
+    """기록의 열 단위 배열 (덧붙이기만 함, 공간이 모자라면 두 배로 늘림)
+
+    모드와 이름은 처음 나온 순서의 번호로, 날짜는 1970-01-01부터의 일 수로 저장합니다.
+    기록마다 정해지는 레벨당 라인(그 게임에서 지나간 레벨 수마다 지운 라인)은 덧붙일 때
+    미리 계산해 둡니다.
+    """
+
+    _FIELDS = (("score", np.int64), ("lines", np.int32), ("level", np.int32),
+               ("start_level", np.int32), ("mode", np.int32), ("name", np.int32),
+               ("day", np.int32), ("lines_per_level", np.float64))
+
+    def __init__(self, capacity=1024):
+        self.size = 0
+        self._arrays = {field: np.zeros(capacity, dtype) for field, dtype in self._FIELDS}
+        self.modes = list(GAME_MODES)
+        self._mode_codes = {mode: i for i, mode in enumerate(self.modes)}
+        self.names = []
+        self._name_codes = {}
+
+    def _code(self, codes, values, value):
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(values)
+            values.append(value)
+        return code
+
+    def extend(self, records):
+        """기록 목록 덧붙이기 (필드마다 한 번씩만 배열로 변환)"""
+        columns = {field: [] for field, _ in self._FIELDS}
+        days = []
+        for record in records:
+            columns["score"].append(record.get("score", 0))
+            columns["lines"].append(record.get("lines", 0))
+            columns["level"].append(record.get("level", 1))
+            # start_level이 없는 예전 기록은 1레벨부터 시작한 게임
+            columns["start_level"].append(record.get("start_level") or 1)
+            columns["mode"].append(self._code(self._mode_codes, self.modes, record.get("mode", "")))
+            columns["name"].append(self._code(self._name_codes, self.names, record.get("name", "")))
+            days.append(str(record.get("timestamp") or "")[:10])
+        count = len(days)
+        if not count:
+            return
+        columns["day"] = _day_numbers(days)
+        played_levels = np.maximum(np.array(columns["level"]) - np.array(columns["start_level"]) + 1, 1)
+        columns["lines_per_level"] = np.array(columns["lines"]) / played_levels
+
+        end = self.size + count
+        capacity = len(self._arrays["score"])
+        if end > capacity:
+            while capacity < end:
+                capacity *= 2
+            for field, dtype in self._FIELDS:
+                grown = np.zeros(capacity, dtype)
+                grown[:self.size] = self._arrays[field][:self.size]
+                self._arrays[field] = grown
+        for field, _ in self._FIELDS:
+            self._arrays[field][self.size:end] = columns[field]
+        self.size = end
+
+    def view(self):
+        """지금까지 덧붙인 기록의 배열들 (이후 extend와 무관한 고정된 보기)"""
+        return {field: array[:self.size] for field, array in self._arrays.items()}
+
+
+def _group_stats(keys, scores, efficiency):
+    """keys(0 이상 정수)가 같은 기록끼리 점수 백분위/평균/최고와 평균 레벨당 라인
+
+    키를 점수 위쪽 비트에 붙인 정수 배열을 한 번 정렬하면 그룹별로 점수가 정렬되므로,
+    그룹 경계의 위치 계산만으로 모든 그룹의 백분위를 한꺼번에 구합니다 (np.percentile의
+    linear 방식과 같은 값). 합계는 정렬 없이 bincount로 구합니다.
+    → (그룹 키, 기록 수, {통계 이름: 그룹별 값})
+    """
+    keys = keys.astype(np.int64)
+    counts = np.bincount(keys)
+    groups = np.flatnonzero(counts)
+    counts = counts[groups]
+    packed = np.sort((keys << _SCORE_BITS) | np.clip(scores, 0, _SCORE_MASK))
+    sorted_scores = (packed & _SCORE_MASK).astype(np.float64)
+    starts = np.r_[0, np.cumsum(counts)[:-1]]
+    stats = {
+        "mean": np.bincount(keys, weights=scores)[groups] / counts,
+        "max": sorted_scores[starts + counts - 1],
+        "lines_per_level": np.bincount(keys, weights=efficiency)[groups] / counts,
+    }
+    for q in PERCENTILES:
+        position = starts + (counts - 1) * (q / 100)
+        low = np.floor(position).astype(np.int64)
+        high = np.minimum(low + 1, starts + counts - 1)
+        fraction = position - low
+        stats["p%d" % q] = sorted_scores[low] + (sorted_scores[high] - sorted_scores[low]) * fraction
+    return groups, counts, stats
+
+
+def _rows(labels, counts, stats):
+    names = ("mean",) + tuple("p%d" % q for q in PERCENTILES) + ("max", "lines_per_level")
+    columns = {name: stats[name].tolist() for name in names}
+    return [dict(label, games=int(count), **{name: columns[name][i] for name in names})
+            for i, (label, count) in enumerate(zip(labels, counts.tolist()))]
+
+
+def compute(data, modes, students, bins=20):
+    """ScoreColumns.view()의 배열, 모드 이름 목록, 학생 수 → 통계 dict
+
+    - modes: 모드별 기록 수, 평균, 백분위(p25/p50/p75/p90), 최고, 평균 레벨당 라인
+    - groups: 모드 × 시작 레벨별 같은 항목
+    - histogram: 모드별 점수 분포 (공통 구간 edges)
+    - activity: 날짜별 게임 수와 게임한 학생 수
+    """
+    size = len(data["score"])
+    report = {"records": size, "students": students, "modes": [], "groups": [],
+              "histogram": {"edges": [], "counts": {}},
+              "activity": {"dates": [], "games": [], "students": []}}
+    if not size:
+        return report
+
+    scores, mode = data["score"], data["mode"]
+    start_level = data["start_level"]
+    efficiency = data["lines_per_level"]
+    mode_names = modes
+
+    keys, counts, stats = _group_stats(mode, scores, efficiency)
+    report["modes"] = _rows([{"mode": mode_names[k]} for k in keys.tolist()], counts, stats)
+
+    levels = int(start_level.max()) + 1
+    keys, counts, stats = _group_stats(mode.astype(np.int64) * levels + start_level,
+                                       scores, efficiency)
+    report["groups"] = _rows([{"mode": mode_names[k // levels], "start_level": k % levels}
+                              for k in keys.tolist()], counts, stats)
+
+    # 모든 모드에 같은 구간을 써서 분포를 나란히 비교
+    top = max(int(scores.max()), 1)
+    width = -(-top // bins)
+    bucket = np.minimum(np.maximum(scores, 0) // width, bins - 1)
+    histogram = np.bincount(mode.astype(np.int64) * bins + bucket,
+                            minlength=len(mode_names) * bins).reshape(len(mode_names), bins)
+    report["histogram"] = {
+        "edges": [i * width for i in range(bins + 1)],
+        "counts": {mode_names[i]: row for i, row in enumerate(histogram.tolist()) if any(row)},
+    }
+
+    day = data["day"]
+    dated = day != _NO_DAY
+    if dated.any():
+        day, name = day[dated].astype(np.int64), data["name"][dated].astype(np.int64)
+        first = int(day.min())
+        span = int(day.max()) - first + 1
+        games = np.bincount(day - first, minlength=span)
+        # (날짜, 학생) 쌍의 종류 수 = 그날 게임한 학생 수
+        pairs = (day - first) * students + name
+        if span * students <= 4 * len(pairs):
+            active = (np.bincount(pairs, minlength=span * students)
+                      .reshape(span, students) > 0).sum(axis=1)
+        else:
+            active = np.bincount(np.unique(pairs) // students, minlength=span)
+        dates = _EPOCH_DAY + first + np.arange(span)
+        report["activity"] = {"dates": [str(d) for d in dates], "games": games.tolist(),
+                              "students": active.tolist()}
+    return report
+
+
+class ScoreAnalytics:
+    """모든 세션이 공유하는 점수 분석
+
+    열 배열은 저장소 변경 알림으로 새 기록만 덧붙이고, 알림을 놓치면 records_after()로
+    따라잡습니다 (기록 수가 줄었으면 처음부터 다시 읽음). 계산 결과는 계산한 시점의
+    저장소 version()과 함께 보관해 버전이 바뀔 때만 다시 계산합니다.
+    """
+
+    def __init__(self, store, bins=20):
+        self.store = store
+        self.bins = bins
+        self._lock = threading.Lock()
+        self._compute_lock = threading.Lock()
+        self._columns = ScoreColumns()
+        self._version = None
+        self._report = None
+        store.subscribe(self._on_change)
+
+    def _catch_up(self):
+        """반영한 기록 수 뒤의 기록 읽기 (저장소 잠금과 분석 잠금을 잡은 상태)"""
+        version = self.store.version()
+        records, count = self.store.records_after(self._columns.size)
+        if count < self._columns.size:
+            self._columns = ScoreColumns()
+            records, count = self.store.records_after(0)
+        self._columns.extend(records)
+        self._version = version
+
+    def _on_change(self, records, before, after):
+        """저장소 변경 알림 처리"""
+        with self._lock:
+            if self._version == before:
+                self._columns.extend(records)
+                self._version = after
+            elif self._version != after:
+                self._version = None
+
+    def _snapshot(self):
+        """최신 기록까지 반영한 (version, compute() 인자)
+
+        배열은 덧붙이기만 하므로 지금 크기의 보기는 잠금을 놓은 뒤 저장이 이어져도
+        바뀌지 않습니다.
+        """
+        with self.store.lock, self._lock:
+            if self.store.version() != self._version:
+                self._catch_up()
+            columns = self._columns
+            return self._version, (columns.view(), list(columns.modes), len(columns.names))
+
+    def report(self):
+        """compute() 결과 + version, compute_ms (저장소가 그대로면 캐시된 결과)"""
+        version, arguments = self._snapshot()
+        report = self._report
+        if report is not None and report["version"] == version:
+            return report
+        # 동시에 여러 세션이 요청해도 계산은 한 번만
+        with self._compute_lock:
+            report = self._report
+            if report is not None and report["version"] == version:
+                return report
+            started = time.perf_counter()
+            report = compute(*arguments, bins=self.bins)
+            report["version"] = version
+            report["compute_ms"] = (time.perf_counter() - started) * 1000
+            self._report = report
+            return report
+
+
+def main():
+    import config
+    from score_store import BACKENDS, open_store
+
+    parser = argparse.ArgumentParser(description="점수 기록 분석")
+    parser.add_argument("--backend", choices=BACKENDS, default=config.SCORES_BACKEND,
+                        help="저장소 종류 (기본값: SCORES_BACKEND)")
+    parser.add_argument("--bench", type=int, metavar="N",
+                        help="저장소 대신 가상 기록 N개로 적재/계산 시간 측정")
+    args = parser.parse_args()
+
+    if args.bench:
+        from benchmarks.synthetic_scores import synthetic_records
+
+        records = list(synthetic_records(args.bench))
+        started = time.perf_counter()
+        columns = ScoreColumns()
+        columns.extend(records)
+        loaded = time.perf_counter()
+        report = compute(columns.view(), columns.modes, len(columns.names))
+        computed = time.perf_counter()
+        print("기록 %d개: 배열 적재 %.0fms, 통계 계산 %.0fms (모드 %d, 그룹 %d, 날짜 %d)" % (
+            args.bench, (loaded - started) * 1000, (computed - loaded) * 1000,
+            len(report["modes"]), len(report["groups"]), len(report["activity"]["dates"])))
+        return
+
+    store = open_store(args.backend)
+    try:
+        report = ScoreAnalytics(store).report()
+        print(json.dumps({key: value for key, value in report.items() if key != "version"},
+                         ensure_ascii=False, indent=1))
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
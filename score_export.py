@@ -0,0 +1,179 @@
+"""점수 기록 내보내기 - 기간/모드/학생으로 거른 기록을 CSV 또는 JSONL로 (선택: gzip)
+
+저장소의 iter_query()가 기록을 한 건씩 내주면 일정 크기의 바이트 조각으로 묶어
+내보내므로, 기록이 아무리 많아도 메모리에는 조각 하나와 압축기 상태만 남습니다.
+
+python score_export.py --since 2024-03-01 --until 2024-03-31 -o march.csv
+python score_export.py --format jsonl --gzip --mode Hard -o hard.jsonl.gz
+python score_export.py --name 홍길동 > 홍길동.csv
+"""
+import argparse
+import csv
+import io
+import sys
+import tempfile
+import zlib
+from datetime import date, timedelta
+
+from score_store import _dump_line
+
+FORMATS = ("csv", "jsonl")
+
+# CSV 열 순서 (그 밖의 값은 CSV에서는 빠지고 JSONL에는 그대로 들어감)
+CSV_FIELDS = ("timestamp", "name", "mode", "level", "score", "lines", "start_level", "seed",
+              "randomizer", "verified", "hinted")
+
+CHUNK_BYTES = 64 * 1024
+
+# 스프레드시트가 수식으로 읽는 첫 글자 (CSV 수식 주입)
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_cell(value):
+    """학생이 입력한 이름 같은 글자가 Excel에서 수식으로 실행되지 않도록 앞에 ' 붙이기"""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _csv_lines(records):
+    """기록 → CSV 텍스트 조각 (첫 조각은 BOM + 머리글, Excel에서 한글이 깨지지 않도록)
+
+    줄 끝을 \\r\\n으로 해야 csv 모듈이 \\r이 든 칸도 따옴표로 감쌉니다.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, CSV_FIELDS, extrasaction="ignore", lineterminator="\r\n")
+    buffer.write("\ufeff")
+    writer.writeheader()
+    yield buffer.getvalue()
+    for record in records:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow({key: _csv_cell(value) for key, value in record.items()})
+        yield buffer.getvalue()
+
+
+def _jsonl_lines(records):
+    for record in records:
+        yield _dump_line(record)
+
+
+def export_chunks(records, fmt="csv", compress=False, chunk_bytes=CHUNK_BYTES):
+    """기록 반복자 → 내보낼 파일 내용을 chunk_bytes 안팎의 bytes 조각으로
+
+    compress가 참이면 gzip 형식으로 압축해 냅니다 (압축기가 모아 둔 만큼씩).
+    """
+    if fmt not in FORMATS:
+        raise ValueError("알 수 없는 내보내기 형식: %s (%s 중 하나)" % (fmt, ", ".join(FORMATS)))
+    lines = _csv_lines(records) if fmt == "csv" else _jsonl_lines(records)
+    # wbits=31: gzip 머리말/꼬리말 (gzip, zcat으로 풀림)
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    pending = []
+    size = 0
+    for line in lines:
+        pending.append(line)
+        size += len(line)
+        if size >= chunk_bytes:
+            data = "".join(pending).encode("utf-8")
+            pending, size = [], 0
+            if compressor is not None:
+                data = compressor.compress(data)
+            if data:
+                yield data
+    data = "".join(pending).encode("utf-8")
+    if compressor is not None:
+        data = compressor.compress(data) + compressor.flush()
+    if data:
+        yield data
+
+
+def export_store(store, fmt="csv", compress=False, mode=None, name=None, since=None, until=None):
+    """저장소에서 조건에 맞는 기록을 저장 순서로 내보내는 bytes 조각 반복자
+
+    since/until은 ISO 형식 타임스탬프 문자열이며 until은 포함하지 않습니다.
+    """
+    return export_chunks(store.iter_query(mode, name, since, until), fmt, compress)
+
+
+def export_to_file(store, fmt="csv", compress=False, mode=None, name=None, since=None,
+                   until=None):
+    """export_store()의 조각을 임시 파일에 써서 처음 위치로 되감은 파일 반환 (화면 내려받기용)
+
+    조각을 메모리에 모으지 않으므로 만드는 동안 메모리는 조각 하나만큼만 씁니다.
+    파일은 닫으면 지워집니다.
+    """
+    out = tempfile.TemporaryFile()
+    try:
+        for chunk in export_store(store, fmt, compress, mode, name, since, until):
+            out.write(chunk)
+        out.seek(0)
+    except BaseException:
+        out.close()
+        raise
+    return out
+
+
+def export_filename(fmt="csv", compress=False, mode=None, name=None, since=None, until=None):
+    """내보낸 파일 이름 (조건을 이름에 넣음) - 예: scores_Hard_2024-03-01_2024-03-31.csv.gz"""
+    parts = ["scores"]
+    parts.extend(value for value in (mode, name) if value)
+    if since or until:
+        last = None
+        if until:
+            # until은 포함하지 않으므로 하루 전 날짜가 마지막 날
+            last = (date.fromisoformat(until[:10]) - timedelta(days=1)).isoformat()
+        parts.append("%s_%s" % ((since or "")[:10] or "처음", last or "지금"))
+    return "_".join(parts) + "." + fmt + (".gz" if compress else "")
+
+
+def export_mime(fmt="csv", compress=False):
+    """내려받을 파일의 MIME 형식"""
+    if compress:
+        return "application/gzip"
+    return "text/csv" if fmt == "csv" else "application/x-ndjson"
+
+
+def date_range(start=None, end=None):
+    """날짜(포함) 범위 → iter_query의 (since, until) 문자열"""
+    since = start.isoformat() if start else None
+    until = (end + timedelta(days=1)).isoformat() if end else None
+    return since, until
+
+
+def main():
+    import config
+    from score_store import BACKENDS, open_store
+
+    parser = argparse.ArgumentParser(description="점수 기록 내보내기")
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--gzip", action="store_true", help="gzip으로 압축")
+    parser.add_argument("--mode", help="게임 모드만")
+    parser.add_argument("--name", help="학생 이름만")
+    parser.add_argument("--since", type=date.fromisoformat, help="이 날짜부터 (YYYY-MM-DD)")
+    parser.add_argument("--until", type=date.fromisoformat, help="이 날짜까지 (포함)")
+    parser.add_argument("-o", "--output", help="저장할 파일 (기본: 표준 출력)")
+    parser.add_argument("--backend", choices=BACKENDS, default=config.SCORES_BACKEND,
+                        help="저장소 종류 (기본값: SCORES_BACKEND)")
+    args = parser.parse_args()
+
+    since, until = date_range(args.since, args.until)
+    store = open_store(args.backend)
+    try:
+        chunks = export_store(store, args.format, args.gzip, args.mode, args.name, since, until)
+        out = open(args.output, "wb") if args.output else sys.stdout.buffer
+        try:
+            written = 0
+            for chunk in chunks:
+                out.write(chunk)
+                written += len(chunk)
+        finally:
+            if args.output:
+                out.close()
+        if args.output:
+            print("%s: %d바이트" % (args.output, written), file=sys.stderr)
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
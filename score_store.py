@@ -0,0 +1,653 @@
+"""점수 저장소 - 공통 인터페이스와 추가 전용(JSONL) 로그 백엔드"""
+import argparse
+import glob
+import json
+import logging
+import os
+import threading
+
+from file_lock import FileLock
+from version_file import VersionFile
+
+logger = logging.getLogger("tetris.store")
+
+def _dump_line(record):
+    """기록 한 건을 JSONL 한 줄로 변환"""
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def _iter_jsonl(lines):
+    """JSONL 줄들 → 기록을 한 건씩 (쓰다 만 줄은 건너뜀)"""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            continue
+
+
+def _parse_jsonl(lines):
+    """JSONL 줄들 → 기록 목록 (쓰다 만 줄은 건너뜀)"""
+    return list(_iter_jsonl(lines))
+
+
+def _read_jsonl(path):
+    """JSONL 파일 읽기 (쓰다 만 마지막 줄은 건너뜀)"""
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return _parse_jsonl(f)
+
+
+_DECODER = json.JSONDecoder()
+_RECORDS_START = '"records":['
+
+
+def _iter_json_array(f, buffer, chunk_size):
+    """배열 여는 괄호 뒤부터 값을 한 건씩 (chunk_size 글자씩 읽음)"""
+    pos = 0
+    while True:
+        while pos < len(buffer) and buffer[pos] in ", \t\r\n":
+            pos += 1
+        if pos < len(buffer) and buffer[pos] == "]":
+            return
+        try:
+            if pos == len(buffer):
+                raise ValueError("읽은 내용 끝")
+            value, pos = _DECODER.raw_decode(buffer, pos)
+        except ValueError:
+            # 값이 읽은 부분 밖으로 이어짐 - 더 읽어서 다시 시도
+            chunk = f.read(chunk_size)
+            if not chunk:
+                raise ValueError("스냅샷 파일이 중간에 끊겼습니다")
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        yield value
+
+
+def _read_snapshot_header(f, chunk_size=1 << 16):
+    """스냅샷 파일 앞부분 → (머리말 dict, '"records":[' 뒤로 이미 읽은 글자)
+
+    _write_snapshot이 쓰는 {"generation":N,"count":M,"records":[...]} 순서를 이용해
+    기록 앞의 머리말만 읽습니다. 다른 형식이면 전체를 읽어 (전체 dict, None)입니다.
+    """
+    buffer = ""
+    while True:
+        start = buffer.find(_RECORDS_START)
+        if start >= 0:
+            break
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return (json.loads(buffer) if buffer.strip() else {}), None
+        buffer += chunk
+    header = json.loads(buffer[:start].rstrip(", \t\r\n") + "}")
+    return header, buffer[start + len(_RECORDS_START):]
+
+
+def _stream_snapshot(f, chunk_size=1 << 16):
+    """스냅샷 파일 → (세대 번호, 기록을 한 건씩 내는 반복자)
+
+    파일 전체를 메모리에 올리지 않고 기록을 한 건씩 읽습니다.
+    """
+    header, rest = _read_snapshot_header(f, chunk_size)
+    if rest is None:
+        return header.get("generation", 0), iter(header.get("records", []))
+    return header.get("generation", 0), _iter_json_array(f, rest, chunk_size)
+
+
+def _claim_legacy(legacy_path):
+    """기존 scores.json을 '.importing'으로 이름을 바꿔 차지한 뒤 읽기 → (기록 목록, 바꾼 경로)
+
+    이름 바꾸기는 원자적이므로 여러 프로세스가 동시에 시작해도 한 프로세스만
+    가져옵니다. 다른 프로세스가 먼저 차지했으면 (None, None)입니다.
+    """
+    claimed = legacy_path + ".importing"
+    try:
+        os.replace(legacy_path, claimed)
+    except FileNotFoundError:
+        return None, None
+    try:
+        with open(claimed, "r", encoding="utf-8") as f:
+            legacy = json.load(f)
+        if not isinstance(legacy, list):
+            raise ValueError("%s: 점수 목록(JSON 배열)이 아닙니다" % legacy_path)
+    except ValueError:
+        os.replace(claimed, legacy_path)
+        raise
+    return legacy, claimed
+
+
+def _read_lines(f, size):
+    """바이너리 파일의 앞 size바이트 안에서 끝나는 줄들 (문자열)"""
+    consumed = 0
+    for line in f:
+        consumed += len(line)
+        if consumed > size:
+            return
+        yield line.decode("utf-8")
+
+
+def _count_lines(f, size=None):
+    """바이너리 파일의 앞 size바이트(기본: 끝까지) 안에서 끝나는 줄 수 (기록은 읽지 않음)"""
+    count, remaining = 0, size
+    while remaining is None or remaining > 0:
+        chunk = f.read(1 << 20 if remaining is None else min(1 << 20, remaining))
+        if not chunk:
+            break
+        count += chunk.count(b"\n")
+        if remaining is not None:
+            remaining -= len(chunk)
+    return count
+
+
+def _matches(record, mode=None, name=None, since=None, until=None):
+    """필터 조건 확인 (since/until은 ISO 형식 타임스탬프 문자열)"""
+    if mode is not None and record.get("mode") != mode:
+        return False
+    if name is not None and record.get("name") != name:
+        return False
+    timestamp = record.get("timestamp", "")
+    if since is not None and timestamp < since:
+        return False
+    if until is not None and timestamp >= until:
+        return False
+    return True
+
+
+class ScoreStore:
+    """점수 저장소 공통 인터페이스
+
+    백엔드는 append_many, load_with_version, version, import_legacy_json을
+    구현합니다. 정렬/필터 조회는 기본적으로 전체 기록을 훑으며, 색인이 있는
+    백엔드는 supports_ordered_queries를 True로 두고 top/query를 재정의합니다.
+    """
+
+    supports_ordered_queries = False
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self._listeners = []
+
+    # ---- 변경 알림 ----
+
+    def subscribe(self, listener):
+        """변경 알림 등록
+
+        listener(records, before, after)는 저장소 잠금 안에서 호출됩니다.
+        records는 새로 추가된 기록이며, 압축처럼 내용은 그대로이고 파일만
+        바뀐 경우에는 빈 목록입니다. before/after는 변경 전후의 version()입니다.
+        listener가 예외를 내도 저장은 이미 끝났으므로 기록만 남기고 다음 listener에
+        알립니다 (알림을 놓친 쪽은 version()이 바뀐 것을 보고 따라잡습니다).
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, records, before, after):
+        for listener in self._listeners:
+            try:
+                listener(records, before, after)
+            except Exception:
+                logger.exception("변경 알림 처리 실패: %r", listener)
+
+    # ---- 공통 조회 ----
+
+    def append(self, record):
+        """점수 기록 한 건 추가"""
+        self.append_many([record])
+
+    def load(self):
+        """전체 기록"""
+        return self.load_with_version()[0]
+
+    def top(self, mode=None, k=10):
+        """점수 상위 k개 (같은 점수는 먼저 저장된 순)"""
+        records = [r for r in self.load() if _matches(r, mode=mode)]
+        records.sort(key=lambda r: r.get("score", 0), reverse=True)
+        return records[:k]
+
+    def query(self, mode=None, name=None, since=None, until=None, limit=None):
+        """조건에 맞는 기록 (저장 순서)"""
+        records = [r for r in self.load() if _matches(r, mode, name, since, until)]
+        return records if limit is None else records[:limit]
+
+    def iter_query(self, mode=None, name=None, since=None, until=None):
+        """조건에 맞는 기록을 저장 순서로 한 건씩 (내보내기용)
+
+        백엔드는 전체 기록을 메모리에 올리지 않도록 재정의합니다. 반복하는 동안
+        저장소 잠금을 잡고 있지 않으므로 저장을 막지 않습니다.
+        """
+        return iter(self.query(mode, name, since, until))
+
+    def storage_stats(self):
+        """기록 수와 저장 파일 크기 합계(바이트) - 계측용
+
+        주기적으로 불리므로 백엔드는 기록을 다시 읽지 않고 세도록 재정의합니다.
+        기본 구현은 iter_query()로 한 건씩 세어 전체 기록을 메모리에 올리지 않습니다.
+        """
+        return {"records": sum(1 for _ in self.iter_query()), "bytes": None}
+
+    def records_after(self, position):
+        """저장 순서로 앞의 position개를 건너뛴 나머지 기록과 전체 기록 수
+
+        기록은 덧붙이기만 하므로 지난번에 받은 기록 수를 넘기면 그 뒤에 추가된
+        기록만 받습니다 (증분 백업, 학생별 통계 따라잡기).
+        """
+        records = self.load()
+        return records[position:], len(records)
+
+    def replace_all(self, records):
+        """전체 기록을 records로 교체 (백업 복원용)
+
+        변경 알림을 보내지 않으므로 구독자는 version()이 바뀐 것을 보고 다시 읽습니다.
+        """
+        raise NotImplementedError
+
+    def start_maintenance(self):
+        """백그라운드 유지 관리 시작 (필요한 백엔드만 재정의)"""
+
+    def close(self):
+        """저장소 닫기"""
+
+
+class JsonlScoreStore(ScoreStore):
+    """추가 전용 로그 + 스냅샷 점수 저장소
+
+    저장은 로그에 한 줄을 덧붙이기만 하고, 백그라운드 압축 스레드가
+    주기적으로 로그를 스냅샷에 병합합니다. 파일을 바꾸는 작업과 전체 읽기는
+    잠금 파일(<base>.lock)을 잡고 하므로 여러 프로세스가 함께 써도 안전하며,
+    파일을 바꿀 때마다 변경 번호(<base>.version)를 올려 다른 프로세스의 캐시가
+    알 수 있게 합니다.
+    """
+
+    def __init__(self, base_path="scores"):
+        super().__init__()
+        self.snapshot_path = base_path + ".snapshot.json"
+        self.log_path = base_path + ".log.jsonl"
+        self._file_lock = FileLock(base_path + ".lock")
+        self._version_file = VersionFile(base_path + ".version")
+        self._compact_lock = FileLock(base_path + ".compact.lock")
+        self._compact_thread_lock = threading.Lock()
+        # records_after()가 최근에 읽은 로그 위치들 [(세대, 로그 앞 기록 수, inode, 바이트, 기록 수)]
+        # (순위표와 학생별 통계처럼 따라잡는 쪽이 여럿이어도 각자 읽은 곳부터 읽도록)
+        self._log_marks = []
+        # 스냅샷 파일 (inode, 수정 시각, 크기) → (세대, 기록 수)
+        self._snapshot_count_cache = (None, None)
+        self._stop = threading.Event()
+        self._compactor = None
+
+    def version(self):
+        """변경 번호 (어느 프로세스든 파일을 바꾸면 값이 달라짐, 파일 하나만 읽음)"""
+        return self._version_file.read()
+
+    # ---- 읽기/쓰기 ----
+
+    def append_many(self, records):
+        """점수 기록 추가 (로그에 기록당 한 줄, 한 번의 write + fsync)"""
+        data = "".join(_dump_line(record) for record in records)
+        with self.lock, self._file_lock:
+            before = self.version()
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            self._version_file.bump()
+            self._notify(list(records), before, self.version())
+
+    def load_with_version(self):
+        """스냅샷과 로그를 합친 전체 기록과 읽은 시점의 version()"""
+        with self.lock, self._file_lock:
+            generation, records = self._read_snapshot()
+            for gen, path in self._pending_segments():
+                if gen > generation:
+                    records.extend(_read_jsonl(path))
+            records.extend(_read_jsonl(self.log_path))
+            return records, self.version()
+
+    def storage_stats(self):
+        """기록 수와 파일 크기 - 기록을 다시 읽지 않음
+
+        스냅샷은 머리말의 건수만, 로그 조각과 로그는 줄 수만 셉니다. records_after()처럼
+        잠금을 잡은 동안 파일을 열어 두고 로그 크기를 재 두므로 세는 동안 저장을 막지 않습니다.
+        """
+        with self.lock, self._file_lock:
+            snapshot = (open(self.snapshot_path, "r", encoding="utf-8")
+                        if os.path.exists(self.snapshot_path) else None)
+            segments = [(gen, open(path, "rb")) for gen, path in self._pending_segments()]
+            log, log_size = None, 0
+            if os.path.exists(self.log_path):
+                log = open(self.log_path, "rb")
+                log_size = os.fstat(log.fileno()).st_size
+        try:
+            generation, count = self._snapshot_count(snapshot) if snapshot is not None else (0, 0)
+            size = os.fstat(snapshot.fileno()).st_size if snapshot is not None else 0
+            for gen, f in segments:
+                size += os.fstat(f.fileno()).st_size
+                if gen > generation:
+                    count += _count_lines(f)
+            if log is not None:
+                count += _count_lines(log, log_size)
+        finally:
+            for f in [snapshot, log] + [f for _, f in segments]:
+                if f is not None:
+                    f.close()
+        return {"records": count, "bytes": size + log_size, "log_bytes": log_size}
+
+    def _snapshot_count(self, f):
+        """열어 둔 스냅샷 → (세대 번호, 기록 수)
+
+        건수는 머리말에서 읽고, 머리말에 건수가 없는 이전 형식만 기록을 한 건씩 셉니다.
+        같은 파일이면 지난번 결과를 씁니다.
+        """
+        info = os.fstat(f.fileno())
+        signature = (info.st_ino, info.st_mtime_ns, info.st_size)
+        if self._snapshot_count_cache[0] == signature:
+            return self._snapshot_count_cache[1]
+        header, rest = _read_snapshot_header(f, 4096)
+        generation = header.get("generation", 0)
+        if rest is None:
+            count = len(header.get("records", []))
+        elif header.get("count") is not None:
+            count = header["count"]
+        else:
+            count = sum(1 for _ in _iter_json_array(f, rest, 1 << 16))
+        self._snapshot_count_cache = (signature, (generation, count))
+        return generation, count
+
+    def records_after(self, position):
+        """position = 지금까지 읽은 기록 수
+
+        잠금은 파일을 여는 동안만 잡습니다. 스냅샷과 로그 조각은 통째로 교체/삭제될
+        뿐 내용이 바뀌지 않고 로그는 덧붙이기만 하므로, 열어 둔 파일과 그때의 로그
+        크기만으로 같은 시점의 기록을 읽을 수 있어 읽는 동안 저장을 막지 않습니다.
+        다른 프로세스가 저장해 따라잡는 경우에는 스냅샷의 머리말과 지난번 뒤에 로그에
+        덧붙은 부분만 읽습니다.
+        """
+        with self.lock, self._file_lock:
+            snapshot = (open(self.snapshot_path, "r", encoding="utf-8")
+                        if os.path.exists(self.snapshot_path) else None)
+            segments = [(gen, open(path, "r", encoding="utf-8"))
+                        for gen, path in self._pending_segments()]
+            log = None
+            if os.path.exists(self.log_path):
+                log = open(self.log_path, "rb")
+                info = os.fstat(log.fileno())
+                log_size, log_ino = info.st_size, info.st_ino
+        try:
+            # skipped = 읽지 않고 건너뛴 앞부분 기록 수
+            generation, records, skipped = 0, [], 0
+            if snapshot is not None:
+                header, rest = _read_snapshot_header(snapshot, 4096)
+                generation = header.get("generation", 0)
+                if rest is None:
+                    records = header.get("records", [])
+                elif header.get("count") is not None and header["count"] <= position:
+                    # 이미 읽은 기록 안에 스냅샷이 다 들어 있음 - 머리말만 읽고 건너뜀
+                    # (다른 프로세스가 저장할 때마다 전체를 다시 읽지 않도록)
+                    skipped = header["count"]
+                else:
+                    snapshot.seek(0)
+                    records = json.load(snapshot).get("records", [])
+            for gen, f in segments:
+                if gen > generation:
+                    records.extend(_parse_jsonl(f))
+            if log is not None:
+                base = skipped + len(records)
+                start, before = 0, 0
+                for mark in list(self._log_marks):
+                    if (mark[:3] == (generation, base, log_ino) and before < mark[4]
+                            and base + mark[4] <= position and mark[3] <= log_size):
+                        # 같은 로그 파일에서 호출한 쪽이 이미 읽은 위치 - 그 뒤만 읽음
+                        start, before = mark[3], mark[4]
+                log.seek(start)
+                data = log.read(log_size - start)
+                tail = _parse_jsonl(data.decode("utf-8").splitlines())
+                # 줄 중간에서 끝났으면(쓰다 만 줄) 그 위치는 기억하지 않음
+                if not data or data.endswith(b"\n"):
+                    self._log_marks = (self._log_marks
+                                       + [(generation, base, log_ino, log_size, before + len(tail))])[-8:]
+                if before:
+                    skipped, records = base + before, tail
+                else:
+                    records.extend(tail)
+        finally:
+            for f in [snapshot, log] + [f for _, f in segments]:
+                if f is not None:
+                    f.close()
+        return records[position - skipped:], skipped + len(records)
+
+    def iter_query(self, mode=None, name=None, since=None, until=None):
+        """records_after()처럼 같은 시점의 파일들을 열어 두고 한 줄씩 읽음"""
+        with self.lock, self._file_lock:
+            snapshot = (open(self.snapshot_path, "r", encoding="utf-8")
+                        if os.path.exists(self.snapshot_path) else None)
+            segments = [(gen, open(path, "r", encoding="utf-8"))
+                        for gen, path in self._pending_segments()]
+            log = None
+            if os.path.exists(self.log_path):
+                log = open(self.log_path, "rb")
+                log_size = os.fstat(log.fileno()).st_size
+        return self._iter_files(snapshot, segments, log, log_size if log else 0,
+                                (mode, name, since, until))
+
+    def _iter_files(self, snapshot, segments, log, log_size, conditions):
+        try:
+            generation, records = 0, iter(())
+            if snapshot is not None:
+                generation, records = _stream_snapshot(snapshot)
+            for record in records:
+                if _matches(record, *conditions):
+                    yield record
+            for gen, f in segments:
+                if gen > generation:
+                    for record in _iter_jsonl(f):
+                        if _matches(record, *conditions):
+                            yield record
+            if log is not None:
+                for record in _iter_jsonl(_read_lines(log, log_size)):
+                    if _matches(record, *conditions):
+                        yield record
+        finally:
+            for f in [snapshot, log] + [f for _, f in segments]:
+                if f is not None:
+                    f.close()
+
+    def replace_all(self, records):
+        with self.lock, self._file_lock:
+            generation, _ = self._read_snapshot()
+            segments = self._pending_segments()
+            next_gen = max([generation] + [gen for gen, _ in segments]) + 1
+            self._write_snapshot(next_gen, list(records))
+            for _, path in segments:
+                os.remove(path)
+            if os.path.exists(self.log_path):
+                os.remove(self.log_path)
+            self._version_file.bump()
+
+    def _read_snapshot(self):
+        """스냅샷 읽기 → (세대 번호, 기록 목록)"""
+        if not os.path.exists(self.snapshot_path):
+            return 0, []
+        with open(self.snapshot_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data.get("generation", 0), data.get("records", [])
+
+    def _write_snapshot(self, generation, records):
+        """스냅샷을 임시 파일에 쓴 뒤 원자적으로 교체"""
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"generation": generation, "count": len(records), "records": records}, f,
+                      ensure_ascii=False, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+    def _pending_segments(self):
+        """압축 대기 중인 로그 조각 목록 [(세대, 경로)]"""
+        segments = []
+        for path in glob.glob(glob.escape(self.log_path) + ".*"):
+            suffix = path.rsplit(".", 1)[1]
+            if suffix.isdigit():
+                segments.append((int(suffix), path))
+        return sorted(segments)
+
+    # ---- 압축 ----
+
+    def compact(self):
+        """로그를 스냅샷에 병합하고 병합한 기록 수 반환
+
+        로그 파일을 세대 번호가 붙은 조각으로 이름만 바꾼 뒤 잠금을 풀고
+        병합하므로, 병합하는 동안에도 저장은 막히지 않습니다.
+        """
+        with self._compact_thread_lock, self._compact_lock:
+            return self._compact()
+
+    def _compact(self):
+        with self.lock, self._file_lock:
+            generation, _ = self._read_snapshot()
+            segments = self._pending_segments()
+            # 이전 압축이 스냅샷 교체 직후 중단된 경우 남은 조각 정리
+            for gen, path in segments:
+                if gen <= generation:
+                    os.remove(path)
+            segments = [(gen, path) for gen, path in segments if gen > generation]
+            if os.path.exists(self.log_path) and os.path.getsize(self.log_path) > 0:
+                before = self.version()
+                next_gen = max([generation] + [gen for gen, _ in segments]) + 1
+                segment_path = "%s.%d" % (self.log_path, next_gen)
+                os.replace(self.log_path, segment_path)
+                segments.append((next_gen, segment_path))
+                self._version_file.bump()
+                self._notify([], before, self.version())
+            if not segments:
+                return 0
+
+        new_generation, records = self._read_snapshot()
+        folded = 0
+        for gen, path in segments:
+            segment = _read_jsonl(path)
+            records.extend(segment)
+            folded += len(segment)
+            new_generation = max(new_generation, gen)
+
+        with self.lock, self._file_lock:
+            before = self.version()
+            self._write_snapshot(new_generation, records)
+            for _, path in segments:
+                os.remove(path)
+            self._version_file.bump()
+            self._notify([], before, self.version())
+        return folded
+
+    def start_compactor(self, interval=60, max_log_bytes=256 * 1024):
+        """백그라운드 압축 스레드 시작"""
+        if self._compactor is not None:
+            return
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    if (os.path.exists(self.log_path)
+                            and os.path.getsize(self.log_path) >= max_log_bytes):
+                        self.compact()
+                except OSError:
+                    # 다음 주기에 다시 시도
+                    continue
+
+        self._compactor = threading.Thread(target=run, name="score-compactor", daemon=True)
+        self._compactor.start()
+
+    def stop_compactor(self):
+        """백그라운드 압축 스레드 종료"""
+        self._stop.set()
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+
+    def start_maintenance(self):
+        self.start_compactor()
+
+    def close(self):
+        self.stop_compactor()
+
+    # ---- 기존 데이터 가져오기 ----
+
+    def import_legacy_json(self, legacy_path):
+        """기존 scores.json(JSON 배열)을 스냅샷으로 가져오기
+
+        가져온 파일은 '.imported'를 붙여 이름을 바꾸므로 한 번만 실행됩니다.
+        """
+        legacy, claimed = _claim_legacy(legacy_path)
+        if legacy is None:
+            return 0
+        with self.lock, self._file_lock:
+            generation, records = self._read_snapshot()
+            self._write_snapshot(generation, legacy + records)
+            self._version_file.bump()
+            os.replace(claimed, legacy_path + ".imported")
+        return len(legacy)
+
+
+BACKENDS = ("jsonl", "sqlite", "partitioned")
+
+
+def open_store(backend=None):
+    """설정(config)에 맞는 점수 저장소 열기"""
+    import config
+
+    backend = backend or config.SCORES_BACKEND
+    if backend == "jsonl":
+        return JsonlScoreStore(config.SCORES_BASE)
+    if backend == "sqlite":
+        from sqlite_store import SqliteScoreStore
+        return SqliteScoreStore(config.SCORES_DB)
+    if backend == "partitioned":
+        from partitioned_store import PartitionedScoreStore
+        return PartitionedScoreStore(config.SCORES_DIR, period=config.SCORES_PARTITION)
+    raise ValueError("알 수 없는 SCORES_BACKEND: %s (%s 중 하나)" % (backend, ", ".join(BACKENDS)))
+
+
+def main():
+    import config
+
+    parser = argparse.ArgumentParser(description="점수 저장소 관리")
+    parser.add_argument("--backend", choices=BACKENDS, default=config.SCORES_BACKEND,
+                        help="저장소 종류 (기본값: SCORES_BACKEND)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    import_parser = sub.add_parser("import", help="기존 scores.json 가져오기")
+    import_parser.add_argument("path", nargs="?", default=config.SCORES_FILE)
+    sub.add_parser("compact", help="로그를 스냅샷으로 병합 (jsonl)")
+    sub.add_parser("rollup", help="지난 구간 요약을 새로 만들기 (partitioned)")
+    migrate_parser = sub.add_parser("migrate", help="다른 저장소의 기록을 모두 복사")
+    migrate_parser.add_argument("source", choices=BACKENDS, help="복사해 올 저장소 종류")
+    args = parser.parse_args()
+
+    store = open_store(args.backend)
+    try:
+        if args.command == "import":
+            count = store.import_legacy_json(args.path)
+            print("%d개 기록을 가져왔습니다" % count)
+        elif args.command == "compact":
+            if not isinstance(store, JsonlScoreStore):
+                parser.error("compact는 jsonl 저장소에서만 사용할 수 있습니다")
+            count = store.compact()
+            print("%d개 기록을 병합했습니다" % count)
+        elif args.command == "rollup":
+            if not hasattr(store, "rebuild_rollup"):
+                parser.error("rollup은 partitioned 저장소에서만 사용할 수 있습니다")
+            count = store.rebuild_rollup()
+            print("%d개 구간을 요약했습니다" % count)
+        elif args.command == "migrate":
+            if args.source == args.backend:
+                parser.error("원본과 대상 저장소가 같습니다")
+            source = open_store(args.source)
+            records = source.load()
+            source.close()
+            store.append_many(records)
+            print("%d개 기록을 복사했습니다" % len(records))
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
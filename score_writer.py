@@ -0,0 +1,57 @@
+"""점수 저장 전용 스레드 - 제출을 모아 한 번에 기록"""
+import queue
+import threading
+from concurrent.futures import Future
+
+
+class ScoreWriter:
+    """단일 쓰기 스레드
+
+    여러 세션이 동시에 제출한 점수를 큐에 모았다가 한 번의 append_many로
+    저장합니다. submit()은 저장이 끝나면 완료되는 Future를 돌려줍니다.
+    """
+
+    def __init__(self, store, max_batch=500):
+        self.store = store
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="score-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, record):
+        """점수 제출 → 저장 완료 시 기록 수(배치 크기)를 결과로 갖는 Future"""
+        future = Future()
+        self._queue.put((record, future))
+        return future
+
+    def _drain(self):
+        """큐에서 한 건을 기다린 뒤 쌓여 있는 제출을 최대 max_batch개까지 꺼내기"""
+        batch = [self._queue.get()]
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._drain()
+            stop = any(item is None for item in batch)
+            batch = [item for item in batch if item is not None]
+            if batch:
+                try:
+                    self.store.append_many([record for record, _ in batch])
+                except Exception as exc:
+                    for _, future in batch:
+                        future.set_exception(exc)
+                else:
+                    for _, future in batch:
+                        future.set_result(len(batch))
+            if stop:
+                return
+
+    def close(self):
+        """남은 제출을 모두 저장한 뒤 스레드 종료"""
+        self._queue.put(None)
+        self._thread.join()
@@ -0,0 +1,151 @@
+"""여러 작업 프로세스로 실행 - Streamlit 프로세스 WORKERS개를 띄우고 멈추면 다시 시작
+
+Streamlit 프로세스 하나는 CPU 코어 하나만 쓰므로, 학생이 많으면 프로세스를 여러 개
+띄우고 앞에 nginx 같은 역방향 프록시를 둡니다. 작업 프로세스는 같은 점수 저장소를
+나눠 쓰며(파일 잠금), 저장소의 변경 번호가 바뀌면 각자의 순위표/통계 캐시가 새
+기록만 읽어 따라잡습니다. 라운드와 관전 보드는 RUNTIME_DIR 폴더의 파일로 나눕니다.
+
+python serve.py --workers 4               # 8501~8504 포트에 작업 프로세스 4개
+python serve.py --workers 4 --nginx       # 위 포트로 나눠 보내는 nginx 설정 출력
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+APP = os.path.join(ROOT, "app.py")
+
+# 이 시간 안에 멈춘 작업 프로세스는 바로 다시 띄우지 않고 기다림 (설정 오류로 계속 멈출 때)
+RESTART_BACKOFF = 5
+
+NGINX_TEMPLATE = """\
+# 세션 상태는 작업 프로세스 메모리에 있으므로 한 브라우저는 늘 같은 프로세스로 보냄.
+# 학교 NAT 뒤에서는 학생 IP가 모두 같으므로 ip_hash 대신 첫 요청 때 정한 쿠키로 나눔.
+map $cookie_tetris_worker $tetris_worker {{
+    "" $request_id;
+    default $cookie_tetris_worker;
+}}
+
+map $http_upgrade $connection_upgrade {{
+    default upgrade;
+    "" close;
+}}
+
+upstream tetris {{
+    hash $tetris_worker consistent;
+{servers}
+}}
+
+server {{
+    listen {listen};
+
+    location / {{
+        proxy_pass http://tetris;
+        proxy_http_version 1.1;
+        proxy_set_header Host $host;
+        proxy_set_header Upgrade $http_upgrade;
+        proxy_set_header Connection $connection_upgrade;
+        proxy_read_timeout 86400;
+        add_header Set-Cookie "tetris_worker=$tetris_worker; Path=/; HttpOnly; SameSite=Lax";
+    }}
+}}
+"""
+
+
+def nginx_config(workers, port, listen=80):
+    """작업 프로세스 workers개(port부터)로 나눠 보내는 nginx 설정"""
+    servers = "\n".join("    server 127.0.0.1:%d;" % (port + i) for i in range(workers))
+    return NGINX_TEMPLATE.format(servers=servers, listen=listen)
+
+
+def worker_env(worker_id, workers, base_env=None):
+    """작업 프로세스 환경 변수
+
+    점수 검증 프로세스 풀은 작업 프로세스마다 생기므로 VERIFY_WORKERS를 따로 정하지
+    않았으면 CPU를 나눠 갖게 하고, 계측 파일은 프로세스마다 따로 씁니다.
+    """
+    import config
+
+    env = dict(os.environ if base_env is None else base_env)
+    env["WORKERS"] = str(workers)
+    env["WORKER_ID"] = str(worker_id)
+    if not env.get("VERIFY_WORKERS") or env["VERIFY_WORKERS"] == "0":
+        env["VERIFY_WORKERS"] = str(max(1, (os.cpu_count() or 1) // workers))
+    if config.METRICS_FILE:
+        base, ext = os.path.splitext(config.METRICS_FILE)
+        env["METRICS_FILE"] = "%s.%d%s" % (base, worker_id, ext)
+    return env
+
+
+def start_worker(worker_id, workers, port, address, extra_args=()):
+    command = [sys.executable, "-m", "streamlit", "run", APP,
+               "--server.port", str(port + worker_id),
+               "--server.address", address,
+               "--server.headless", "true"] + list(extra_args)
+    return subprocess.Popen(command, cwd=ROOT, env=worker_env(worker_id, workers))
+
+
+def serve(workers, port, address="127.0.0.1", extra_args=()):
+    """작업 프로세스를 띄우고 멈춘 프로세스를 다시 시작 (Ctrl+C / SIGTERM이면 모두 종료)"""
+    processes = {}
+    started = {}
+    stopping = []
+
+    def stop(signum, frame):
+        stopping.append(signum)
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        for worker_id in range(workers):
+            processes[worker_id] = start_worker(worker_id, workers, port, address, extra_args)
+            started[worker_id] = time.monotonic()
+            print("작업 프로세스 %d: http://%s:%d" % (worker_id, address, port + worker_id),
+                  file=sys.stderr)
+        while not stopping:
+            time.sleep(1)
+            for worker_id, process in processes.items():
+                code = process.poll()
+                if code is None or time.monotonic() - started[worker_id] < RESTART_BACKOFF:
+                    continue
+                print("작업 프로세스 %d가 멈춰(종료 코드 %s) 다시 시작합니다" % (worker_id, code),
+                      file=sys.stderr)
+                processes[worker_id] = start_worker(worker_id, workers, port, address, extra_args)
+                started[worker_id] = time.monotonic()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process in processes.values():
+            if process.poll() is None:
+                process.terminate()
+        for process in processes.values():
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def main():
+    import config
+
+    parser = argparse.ArgumentParser(description="여러 작업 프로세스로 실행")
+    parser.add_argument("--workers", type=int, default=max(config.WORKERS, 1),
+                        help="작업 프로세스 수 (기본값: WORKERS)")
+    parser.add_argument("--port", type=int, default=config.WORKER_PORT,
+                        help="첫 작업 프로세스의 포트 (기본값: WORKER_PORT)")
+    parser.add_argument("--address", default="127.0.0.1",
+                        help="작업 프로세스가 받을 주소 (프록시 뒤에서는 127.0.0.1)")
+    parser.add_argument("--nginx", action="store_true", help="nginx 설정만 출력")
+    parser.add_argument("--listen", type=int, default=80, help="nginx가 받을 포트 (--nginx)")
+    args, extra_args = parser.parse_known_args()
+
+    if args.nginx:
+        print(nginx_config(args.workers, args.port, args.listen), end="")
+        return
+    serve(args.workers, args.port, args.address, extra_args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""교사용 관전 - 학생 게임 보드를 비트로 압축해 모아 두는 프로세스 공용 허브
+
+보드는 칸이 차 있는지만 한 비트로 담습니다 (줄마다 10비트, 0번 비트 = 왼쪽 칸).
+게임은 블록을 놓을 때마다 바뀐 줄만 보내며(delta), 프레임의 board는 다음 비트열을
+base64로 인코딩한 문자열입니다 (바이트 안에서는 낮은 비트부터).
+
+    바뀐 줄 표시 20비트 (0번 비트 = 맨 윗줄) + 표시된 줄마다 10비트
+
+base가 0이면 빈 보드 기준(전체 보드), 아니면 같은 stream의 seq=base 보드 기준입니다.
+교사 화면에는 보드마다 200비트(25바이트)를 이어 붙여 보냅니다.
+"""
+import base64
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+BOARD_WIDTH = 10
+BOARD_HEIGHT = 20
+ALL_ROWS = (1 << BOARD_HEIGHT) - 1
+BOARD_BYTES = BOARD_WIDTH * BOARD_HEIGHT // 8
+
+logger = logging.getLogger("tetris.spectator")
+
+
+def _pack_bits(fields):
+    """[(값, 비트 수), ...] → 바이트 (낮은 비트부터)"""
+    value = 0
+    offset = 0
+    for field, width in fields:
+        value |= (field & ((1 << width) - 1)) << offset
+        offset += width
+    return value.to_bytes((offset + 7) // 8, "little")
+
+
+def pack_rows(rows, mask=ALL_ROWS):
+    """mask에 표시된 줄만 담은 프레임 board 문자열"""
+    fields = [(mask, BOARD_HEIGHT)]
+    fields.extend((row, BOARD_WIDTH) for y, row in enumerate(rows) if mask >> y & 1)
+    return base64.b64encode(_pack_bits(fields)).decode("ascii")
+
+
+def unpack_rows(board, rows=None):
+    """프레임 board 문자열을 rows(기본: 빈 보드)에 적용한 새 줄 목록
+
+    형식이 맞지 않으면 ValueError
+    """
+    data = base64.b64decode(board, validate=True)
+    value = int.from_bytes(data, "little")
+    mask = value & ALL_ROWS
+    changed = bin(mask).count("1")
+    if len(data) != (BOARD_HEIGHT + changed * BOARD_WIDTH + 7) // 8:
+        raise ValueError("보드 프레임 길이가 맞지 않습니다")
+    rows = list(rows) if rows is not None else [0] * BOARD_HEIGHT
+    value >>= BOARD_HEIGHT
+    for y in range(BOARD_HEIGHT):
+        if mask >> y & 1:
+            rows[y] = value & ((1 << BOARD_WIDTH) - 1)
+            value >>= BOARD_WIDTH
+    return rows
+
+
+def pack_board(rows):
+    """교사 화면용 보드 한 장 (바뀐 줄 표시 없이 200비트)"""
+    return _pack_bits((row, BOARD_WIDTH) for row in rows)
+
+
+class _Session:
+    __slots__ = ("label", "stream", "seq", "history", "packed", "stats", "updated")
+
+    def __init__(self, history):
+        self.label = ""
+        self.stream = None
+        self.seq = 0
+        self.history = deque(maxlen=history)
+        self.packed = pack_board([0] * BOARD_HEIGHT)
+        self.stats = (0, 1, 0, "", False)
+        self.updated = 0.0
+
+
+class SpectatorHub:
+    """학생 세션별 최신 보드 모음
+
+    세션마다 최신 보드와 delta 기준으로 쓸 최근 history장만 보관하므로 세션당
+    메모리가 일정하며, 세션은 최대 max_sessions개까지 두고 ttl초 동안 프레임이
+    없으면 지웁니다. 브라우저는 재실행 때 전달받은 ack(stream:seq)를 기준으로
+    delta를 만들고, 허브는 기준 보드가 없는 delta를 버립니다.
+    """
+
+    def __init__(self, max_sessions=100, ttl=60, history=8):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.history = history
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()
+        self._version = 0
+
+    def _expire(self, now):
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if now - session.updated < self.ttl:
+                break
+            del self._sessions[session_id]
+            self._version += 1
+
+    def publish(self, session_id, label, frame):
+        """게임이 보낸 프레임 반영 → 반영했으면 True (이미 받았거나 기준이 없으면 False)"""
+        try:
+            stream, seq, base = str(frame["stream"]), int(frame["seq"]), int(frame["base"])
+            stats = (int(frame.get("score", 0)), int(frame.get("level", 1)),
+                     int(frame.get("lines", 0)), str(frame.get("mode", "")),
+                     bool(frame.get("over", False)))
+            board = frame["board"]
+        except (KeyError, TypeError, ValueError):
+            return False
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            session = self._sessions.get(session_id)
+            same_stream = session is not None and session.stream == stream
+            if same_stream and seq <= session.seq:
+                return False
+            if base == 0:
+                rows = None
+            elif same_stream:
+                rows = next((r for s, r in session.history if s == base), None)
+                if rows is None:
+                    return False
+            else:
+                return False
+            try:
+                rows = unpack_rows(board, rows)
+            except ValueError:
+                return False
+            if session is None:
+                if len(self._sessions) >= self.max_sessions:
+                    return False
+                session = self._sessions[session_id] = _Session(self.history)
+            if session.stream != stream:
+                session.history.clear()
+            session.stream, session.seq = stream, seq
+            session.history.append((seq, rows))
+            session.packed = pack_board(rows)
+            session.label, session.stats, session.updated = label, stats, now
+            self._sessions.move_to_end(session_id)
+            self._version += 1
+            return True
+
+    def ack(self, session_id):
+        """브라우저에 돌려줄 마지막 반영 프레임 "stream:seq" (없으면 "")"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            return "%s:%d" % (session.stream, session.seq) if session is not None else ""
+
+    def remove(self, session_id):
+        with self._lock:
+            if self._sessions.pop(session_id, None) is not None:
+                self._version += 1
+
+    def view(self):
+        """교사 화면용 (version, boards, students)
+
+        boards는 이름순 보드를 25바이트씩 이어 붙인 base64 문자열,
+        students는 보드와 같은 순서의 [이름, 점수, 레벨, 라인, 모드, 게임 종료] 목록
+        """
+        with self._lock:
+            self._expire(time.monotonic())
+            sessions = sorted(self._sessions.values(), key=lambda s: s.label)
+            boards = base64.b64encode(b"".join(s.packed for s in sessions)).decode("ascii")
+            students = [[s.label] + list(s.stats) for s in sessions]
+            return self._version, boards, students
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+
+class SharedSpectators:
+    """작업 프로세스 여러 개로 실행할 때 관전 허브 나누기
+
+    학생은 자기 작업 프로세스의 허브에만 보드를 보내므로, 각 프로세스는 허브의
+    view()를 interval초마다(바뀐 경우, 아니면 ttl/2초마다) <directory>/spectator-<id>.json에
+    쓰고 교사 화면은 자기 허브와 다른 프로세스의 파일을 합쳐 봅니다. ttl초 넘게
+    바뀌지 않은 파일(멈춘 프로세스)은 무시합니다.
+    """
+
+    def __init__(self, hub, directory, worker_id, interval=1):
+        self.hub = hub
+        self.directory = directory
+        self.worker_id = str(worker_id)
+        self.interval = interval
+        os.makedirs(directory, exist_ok=True)
+        self.path = self._path(self.worker_id)
+        self._written = (None, 0.0)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _path(self, worker_id):
+        return os.path.join(self.directory, "spectator-%s.json" % worker_id)
+
+    def publish(self):
+        """허브가 바뀌었으면 파일에 쓰기 → 썼으면 True"""
+        version, boards, students = self.hub.view()
+        now = time.time()
+        if version == self._written[0] and now - self._written[1] < self.hub.ttl / 2:
+            return False
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"boards": boards, "students": students}, f, ensure_ascii=False,
+                      separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+        self._written = (version, now)
+        return True
+
+    def start(self):
+        """interval초마다 publish()하는 스레드 시작"""
+        if self._thread is not None:
+            return
+
+        def run():
+            while not self._stop.wait(self.interval):
+                try:
+                    self.publish()
+                except OSError:
+                    logger.exception("관전 보드를 나누지 못했습니다: %s", self.path)
+
+        self._thread = threading.Thread(target=run, name="spectator-share", daemon=True)
+        self._thread.start()
+
+    def view(self):
+        """모든 작업 프로세스의 보드를 합친 hub.view() 형식 (version은 파일 상태 서명)"""
+        version, boards, students = self.hub.view()
+        signature = [version]
+        entries = list(zip(students, _split_boards(boards)))
+        now = time.time()
+        for path in sorted(glob.glob(self._path("*"))):
+            if path == self.path:
+                continue
+            try:
+                info = os.stat(path)
+                if now - info.st_mtime > self.hub.ttl:
+                    continue
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            signature.append((path, info.st_mtime_ns))
+            entries.extend(zip(data["students"], _split_boards(data["boards"])))
+        entries.sort(key=lambda entry: entry[0][0])
+        boards = base64.b64encode(b"".join(board for _, board in entries)).decode("ascii")
+        return tuple(signature), boards, [student for student, _ in entries]
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _split_boards(boards):
+    """view()의 boards 문자열 → 보드별 25바이트 목록"""
+    data = base64.b64decode(boards)
+    return [data[i:i + BOARD_BYTES] for i in range(0, len(data), BOARD_BYTES)]
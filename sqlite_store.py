@@ -0,0 +1,257 @@
+"""SQLite 점수 저장소 백엔드"""
+import json
+import os
+import sqlite3
+
+from score_store import ScoreStore, _claim_legacy
+
+COLUMNS = ("timestamp", "name", "mode", "level", "score", "lines")
+
+# 조회 결과는 id(저장) 순서이므로 색인은 모두 id를 마지막 열로 두어 정렬 없이
+# 읽음 (mode, id), (name, id). 시각 조건은 id 순서와 맞는 색인이 없으므로 time_marks로
+# id 아래쪽 경계를 구함: id TIME_MARK_BLOCK개마다 한 줄 (id, max_timestamp) = id 이하
+# 기록의 가장 늦은 시각이며, since보다 이른 마지막 줄의 id까지는 조건에 맞는 기록이
+# 없습니다.
+TIME_MARK_BLOCK = 256
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL DEFAULT '',
+    name TEXT NOT NULL DEFAULT '',
+    mode TEXT NOT NULL DEFAULT '',
+    level INTEGER NOT NULL DEFAULT 0,
+    score INTEGER NOT NULL DEFAULT 0,
+    lines INTEGER NOT NULL DEFAULT 0,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_scores_mode_score ON scores (mode, score DESC);
+CREATE INDEX IF NOT EXISTS idx_scores_score ON scores (score DESC);
+CREATE INDEX IF NOT EXISTS idx_scores_mode_id ON scores (mode, id);
+CREATE INDEX IF NOT EXISTS idx_scores_name_id ON scores (name, id);
+DROP INDEX IF EXISTS idx_scores_name;
+DROP INDEX IF EXISTS idx_scores_timestamp;
+DROP INDEX IF EXISTS idx_scores_mode_timestamp;
+CREATE TABLE IF NOT EXISTS time_marks (
+    id INTEGER PRIMARY KEY,
+    max_timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_time_marks_max ON time_marks (max_timestamp);
+"""
+
+
+def _to_row(record):
+    """기록(dict) → 테이블 행 (정해진 열 외의 값은 extra에 JSON으로)"""
+    extra = {key: value for key, value in record.items() if key not in COLUMNS}
+    row = [record.get("timestamp", ""), record.get("name", ""), record.get("mode", ""),
+           record.get("level", 0), record.get("score", 0), record.get("lines", 0)]
+    row.append(json.dumps(extra, ensure_ascii=False) if extra else None)
+    return row
+
+
+def _conditions(mode=None, name=None, since=None, until=None, after_id=None):
+    """조회 조건 → (WHERE 절, 인자 목록) - after_id가 있으면 그 뒤의 id만"""
+    conditions, params = [], []
+    if after_id:
+        conditions.append("id > ?")
+        params.append(after_id)
+    for column, op, value in (("mode", "=", mode), ("name", "=", name),
+                              ("timestamp", ">=", since), ("timestamp", "<", until)):
+        if value is not None:
+            conditions.append("%s %s ?" % (column, op))
+            params.append(value)
+    return " AND ".join(conditions), params
+
+
+def _to_record(row):
+    """테이블 행 → 기록(dict)"""
+    record = dict(zip(COLUMNS, row[:6]))
+    if row[6]:
+        record.update(json.loads(row[6]))
+    return record
+
+
+class SqliteScoreStore(ScoreStore):
+    """SQLite(WAL 모드) 점수 저장소
+
+    (mode, score DESC) 색인으로 순위를, (mode, id)/(name, id) 색인과 time_marks로
+    학생별/조건 조회를 전체 기록을 읽거나 정렬하지 않고 처리합니다.
+    """
+
+    supports_ordered_queries = True
+
+    def __init__(self, path="scores.db"):
+        super().__init__()
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._fill_time_marks()
+        self._writes = 0
+        # records_after()가 최근에 읽은 위치들 [(기록 수, 마지막 id)]
+        self._id_marks = []
+
+    def version(self):
+        """다른 연결의 커밋(data_version)과 이 연결의 쓰기 횟수"""
+        with self.lock:
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            return data_version, self._writes
+
+    # ---- 시각 → id 경계 ----
+
+    def _extend_time_marks(self):
+        """time_marks를 마지막 기록까지 늘림 (쓰기 트랜잭션 안에서)"""
+        last = self._conn.execute(
+            "SELECT id, max_timestamp FROM time_marks ORDER BY id DESC LIMIT 1").fetchone()
+        marks = [list(last)] if last else []
+        for row_id, timestamp in self._conn.execute(
+                "SELECT id, timestamp FROM scores WHERE id > ? ORDER BY id",
+                (last[0] if last else 0,)):
+            latest = max(timestamp, marks[-1][1]) if marks else timestamp
+            if marks and (marks[-1][0] - 1) // TIME_MARK_BLOCK == (row_id - 1) // TIME_MARK_BLOCK:
+                marks[-1] = [row_id, latest]
+            else:
+                marks.append([row_id, latest])
+        if last:
+            self._conn.execute("DELETE FROM time_marks WHERE id = ?", (last[0],))
+        self._conn.executemany("INSERT INTO time_marks (id, max_timestamp) VALUES (?, ?)", marks)
+
+    def _fill_time_marks(self):
+        """이전 버전이 만든 파일이면 time_marks를 한 번 채움"""
+        with self.lock:
+            behind = self._conn.execute(
+                "SELECT (SELECT MAX(id) FROM scores) > "
+                "COALESCE((SELECT MAX(id) FROM time_marks), 0)").fetchone()[0]
+            if behind:
+                with self._conn:
+                    self._conn.execute("BEGIN IMMEDIATE")
+                    self._extend_time_marks()
+
+    def _after_id(self, conn, since):
+        """since 이후 기록이 있을 수 있는 id의 바로 앞 (없으면 0)"""
+        if since is None:
+            return 0
+        row = conn.execute("SELECT id FROM time_marks WHERE max_timestamp < ? "
+                           "ORDER BY max_timestamp DESC, id DESC LIMIT 1", (since,)).fetchone()
+        return row[0] if row else 0
+
+    def append_many(self, records):
+        """점수 기록 추가 (한 트랜잭션)"""
+        rows = [_to_row(record) for record in records]
+        with self.lock:
+            before = self.version()
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO scores (timestamp, name, mode, level, score, lines, extra) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                self._extend_time_marks()
+            self._writes += 1
+            self._notify(list(records), before, self.version())
+
+    def _select(self, where="", params=(), order="id", limit=None):
+        sql = "SELECT timestamp, name, mode, level, score, lines, extra FROM scores"
+        if where:
+            sql += " WHERE " + where
+        sql += " ORDER BY " + order
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = tuple(params) + (limit,)
+        with self.lock:
+            return [_to_record(row) for row in self._conn.execute(sql, params)]
+
+    def load_with_version(self):
+        with self.lock:
+            return self._select(), self.version()
+
+    def top(self, mode=None, k=10):
+        if mode is None:
+            return self._select(order="score DESC, id", limit=k)
+        return self._select("mode = ?", (mode,), order="score DESC, id", limit=k)
+
+    def query(self, mode=None, name=None, since=None, until=None, limit=None):
+        with self.lock, self._conn:
+            self._conn.execute("BEGIN")
+            where, params = _conditions(mode, name, since, until,
+                                        self._after_id(self._conn, since))
+            return self._select(where, params, limit=limit)
+
+    def iter_query(self, mode=None, name=None, since=None, until=None):
+        """별도 연결의 커서로 한 행씩 읽음 (WAL 읽기 스냅샷, 저장을 막지 않음)"""
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("BEGIN")
+        where, params = _conditions(mode, name, since, until, self._after_id(conn, since))
+        sql = "SELECT timestamp, name, mode, level, score, lines, extra FROM scores"
+        if where:
+            sql += " WHERE " + where
+        cursor = conn.execute(sql + " ORDER BY id", params)
+        return self._iter_rows(conn, cursor)
+
+    def _iter_rows(self, conn, cursor):
+        try:
+            for row in cursor:
+                yield _to_record(row)
+        finally:
+            conn.close()
+
+    def storage_stats(self):
+        with self.lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+        size = sum(os.path.getsize(path) for path in (self.path, self.path + "-wal")
+                   if os.path.exists(path))
+        return {"records": count, "bytes": size}
+
+    def records_after(self, position):
+        """position = 지금까지 읽은 기록 수 (id 순서)
+
+        별도 연결로 읽으므로(WAL 읽기 스냅샷) 읽는 동안 저장을 막지 않습니다. 최근에
+        읽은 위치의 id를 기억해 두고 그 뒤부터 찾으므로, 다른 프로세스가 저장해
+        따라잡을 때 앞의 행을 OFFSET으로 훑지 않습니다.
+        """
+        count, last_id = 0, 0
+        for mark in list(self._id_marks):
+            if count < mark[0] <= position:
+                count, last_id = mark
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            rows = conn.execute(
+                "SELECT id, timestamp, name, mode, level, score, lines, extra FROM scores "
+                "WHERE id > ? ORDER BY id LIMIT -1 OFFSET ?",
+                (last_id, position - count)).fetchall()
+            if rows:
+                self._id_marks = (self._id_marks + [(position + len(rows), rows[-1][0])])[-8:]
+            elif not (position == count and last_id
+                      and conn.execute("SELECT 1 FROM scores WHERE id = ?", (last_id,)).fetchone()):
+                position = min(position, conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0])
+        finally:
+            conn.close()
+        return [_to_record(row[1:]) for row in rows], position + len(rows)
+
+    def replace_all(self, records):
+        rows = [_to_row(record) for record in records]
+        with self.lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM scores")
+                self._conn.execute("DELETE FROM time_marks")
+                self._conn.executemany(
+                    "INSERT INTO scores (timestamp, name, mode, level, score, lines, extra) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                self._extend_time_marks()
+            self._writes += 1
+            self._id_marks = []
+
+    def import_legacy_json(self, legacy_path):
+        """기존 scores.json(JSON 배열)을 테이블로 가져오기
+
+        가져온 파일은 '.imported'를 붙여 이름을 바꾸므로 한 번만 실행됩니다.
+        """
+        legacy, claimed = _claim_legacy(legacy_path)
+        if legacy is None:
+            return 0
+        with self.lock:
+            self.append_many(legacy)
+            os.replace(claimed, legacy_path + ".imported")
+        return len(legacy)
+
+    def close(self):
+        with self.lock:
+            self._conn.close()
@@ -0,0 +1,39 @@
+"""테스트 공통 fixture - 같은 테스트를 저장소 백엔드 세 가지로 실행"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from partitioned_store import PartitionedScoreStore  # noqa: E402
+from score_store import JsonlScoreStore  # noqa: E402
+from sqlite_store import SqliteScoreStore  # noqa: E402
+
+# 구간은 day로 나눠 며칠에 걸친 기록이 지난 구간/늦게 들어온 기록이 되게 함
+OPENERS = {
+    "jsonl": lambda tmp_path: JsonlScoreStore(str(tmp_path / "scores")),
+    "sqlite": lambda tmp_path: SqliteScoreStore(str(tmp_path / "scores.db")),
+    "partitioned": lambda tmp_path: PartitionedScoreStore(str(tmp_path / "scores"), period="day"),
+}
+
+
+@pytest.fixture(params=sorted(OPENERS))
+def open_store(request, tmp_path):
+    """open_store() → 같은 위치의 저장소를 새로 열기 (다른 프로세스 대신)"""
+    opened = []
+
+    def open_():
+        store = OPENERS[request.param](tmp_path)
+        opened.append(store)
+        return store
+
+    yield open_
+    for store in opened:
+        store.close()
+
+
+@pytest.fixture
+def store(open_store):
+    return open_store()
+
@@ -0,0 +1,99 @@
+"""backup 테스트 (python -m pytest tests)"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backup import BackupService, _save_manifest, load_manifest, restore_records  # noqa: E402
+from score_store import JsonlScoreStore  # noqa: E402
+
+
+def _record(index):
+    return {"timestamp": "2024-03-01T10:%02d:00" % index, "name": "s%d" % index,
+            "mode": "Easy", "level": 1, "score": index, "lines": 0}
+
+
+def _service(tmp_path, store):
+    return BackupService(store, str(tmp_path / "backups"))
+
+
+def test_incremental_chain_restores_all(tmp_path):
+    store = JsonlScoreStore(str(tmp_path / "scores"))
+    service = _service(tmp_path, store)
+    store.append_many([_record(i) for i in range(3)])
+    assert service.backup()["kind"] == "full"
+    store.append_many([_record(i) for i in range(3, 5)])
+    entry = service.backup()
+    assert (entry["kind"], entry["records"], entry["position"]) == ("incremental", 2, 5)
+    assert service.backup()["records"] == 0
+    assert restore_records(service.directory) == store.load()
+
+
+def test_shrunken_store_takes_full_backup(tmp_path):
+    store = JsonlScoreStore(str(tmp_path / "scores"))
+    service = _service(tmp_path, store)
+    store.append_many([_record(i) for i in range(5)])
+    service.backup()
+    # 다른 곳에서 복원/교체해 기록이 줄어든 경우 (force_full 없이)
+    store.replace_all([_record(i) for i in range(2)])
+    store.append_many([_record(9)])
+    entry = service.backup()
+    assert (entry["kind"], entry["position"]) == ("full", 3)
+    assert restore_records(service.directory) == store.load()
+
+
+def test_replaced_store_with_same_count_takes_full_backup(tmp_path):
+    store = JsonlScoreStore(str(tmp_path / "scores"))
+    service = _service(tmp_path, store)
+    store.append_many([_record(i) for i in range(4)])
+    service.backup()
+    store.replace_all([_record(i) for i in range(10, 16)])
+    assert service.backup()["kind"] == "full"
+    assert restore_records(service.directory) == store.load()
+
+
+def test_other_store_takes_full_backup(tmp_path):
+    first = JsonlScoreStore(str(tmp_path / "scores"))
+    first.append_many([_record(i) for i in range(4)])
+    _service(tmp_path, first).backup()
+    other = JsonlScoreStore(str(tmp_path / "other"))
+    other.append_many([_record(i) for i in range(6)])
+    assert _service(tmp_path, other).backup()["kind"] == "full"
+    assert restore_records(str(tmp_path / "backups")) == other.load()
+
+
+def test_chain_restores_each_point_on_every_backend(store, tmp_path):
+    service = _service(tmp_path, store)
+    saved, files = [], []
+    for batch in ([_record(i) for i in range(3)], [_record(3)], [], [_record(4), _record(5)]):
+        if batch:
+            store.append_many(batch)
+        saved.append(store.load())
+        files.append(service.backup()["file"])
+    assert [entry["kind"] for entry in load_manifest(service.directory)["entries"]] == [
+        "full", "incremental", "incremental", "incremental"]
+    for records, name in zip(saved, files):
+        assert restore_records(service.directory, name) == records
+
+    # 복원한 뒤에는 force_full로 새 체인 시작
+    store.replace_all(restore_records(service.directory, files[1]))
+    manifest = load_manifest(service.directory)
+    manifest["force_full"] = True
+    _save_manifest(service.directory, manifest)
+    store.append(_record(9))
+    entry = service.backup()
+    assert (entry["kind"], entry["records"]) == ("full", 5)
+    assert restore_records(service.directory) == saved[1] + [_record(9)]
+
+
+def test_rotation_keeps_recent_chains(tmp_path):
+    store = JsonlScoreStore(str(tmp_path / "scores"))
+    service = BackupService(store, str(tmp_path / "backups"), keep=2, full_every=1)
+    for i in range(6):
+        store.append(_record(i))
+        service.backup()
+    entries = load_manifest(service.directory)["entries"]
+    assert len({entry["chain"] for entry in entries}) == 2
+    assert sorted(name for name in os.listdir(service.directory) if name.endswith(".gz")) == sorted(
+        entry["file"] for entry in entries)
+    assert restore_records(service.directory) == store.load()
@@ -0,0 +1,58 @@
+"""leaderboard 순위 인덱스 테스트 (python -m pytest tests)"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leaderboard import LeaderboardIndex  # noqa: E402
+
+
+def _record(index, score, mode="Easy", day=1):
+    return {"timestamp": "2024-03-%02dT10:00:%02d" % (day, index), "name": "s%d" % index,
+            "mode": mode, "level": 1, "score": score, "lines": 0}
+
+
+def _names(records):
+    return [record["name"] for record in records]
+
+
+def test_top_follows_appends(store):
+    index = LeaderboardIndex(store, k=3)
+    assert index.top() == []
+    etag = index.etag()
+    store.append(_record(0, 10))
+    store.append_many([_record(1, 30, "Hard"), _record(2, 20)])
+    assert index.etag() != etag
+    assert _names(index.top()) == ["s1", "s2", "s0"]
+    assert _names(index.top("Easy")) == ["s2", "s0"]
+    # 같은 점수는 먼저 저장된 기록이 앞, 상위 k개만
+    store.append(_record(3, 30, day=2))
+    store.append(_record(4, 5))
+    assert _names(index.top()) == ["s1", "s3", "s2"]
+    assert _names(index.top("Hard")) == ["s1"]
+    etag = index.etag()
+    store.append(_record(5, 1))
+    assert index.etag() == etag
+
+
+def test_top_catches_up_other_instance(open_store):
+    mine, other = open_store(), open_store()
+    index = LeaderboardIndex(mine, k=3)
+    mine.append(_record(0, 10))
+    assert _names(index.top()) == ["s0"]
+    # 다른 프로세스의 저장은 알림 없이 version()으로 따라잡음 (지난 날짜 기록 포함)
+    other.append(_record(1, 50, day=2))
+    other.append(_record(2, 50))
+    assert _names(index.top()) == ["s1", "s2", "s0"]
+    mine.append(_record(3, 40))
+    assert _names(index.top()) == ["s1", "s2", "s3"]
+
+
+def test_top_rebuilds_after_replace(open_store):
+    mine, other = open_store(), open_store()
+    index = LeaderboardIndex(mine, k=3)
+    mine.append_many([_record(i, i * 10) for i in range(5)])
+    assert _names(index.top()) == ["s4", "s3", "s2"]
+    other.replace_all([_record(0, 5), _record(1, 1)])
+    assert _names(index.top()) == ["s0", "s1"]
+    assert _names(index.top("Hard")) == []
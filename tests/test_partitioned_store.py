@@ -0,0 +1,112 @@
+"""partitioned_store 테스트 (python -m pytest tests)"""
+import builtins
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import partitioned_store  # noqa: E402
+from partitioned_store import PartitionedScoreStore  # noqa: E402
+
+
+def _record(day, name, score, mode="Normal"):
+    return {"timestamp": "2024-03-%02dT09:00:00" % day, "name": name, "mode": mode,
+            "level": 1, "score": score, "lines": 0}
+
+
+def _open(tmp_path):
+    return PartitionedScoreStore(str(tmp_path / "scores"), period="day")
+
+
+def test_top_ties_follow_save_order(tmp_path):
+    store = _open(tmp_path)
+    # 같은 점수: 2일 기록이 먼저 저장되고 1일(지난 구간) 기록이 늦게 들어옴
+    store.append(_record(2, "first", 50))
+    store.append(_record(1, "late", 50))
+    store.append(_record(3, "latest", 50))
+    store.append(_record(3, "low", 10))
+    assert [r["name"] for r in store.top()] == ["first", "late", "latest", "low"]
+    assert [r["name"] for r in store.top("Normal", 2)] == ["first", "late"]
+    store.close()
+
+
+def test_query_matches_save_order(tmp_path):
+    store = _open(tmp_path)
+    store.append(_record(2, "a", 1))
+    store.append(_record(1, "b", 2))
+    store.append_many([_record(3, "c", 3), _record(1, "d", 4)])
+    saved = store.load()
+    assert [r["name"] for r in saved] == ["a", "b", "d", "c"]
+    assert store.query() == saved == list(store.iter_query())
+    assert store.query(limit=2) == saved[:2]
+    assert store.query(since="2024-03-01", until="2024-03-02") == [saved[1], saved[2]]
+    store.close()
+
+
+def _fail_order_append(monkeypatch, store):
+    real_open = builtins.open
+
+    def fake_open(path, mode="r", *args, **kwargs):
+        if path == store.order_path and mode == "a":
+            raise OSError("crashed before order.log")
+        return real_open(path, mode, *args, **kwargs)
+
+    monkeypatch.setattr(partitioned_store, "open", fake_open, raising=False)
+
+
+def test_interrupted_append_is_rolled_back(tmp_path, monkeypatch):
+    store = _open(tmp_path)
+    store.append_many([_record(1, "a", 1), _record(2, "b", 2)])
+    saved = store.load()
+    sizes = {key: os.path.getsize(store._partition_path(key)) for key in store._partitions()}
+
+    _fail_order_append(monkeypatch, store)
+    with pytest.raises(OSError):
+        store.append_many([_record(1, "lost", 9), _record(4, "lost", 9)])
+    monkeypatch.undo()
+    assert os.path.exists(store.pending_path)
+
+    reopened = _open(tmp_path)
+    assert not os.path.exists(reopened.pending_path)
+    assert {key: os.path.getsize(reopened._partition_path(key))
+            for key in reopened._partitions()} == sizes
+    assert reopened.load() == saved
+    reopened.append(_record(1, "c", 3))
+    assert [r["name"] for r in reopened.load()] == ["a", "b", "c"]
+    assert [r["name"] for r in reopened.query(name="c")] == ["c"]
+
+
+def test_append_finished_before_crash_is_kept(tmp_path):
+    store = _open(tmp_path)
+    store.append(_record(1, "a", 1))
+    store.append(_record(2, "b", 2))
+    # order.log까지 쓰고 요약을 고치기 전에 멈춘 경우: 흔적과 모자란 요약이 남음
+    order_size = os.path.getsize(store.order_path)
+    with open(store.pending_path, "w", encoding="utf-8") as f:
+        json.dump({"order": [0, order_size], "partitions": {}}, f)
+    rollup = store._read_rollup()
+    rollup["partitions"]["2024-03-01"]["count"] = 0
+    rollup["partitions"]["2024-03-01"]["top"] = {}
+    store._write_rollup(rollup)
+
+    reopened = _open(tmp_path)
+    assert not os.path.exists(reopened.pending_path)
+    assert [r["name"] for r in reopened.load()] == ["a", "b"]
+    assert [r["name"] for r in reopened.top()] == ["b", "a"]
+
+
+def test_old_rollup_format_is_rebuilt(tmp_path):
+    store = _open(tmp_path)
+    store.append(_record(1, "a", 5))
+    store.append(_record(2, "b", 5))
+    store.append(_record(3, "c", 1))
+    with open(store.rollup_path, "w", encoding="utf-8") as f:
+        json.dump({"period": "day", "k": 10, "partitions": {
+            key: {"count": 1, "top": {"*": [rec], "Normal": [rec]}, "best": {rec["name"]: rec}}
+            for key, rec in (("2024-03-01", _record(1, "a", 5)), ("2024-03-02", _record(2, "b", 5)))}}, f)
+    reopened = _open(tmp_path)
+    assert [r["name"] for r in reopened.top()] == ["a", "b", "c"]
+    assert reopened._read_rollup()["format"] == partitioned_store.ROLLUP_FORMAT
@@ -0,0 +1,88 @@
+"""replay_verifier 테스트 (python -m pytest tests)"""
+import os
+import signal
+import sys
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot import play_game  # noqa: E402
+from replay_verifier import ReplayVerifier, verify_submission  # noqa: E402
+
+
+def _game(randomizer="random"):
+    """끝까지 한 판 (가끔 무작위 자리에 놓아 금방 끝나게)"""
+    game = play_game(3, randomizer=randomizer, epsilon=0.2)
+    assert game["over"]
+    return game
+
+
+@pytest.mark.parametrize("randomizer", ["random", "bag"])
+def test_finished_game_passes(randomizer):
+    game = _game(randomizer)
+    assert verify_submission(game) == (True, "")
+    assert verify_submission(game, expected_seed=game["seed"],
+                             expected_randomizer=randomizer) == (True, "")
+
+
+@pytest.mark.parametrize("change, reason", [
+    ({"score": 999999}, "기록과 점수가 다릅니다"),
+    ({"lines": 1000}, "기록과 점수가 다릅니다"),
+    ({"seed": 4}, ""),
+    ({"randomizer": "bag"}, "서버가 지정한 블록 생성 방식이 아닙니다"),
+    ({"mode": "Insane"}, "알 수 없는 게임 모드입니다"),
+    ({"log": ""}, "입력 기록이 없습니다"),
+    ({"log": "L"}, "게임이 끝나지 않은 기록입니다"),
+    ({"log": "G" * 300000}, "입력 기록이 너무 깁니다"),
+])
+def test_tampered_game_is_rejected(change, reason):
+    game = dict(_game(), **change)
+    verified, message = verify_submission(game, expected_randomizer="random")
+    # 다른 시드로 재실행하면 어디서 어긋나는지에 따라 사유가 다름
+    assert not verified and message.startswith(reason)
+
+
+def test_verifier_pool_counts_results():
+    game = _game()
+    verifier = ReplayVerifier(workers=1)
+    try:
+        assert verifier.submit(game, expected_seed=game["seed"]).result(timeout=60) == (True, "")
+        assert verifier.submit(dict(game, score=1)).result(timeout=60)[0] is False
+        stats = verifier.stats()
+        assert (stats["verified"], stats["rejected"]) == (1, 1)
+    finally:
+        verifier.close()
+
+
+def test_seed_must_match_issued_seed():
+    submission = {"seed": 1, "randomizer": "random", "log": "G", "mode": "Normal",
+                  "start_level": 1}
+    assert verify_submission(submission, expected_seed=2) == (
+        False, "서버가 지정한 블록 순서가 아닙니다")
+
+
+def test_reject_counts_without_pool():
+    verifier = ReplayVerifier(workers=1)
+    try:
+        assert verifier.reject("시드 없음").result(timeout=0) == (False, "시드 없음")
+        assert verifier.stats()["rejected"] == 1
+    finally:
+        verifier.close()
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGKILL"), reason="SIGKILL 필요")
+def test_submit_replaces_broken_pool():
+    verifier = ReplayVerifier(workers=1)
+    try:
+        assert verifier.submit({}).result(timeout=60)[0] is False
+        for pid in list(verifier._pool._processes):
+            os.kill(pid, signal.SIGKILL)
+        with pytest.raises(BrokenProcessPool):
+            verifier._pool.submit(time.sleep, 0).result(timeout=60)
+        assert verifier.submit({}).result(timeout=60) == (False, "입력 기록이 없습니다")
+        assert verifier.stats()["rejected"] == 2
+    finally:
+        verifier.close()
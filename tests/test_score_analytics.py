@@ -0,0 +1,31 @@
+"""score_analytics 테스트 (python -m pytest tests)"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from score_analytics import _NO_DAY, ScoreColumns, compute  # noqa: E402
+
+
+def test_bad_timestamps_have_no_day():
+    timestamps = ["2024-03-01T10:00:00", "", None, "today", "2024", "2024-02-30T09:00:00",
+                  "2024-13-01", "2024-3-1", "어제", 20240301, "2024-03-02"]
+    columns = ScoreColumns(capacity=4)
+    columns.extend([{"timestamp": timestamp, "name": "s", "mode": "Easy", "score": 10}
+                    for timestamp in timestamps])
+    days = columns.view()["day"].tolist()
+    assert days[0] == 19783 and days[-1] == 19784
+    assert days[1:-1] == [_NO_DAY] * (len(timestamps) - 2)
+
+    report = compute(columns.view(), columns.modes, len(columns.names))
+    assert report["records"] == len(timestamps)
+    assert report["activity"] == {"dates": ["2024-03-01", "2024-03-02"], "games": [1, 1],
+                                  "students": [1, 1]}
+
+
+def test_only_bad_timestamps():
+    columns = ScoreColumns()
+    columns.extend([{"timestamp": "not a date", "score": 5}])
+    assert columns.view()["day"].tolist() == [_NO_DAY]
+    report = compute(columns.view(), columns.modes, len(columns.names))
+    assert report["activity"]["dates"] == []
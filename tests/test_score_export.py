@@ -0,0 +1,52 @@
+"""score_export 테스트 (python -m pytest tests)"""
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from score_export import export_chunks  # noqa: E402
+
+
+def _rows(records, compress=False):
+    data = b"".join(export_chunks(records, "csv", compress))
+    if compress:
+        data = gzip.decompress(data)
+    return list(csv.DictReader(io.StringIO(data.decode("utf-8-sig"), newline="")))
+
+
+def test_csv_formula_cells_are_quoted():
+    names = ["=HYPERLINK(\"http://x\")", "+1+1", "-2+3", "@SUM(A1)", "\tx", "\rx"]
+    rows = _rows([{"name": name, "mode": name, "score": 1} for name in names])
+    assert [row["name"] for row in rows] == ["'" + name for name in names]
+    assert [row["mode"] for row in rows] == ["'" + name for name in names]
+
+
+def test_csv_plain_values_unchanged():
+    record = {"timestamp": "2024-03-01T10:00:00", "name": "홍길동", "mode": "Hard",
+              "level": 3, "score": -5, "lines": 12, "verified": True}
+    rows = _rows([record], compress=True)
+    assert rows == [{"timestamp": "2024-03-01T10:00:00", "name": "홍길동", "mode": "Hard",
+                     "level": "3", "score": "-5", "lines": "12", "start_level": "",
+                     "seed": "", "randomizer": "", "verified": "True", "hinted": ""}]
+
+
+def test_jsonl_keeps_original_values():
+    record = {"name": "=1+1", "score": 3}
+    data = b"".join(export_chunks([record], "jsonl"))
+    assert json.loads(data) == record
+
+
+def test_export_to_file_streams_store(tmp_path):
+    from score_export import export_to_file
+    from score_store import JsonlScoreStore
+
+    store = JsonlScoreStore(str(tmp_path / "scores"))
+    store.append_many([{"name": "s%d" % i, "mode": "Hard" if i % 2 else "Easy", "score": i}
+                       for i in range(2000)])
+    with export_to_file(store, "jsonl", True, mode="Hard") as f:
+        lines = gzip.decompress(f.read()).decode("utf-8").splitlines()
+    assert [json.loads(line)["score"] for line in lines] == list(range(1, 2000, 2))
@@ -0,0 +1,124 @@
+"""점수 저장소 백엔드 공통 테스트 (python -m pytest tests)
+
+store/open_store fixture(conftest.py)로 JSONL, SQLite, 구간(partitioned) 저장소에서 같은
+테스트를 실행합니다.
+"""
+import logging
+
+
+def _record(index, day=1, mode="Easy", score=None):
+    return {"timestamp": "2024-03-%02dT10:%02d:%02d" % (day, index // 60 % 60, index % 60),
+            "name": "s%d" % (index % 3), "mode": mode, "level": 1,
+            "score": index * 10 if score is None else score, "lines": index}
+
+
+def _saved(store):
+    """며칠에 걸쳐, 지난 날짜 기록이 늦게 들어오도록 저장 → 저장 순서의 기록 목록
+
+    (구간 저장소는 한 번에 여러 구간의 기록을 저장하면 구간 순서로 쓰므로 한 번에 하루씩)
+    """
+    batches = [
+        [_record(0, day=2), _record(1, day=2, mode="Hard")],
+        [_record(2, day=1, score=50)],
+        [_record(3, day=3, score=50)],
+        [_record(4, day=1, mode="Hard")],
+        [_record(5, day=2, score=50, mode="Hard")],
+        [_record(6, day=3)],
+    ]
+    for batch in batches:
+        store.append_many(batch)
+    return [record for batch in batches for record in batch]
+
+
+def _expected(records, mode=None, name=None, since=None, until=None):
+    return [r for r in records
+            if (mode is None or r["mode"] == mode) and (name is None or r["name"] == name)
+            and (since is None or r["timestamp"] >= since)
+            and (until is None or r["timestamp"] < until)]
+
+
+def test_append_and_load_keep_extra_fields(store):
+    record = dict(_record(1), start_level=3, seed=12345, randomizer="bag", verified=True)
+    store.append(record)
+    assert store.load() == [record]
+    assert store.storage_stats()["records"] == 1
+
+
+def test_queries_follow_save_order(store):
+    records = _saved(store)
+    assert store.load() == records
+    for conditions in ({}, {"mode": "Hard"}, {"name": "s1"}, {"since": "2024-03-02"},
+                       {"until": "2024-03-02"}, {"since": "2024-03-01T10:00:03", "until": "2024-03-03"},
+                       {"mode": "Hard", "since": "2024-03-02"}):
+        expected = _expected(records, **conditions)
+        assert store.query(**conditions) == expected, conditions
+        assert list(store.iter_query(**conditions)) == expected, conditions
+        assert store.query(limit=2, **conditions) == expected[:2], conditions
+
+
+def test_top_breaks_ties_by_save_order(store):
+    records = _saved(store)
+    ranked = sorted(records, key=lambda r: r["score"], reverse=True)
+    assert store.top() == ranked[:10]
+    assert store.top(k=3) == ranked[:3]
+    assert store.top("Hard") == [r for r in ranked if r["mode"] == "Hard"]
+    assert store.top("Normal") == []
+
+
+def test_records_after_catches_up_other_instance(open_store):
+    reader, writer = open_store(), open_store()
+    records = _saved(writer)
+    assert reader.records_after(0) == (records, len(records))
+    version = reader.version()
+
+    # 다른 인스턴스(프로세스)가 지난 날짜 기록을 늦게 저장해도 앞의 위치는 그대로
+    late = [_record(7, day=1), _record(8, day=4)]
+    for record in late:
+        writer.append(record)
+    assert reader.version() != version
+    assert reader.records_after(len(records)) == (late, len(records) + 2)
+    assert reader.records_after(len(records) + 2) == ([], len(records) + 2)
+    assert reader.records_after(3) == ((records + late)[3:], len(records) + 2)
+    assert reader.storage_stats()["records"] == len(records) + 2
+
+
+def test_records_after_reports_shrunken_store(open_store):
+    reader, writer = open_store(), open_store()
+    records = _saved(writer)
+    assert reader.records_after(0)[1] == len(records)
+    writer.replace_all(records[:2])
+    assert reader.records_after(len(records)) == ([], 2)
+    assert reader.load() == records[:2]
+
+
+def test_failing_listener_does_not_block_others(store, caplog):
+    seen = []
+
+    def broken(records, before, after):
+        raise RuntimeError("listener failed")
+
+    store.subscribe(broken)
+    store.subscribe(lambda records, before, after: seen.append(records))
+    with caplog.at_level(logging.ERROR, logger="tetris.store"):
+        store.append(_record(1))
+        store.append_many([_record(2), _record(3)])
+    assert seen == [[_record(1)], [_record(2), _record(3)]]
+    assert store.load() == [_record(i) for i in (1, 2, 3)]
+    assert len([r for r in caplog.records if r.name == "tetris.store"]) == 2
+
+
+def test_jsonl_catch_up_across_compaction(tmp_path):
+    from score_store import JsonlScoreStore
+
+    reader = JsonlScoreStore(str(tmp_path / "scores"))
+    writer = JsonlScoreStore(str(tmp_path / "scores"))
+    writer.append_many([_record(i) for i in range(3)])
+    assert reader.records_after(0)[1] == 3
+    # 로그를 스냅샷으로 합친 뒤에도 위치는 기록 수 그대로
+    writer.compact()
+    writer.append(_record(3))
+    assert reader.records_after(3) == ([_record(3)], 4)
+    writer.compact()
+    assert reader.records_after(2) == ([_record(2), _record(3)], 4)
+    assert reader.storage_stats()["records"] == 4
+    assert list(reader.iter_query(name="s0")) == [_record(0), _record(3)]
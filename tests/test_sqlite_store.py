@@ -0,0 +1,80 @@
+"""sqlite_store 테스트 (python -m pytest tests)"""
+import os
+import random
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlite_store import TIME_MARK_BLOCK, SqliteScoreStore, _conditions  # noqa: E402
+
+
+def _records(count, seed=1):
+    rng = random.Random(seed)
+    records = []
+    for index in range(count):
+        # 대체로 늘어나지만 가끔 앞선 시각이 늦게 저장됨 (여러 프로세스)
+        day = index // 100 - (rng.randrange(5) if rng.random() < 0.1 else 0)
+        records.append({"timestamp": "2024-03-%02dT%02d:00:00" % (1 + max(day, 0) // 24,
+                                                                 max(day, 0) % 24),
+                        "name": "s%d" % rng.randrange(20), "mode": rng.choice(["Easy", "Hard"]),
+                        "level": 1, "score": rng.randrange(1000), "lines": 0, "seq": index})
+    return records
+
+
+def _expected(records, mode=None, name=None, since=None, until=None):
+    return [record for record in records
+            if (mode is None or record["mode"] == mode) and (name is None or record["name"] == name)
+            and (since is None or record["timestamp"] >= since)
+            and (until is None or record["timestamp"] < until)]
+
+
+CASES = [dict(mode="Hard"), dict(name="s3"), dict(since="2024-03-02T05:00:00"),
+         dict(mode="Easy", since="2024-03-01T20:00:00"), dict(name="s7", since="2024-03-02T00:00:00"),
+         dict(since="2024-03-01T10:00:00", until="2024-03-02T01:00:00"), dict(until="2024-03-01T03:00:00"),
+         dict(since="2099-01-01")]
+
+
+def test_filtered_queries_keep_save_order(tmp_path):
+    records = _records(TIME_MARK_BLOCK * 8 + 17)
+    store = SqliteScoreStore(str(tmp_path / "scores.db"))
+    for start in range(0, len(records), 100):
+        store.append_many(records[start:start + 100])
+    for case in CASES:
+        expected = _expected(records, **case)
+        assert store.query(**case) == expected
+        assert list(store.iter_query(**case)) == expected
+        assert store.query(limit=5, **case) == expected[:5]
+    store.close()
+
+
+def test_filtered_queries_avoid_sorting(tmp_path):
+    store = SqliteScoreStore(str(tmp_path / "scores.db"))
+    store.append_many(_records(TIME_MARK_BLOCK * 4))
+    for case in CASES:
+        where, params = _conditions(after_id=store._after_id(store._conn, case.get("since")), **case)
+        plan = store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM scores WHERE %s ORDER BY id LIMIT 10" % where,
+            params).fetchall()
+        assert not any("TEMP B-TREE" in row[3] for row in plan), (case, plan)
+    store.close()
+
+
+def test_time_marks_filled_for_old_database(tmp_path):
+    path = str(tmp_path / "scores.db")
+    records = _records(TIME_MARK_BLOCK * 3)
+    store = SqliteScoreStore(path)
+    store.append_many(records)
+    store.close()
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("DELETE FROM time_marks")
+    conn.close()
+
+    store = SqliteScoreStore(path)
+    since = "2024-03-02T00:00:00"
+    assert store._after_id(store._conn, since) > 0
+    assert store.query(since=since) == _expected(records, since=since)
+    store.replace_all(records[:10])
+    assert store.query(since="2024-03-01T00:00:00") == records[:10]
+    store.close()
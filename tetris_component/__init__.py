@@ -0,0 +1,55 @@
+"""테트리스 게임 컴포넌트 - 정적 HTML/JS 파일을 한 번만 전송하는 양방향 컴포넌트
+
+교사용 관전 화면(spectator_grid)도 같은 방식의 정적 컴포넌트입니다.
+"""
+import os
+
+import streamlit.components.v1 as components
+
+_FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend")
+_SPECTATOR_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "spectator")
+_component_func = components.declare_component("tetris", path=_FRONTEND_DIR)
+_spectator_func = components.declare_component("tetris_spectator", path=_SPECTATOR_DIR)
+
+
+def tetris_game(game_mode, start_level, seed=None, randomizer="random", simulation="worker",
+                das_ms=170, arr_ms=50, hints=False, spectate_ms=0, board_ack="", on_board=None,
+                seed_id=None, on_seed_request=None, key=None):
+    """게임 화면 렌더링
+
+    재실행 때는 인자(게임 모드, 시작 레벨, 시드, 블록 생성 방식)만 전송되며,
+    모드/레벨/생성 방식이 바뀐 경우에만 게임이 초기화됩니다. 시드는 다음 게임부터
+    쓰입니다. seed_id는 서버가 그 시드에 붙인 번호로, 게임은 시드 하나를 한 게임에만
+    쓰고 결과에 seed_id를 넣어 보냅니다. 서버가 시드를 보내는 동안 쓰지 않은 시드가 없으면
+    게임은 시작하지 않고 다 쓴 시드 번호로 on_seed_request(seed_id)를 불러 새 시드를 청합니다.
+    simulation이 "worker"이면 게임 진행을 Web Worker에서, "main"이면
+    화면과 같은 스레드에서 실행합니다. 이동 키를 누르고 있으면 das_ms 뒤부터
+    arr_ms마다 반복해서 움직이며, 바꿔도 게임은 초기화되지 않습니다. 게임이 끝나면 결과 dict(id, score, level,
+    lines, mode, start_level, 검증용 seed/randomizer/log)를, 그 전에는 None을 반환합니다.
+    hints가 참이면 학생이 H 키나 힌트 버튼으로 추천 자리를 켤 수 있으며, 힌트를 한 번이라도
+    본 게임은 결과에 hinted=True가 들어갑니다.
+
+    spectate_ms가 0보다 크면 보드가 바뀔 때 spectate_ms에 한 번 압축한 관전 프레임
+    (spectator.py 형식)을 보내며, 받은 프레임은 on_board(frame)로 넘깁니다. 같은
+    프레임이 여러 번 넘어올 수 있습니다. board_ack는 서버가 마지막으로 반영한 프레임
+    ("stream:seq")으로, 게임은 그 보드와 달라진 줄만 보냅니다.
+    """
+    value = _component_func(game_mode=game_mode, start_level=start_level, seed=seed,
+                            seed_id=seed_id, randomizer=randomizer, simulation=simulation, das_ms=das_ms,
+                            arr_ms=arr_ms, hints=hints, spectate_ms=spectate_ms, board_ack=board_ack,
+                            key=key, default=None)
+    if not value:
+        return None
+    if on_board is not None and value.get("board"):
+        on_board(value["board"])
+    if on_seed_request is not None and value.get("seed_request") is not None:
+        on_seed_request(value["seed_request"])
+    return value.get("result")
+
+
+def spectator_grid(boards, students, columns=10, key=None):
+    """교사용 관전 화면 - 학생 보드 썸네일 격자
+
+    boards와 students는 SpectatorHub.view()의 값을 그대로 넘깁니다 (보드마다 25바이트).
+    """
+    _spectator_func(boards=boards, students=students, columns=columns, key=key, default=None)
@@ -0,0 +1,110 @@
+// 블록 정의와 비트보드 (tetris_engine.py와 같은 방식)
+// 줄마다 10비트 정수(비트 x = 왼쪽에서 x번째 칸), 열마다 20비트 정수(비트 y = y번째 줄)를
+// 함께 유지해 충돌 검사는 줄 비트 AND, 낙하 거리는 열 비트에서 바로 계산합니다.
+const BOARD_WIDTH = 10;
+const BOARD_HEIGHT = 20;
+const FULL_ROW = (1 << BOARD_WIDTH) - 1;
+
+// 테트리스 블록 정의
+const pieces = [
+    // I
+    [[[1,1,1,1]]],
+    // O
+    [[[1,1],[1,1]]],
+    // T
+    [[[0,1,0],[1,1,1]], [[1,0],[1,1],[1,0]], [[1,1,1],[0,1,0]], [[0,1],[1,1],[0,1]]],
+    // S
+    [[[0,1,1],[1,1,0]], [[1,0],[1,1],[0,1]]],
+    // Z
+    [[[1,1,0],[0,1,1]], [[0,1],[1,1],[1,0]]],
+    // J
+    [[[1,0,0],[1,1,1]], [[1,1],[1,0],[1,0]], [[1,1,1],[0,0,1]], [[0,1],[0,1],[1,1]]],
+    // L
+    [[[0,0,1],[1,1,1]], [[1,0],[1,0],[1,1]], [[1,1,1],[1,0,0]], [[1,1],[0,1],[0,1]]]
+];
+
+const colors = ['#00f', '#0f0', '#f00', '#ff0', '#f0f', '#0ff', '#ffa500'];
+
+// MASKS[종류][회전][x] = 열 x에 놓았을 때의 줄별 비트마스크 (범위 밖이면 null)
+const MASKS = pieces.map(rotations => rotations.map(shape => {
+    const width = shape[0].length;
+    const bits = shape.map(row => row.reduce((acc, cell, x) => acc | (cell ? 1 << x : 0), 0));
+    const byX = [];
+    for (let x = 0; x < BOARD_WIDTH; x++) {
+        byX.push(x <= BOARD_WIDTH - width ? bits.map(b => b << x) : null);
+    }
+    return byX;
+}));
+
+// SKIRTS[종류][회전] = 열마다 [열 오프셋, 그 열 가장 아래 칸 오프셋, 그 열의 칸 비트]
+const SKIRTS = pieces.map(rotations => rotations.map(shape => {
+    const skirt = [];
+    for (let dx = 0; dx < shape[0].length; dx++) {
+        let bottom = 0;
+        let cells = 0;
+        for (let dy = 0; dy < shape.length; dy++) {
+            if (shape[dy][dx]) {
+                bottom = dy;
+                cells |= 1 << dy;
+            }
+        }
+        skirt.push([dx, bottom, cells]);
+    }
+    return skirt;
+}));
+
+function createBitboard() {
+    return { rows: new Int32Array(BOARD_HEIGHT), cols: new Int32Array(BOARD_WIDTH) };
+}
+
+// (type, rotation) 블록을 (x, y)에 놓을 수 있는지
+function bitboardFits(bb, type, rotation, x, y) {
+    if (x < 0 || x >= BOARD_WIDTH) return false;
+    const rows = MASKS[type][rotation][x];
+    if (rows === null || y + rows.length > BOARD_HEIGHT) return false;
+    for (let i = 0; i < rows.length; i++) {
+        if (y + i >= 0 && (bb.rows[y + i] & rows[i])) return false;
+    }
+    return true;
+}
+
+// (x, y)에 있는 블록이 아래로 떨어질 수 있는 칸 수 - 열마다 블록 바닥 아래 첫 번째 찬 칸
+function bitboardDropDistance(bb, type, rotation, x, y) {
+    let distance = BOARD_HEIGHT;
+    const skirt = SKIRTS[type][rotation];
+    for (let i = 0; i < skirt.length; i++) {
+        const start = y + skirt[i][1] + 1;
+        const below = bb.cols[x + skirt[i][0]] >>> start;
+        const gap = below ? 31 - Math.clz32(below & -below) : BOARD_HEIGHT - start;
+        if (gap < distance) distance = gap;
+    }
+    return distance;
+}
+
+// 블록 고정 → 가득 찬 줄 번호 목록 (위에서부터)
+function bitboardPlace(bb, type, rotation, x, y) {
+    const rows = MASKS[type][rotation][x];
+    const full = [];
+    for (let i = 0; i < rows.length; i++) {
+        bb.rows[y + i] |= rows[i];
+        if (bb.rows[y + i] === FULL_ROW) full.push(y + i);
+    }
+    const skirt = SKIRTS[type][rotation];
+    for (let i = 0; i < skirt.length; i++) {
+        bb.cols[x + skirt[i][0]] |= skirt[i][2] << y;
+    }
+    return full;
+}
+
+// 가득 찬 줄 제거 (full은 위에서부터 정렬된 줄 번호)
+function bitboardClearRows(bb, full) {
+    for (const y of full) {
+        bb.rows.copyWithin(1, 0, y);
+        bb.rows[0] = 0;
+        const above = (1 << y) - 1;
+        for (let x = 0; x < BOARD_WIDTH; x++) {
+            const col = bb.cols[x];
+            bb.cols[x] = ((col & above) << 1) | ((col >>> (y + 1)) << (y + 1));
+        }
+    }
+}
@@ -0,0 +1,73 @@
+// 고정 시간 간격 게임 루프
+// requestAnimationFrame마다 흐른 시간을 누적해 두고 stepMs 단위로 step()을 실행합니다.
+// 처리 시간이 다음 간격에 더해지지 않으므로 느린 컴퓨터에서도 시뮬레이션 속도가 같고,
+// 프레임이 멈췄다 돌아오면 밀린 step을 한꺼번에 처리합니다 (maxCatchUpMs까지).
+// scheduler({request, cancel})를 주면 requestAnimationFrame 대신 사용 (Web Worker용)
+function createFixedStepLoop(stepMs, step, maxCatchUpMs = 1000, scheduler = null) {
+    const request = scheduler ? scheduler.request : (f) => requestAnimationFrame(f);
+    const cancel = scheduler ? scheduler.cancel : (h) => cancelAnimationFrame(h);
+    let handle = null;
+    let lastTime = null;
+    let accumulator = 0;
+    let simTime = 0;    // 지금까지 처리한 시뮬레이션 시간
+    let wallTime = 0;   // 루프가 돈 실제 시간
+    const lateness = [];  // 최근 step이 예정 시각보다 늦게 처리된 정도 (ms)
+    const diagnostics = { steps: 0, frames: 0, droppedMs: 0 };
+
+    function frame(now) {
+        handle = null;
+        if (lastTime === null) {
+            lastTime = now;
+        }
+        let elapsed = now - lastTime;
+        lastTime = now;
+        if (elapsed > maxCatchUpMs) {
+            // 탭이 숨겨졌던 경우 등 - 너무 오래 멈췄던 시간은 버림
+            diagnostics.droppedMs += elapsed - maxCatchUpMs;
+            elapsed = maxCatchUpMs;
+        }
+        accumulator += elapsed;
+        wallTime += elapsed;
+        diagnostics.frames++;
+
+        while (accumulator >= stepMs) {
+            accumulator -= stepMs;
+            simTime += stepMs;
+            diagnostics.steps++;
+            lateness.push(wallTime - simTime);
+            if (lateness.length > 120) lateness.shift();
+            if (step() === false) {
+                stop();
+                return;
+            }
+        }
+        handle = request(frame);
+    }
+
+    // 이미 돌고 있으면 아무것도 하지 않음 (루프는 항상 하나)
+    function start() {
+        if (handle !== null) return;
+        lastTime = null;
+        accumulator = 0;
+        handle = request(frame);
+    }
+
+    function stop() {
+        if (handle !== null) {
+            cancel(handle);
+            handle = null;
+        }
+    }
+
+    return {
+        start: start,
+        stop: stop,
+        isRunning: () => handle !== null,
+        // 진단 정보: step 처리 지연(지터) 평균/최대 ms 포함
+        diagnostics() {
+            const mean = lateness.length ? lateness.reduce((a, b) => a + b, 0) / lateness.length : 0;
+            const max = lateness.length ? Math.max(...lateness) : 0;
+            return Object.assign({ stepMs: stepMs, jitterMeanMs: mean, jitterMaxMs: max }, diagnostics);
+        }
+    };
+}
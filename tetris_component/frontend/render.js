@@ -0,0 +1,195 @@
+// 레이어 캔버스 렌더러
+// - 고정 블록 레이어: placePiece/clearLines로 보드가 바뀔 때만 다시 그림
+// - 힌트 레이어: 힌트(hint)가 바뀔 때만 추천 자리를 테두리로 그림
+// - 현재 블록 레이어: 직전 블록/고스트 영역만 지우고 새 위치에 그림
+// 상태가 바뀌면 invalidate*()로 표시만 하고, 실제 그리기는 requestAnimationFrame에서 한 번만
+// 그리는 내용은 tetris.js의 view (시뮬레이션이 보낸 마지막 상태)
+const Renderer = (function () {
+    const stackCtx = document.getElementById('stackCanvas').getContext('2d');
+    const hintCtx = document.getElementById('hintCanvas').getContext('2d');
+    const pieceCanvas = document.getElementById('pieceCanvas');
+    const pieceCtx = pieceCanvas.getContext('2d');
+    const nextCanvas = document.getElementById('nextCanvas');
+    const nextCtx = nextCanvas.getContext('2d');
+
+    let boardDirty = true;
+    let hintDirty = true;
+    let pieceDirty = true;
+    let nextDirty = true;
+    let framePending = false;
+    let lastPieceRect = null;
+    const spriteCache = {};
+
+    // 진단용 통계 (마지막 프레임의 그리기 호출 수)
+    const stats = { frames: 0, drawCalls: 0 };
+
+    // 칸 하나(채우기 + 테두리)를 색깔별로 미리 그려 두고 drawImage 한 번으로 복사
+    // ghost가 참이면 고스트 블록(착지 위치 미리보기)용 반투명 칸
+    function cellSprite(color, ghost) {
+        const key = ghost ? 'ghost:' + color : color;
+        if (!spriteCache[key]) {
+            const sprite = document.createElement('canvas');
+            sprite.width = CELL_SIZE;
+            sprite.height = CELL_SIZE;
+            const ctx = sprite.getContext('2d');
+            ctx.globalAlpha = ghost ? 0.25 : 1;
+            ctx.fillStyle = color;
+            ctx.fillRect(0, 0, CELL_SIZE, CELL_SIZE);
+            ctx.strokeStyle = '#333';
+            ctx.strokeRect(0, 0, CELL_SIZE, CELL_SIZE);
+            spriteCache[key] = sprite;
+        }
+        return spriteCache[key];
+    }
+
+    function drawCell(ctx, x, y, color, ghost) {
+        ctx.drawImage(cellSprite(color, ghost), x * CELL_SIZE, y * CELL_SIZE);
+        stats.drawCalls++;
+    }
+
+    function drawShape(piece, top, ghost) {
+        const shape = pieces[piece.type][piece.rotation];
+        const color = colors[piece.type];
+        for (let y = 0; y < shape.length; y++) {
+            for (let x = 0; x < shape[y].length; x++) {
+                if (shape[y][x]) {
+                    drawCell(pieceCtx, piece.x + x, top + y, color, ghost);
+                }
+            }
+        }
+    }
+
+    function drawStack() {
+        stackCtx.clearRect(0, 0, BOARD_WIDTH * CELL_SIZE, BOARD_HEIGHT * CELL_SIZE);
+        stats.drawCalls++;
+        const cells = view.cells;
+        for (let y = 0; y < BOARD_HEIGHT; y++) {
+            for (let x = 0; x < BOARD_WIDTH; x++) {
+                const cell = cells[y * BOARD_WIDTH + x];
+                if (cell) {
+                    drawCell(stackCtx, x, y, colors[cell - 1]);
+                }
+            }
+        }
+    }
+
+    // 추천 자리 테두리 - 현재 블록은 블록 색, 다음 블록은 흰 점선
+    function drawOutline(placement, color, dashed) {
+        const shape = pieces[placement.type][placement.rotation];
+        hintCtx.strokeStyle = color;
+        hintCtx.setLineDash(dashed ? [4, 4] : []);
+        hintCtx.beginPath();
+        for (let y = 0; y < shape.length; y++) {
+            for (let x = 0; x < shape[y].length; x++) {
+                if (shape[y][x]) {
+                    hintCtx.rect((placement.x + x) * CELL_SIZE + 2, (placement.y + y) * CELL_SIZE + 2,
+                        CELL_SIZE - 4, CELL_SIZE - 4);
+                }
+            }
+        }
+        hintCtx.stroke();
+        stats.drawCalls++;
+    }
+
+    function drawHint() {
+        hintCtx.clearRect(0, 0, BOARD_WIDTH * CELL_SIZE, BOARD_HEIGHT * CELL_SIZE);
+        stats.drawCalls++;
+        if (!hint) return;
+        hintCtx.lineWidth = 2;
+        if (hint.next) drawOutline(hint.next, '#fff', true);
+        drawOutline(hint, colors[hint.type], false);
+    }
+
+    function drawPiece() {
+        if (lastPieceRect) {
+            pieceCtx.clearRect(lastPieceRect.x, lastPieceRect.y, lastPieceRect.w, lastPieceRect.h);
+            stats.drawCalls++;
+            lastPieceRect = null;
+        }
+        const piece = view.piece;
+        if (!piece) return;
+        const shape = pieces[piece.type][piece.rotation];
+        // 착지 위치(ghostY)는 시뮬레이션이 열 비트마스크로 계산해 보냄
+        if (piece.ghostY > piece.y) {
+            drawShape(piece, piece.ghostY, true);
+        }
+        drawShape(piece, piece.y, false);
+        lastPieceRect = {
+            x: piece.x * CELL_SIZE,
+            y: piece.y * CELL_SIZE,
+            w: shape[0].length * CELL_SIZE,
+            h: (piece.ghostY - piece.y + shape.length) * CELL_SIZE
+        };
+    }
+
+    function drawNext() {
+        nextCtx.clearRect(0, 0, nextCanvas.width, nextCanvas.height);
+        stats.drawCalls++;
+        if (view.next === null) return;
+        const cellSize = 15;
+        const shape = pieces[view.next][0];
+        nextCtx.fillStyle = colors[view.next];
+        for (let y = 0; y < shape.length; y++) {
+            for (let x = 0; x < shape[y].length; x++) {
+                if (shape[y][x]) {
+                    nextCtx.fillRect(x * cellSize + 10, y * cellSize + 10, cellSize, cellSize);
+                    stats.drawCalls++;
+                }
+            }
+        }
+    }
+
+    function frame() {
+        framePending = false;
+        stats.frames++;
+        stats.drawCalls = 0;
+        if (boardDirty) {
+            drawStack();
+            boardDirty = false;
+        }
+        if (hintDirty) {
+            drawHint();
+            hintDirty = false;
+        }
+        if (pieceDirty) {
+            drawPiece();
+            pieceDirty = false;
+        }
+        if (nextDirty) {
+            drawNext();
+            nextDirty = false;
+        }
+    }
+
+    function schedule() {
+        if (!framePending) {
+            framePending = true;
+            requestAnimationFrame(frame);
+        }
+    }
+
+    return {
+        stats: stats,
+        // 고정 블록이 바뀜 (블록 고정, 줄 제거, 초기화)
+        invalidateBoard() {
+            boardDirty = true;
+            pieceDirty = true;
+            schedule();
+        },
+        // 현재 블록만 움직임
+        invalidatePiece() {
+            pieceDirty = true;
+            schedule();
+        },
+        // 다음 블록이 바뀜
+        invalidateNext() {
+            nextDirty = true;
+            schedule();
+        },
+        // 힌트가 바뀜 (켜기/끄기, 새 블록)
+        invalidateHint() {
+            hintDirty = true;
+            schedule();
+        }
+    };
+})();
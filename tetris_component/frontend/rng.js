@@ -0,0 +1,49 @@
+// 블록 순서 생성기 - 서버(piece_rng.py)와 같은 시드면 같은 순서
+const PIECE_COUNT = 7;
+
+function newSeed() {
+    return crypto.getRandomValues(new Uint32Array(1))[0];
+}
+
+// Mulberry32 난수 생성기 → 호출할 때마다 32비트 부호 없는 정수
+function mulberry32(seed) {
+    let state = seed | 0;
+    return function () {
+        state = (state + 0x6D2B79F5) | 0;
+        let t = Math.imul(state ^ (state >>> 15), 1 | state);
+        t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+        return (t ^ (t >>> 14)) >>> 0;
+    };
+}
+
+// 0 이상 n 미만 정수 - (u32 * n) / 2^32 는 double로 정확히 계산되므로
+// 파이썬의 (u * n) >> 32와 같음
+function below(nextUint32, n) {
+    return Math.floor(nextUint32() * n / 4294967296);
+}
+
+// 시드로 블록 번호(0~6)를 차례로 돌려주는 함수
+// randomizer: 'random' (매번 7개 중 하나) | 'bag' (7개를 섞은 묶음을 차례로)
+function pieceSource(seed, randomizer = 'random') {
+    const nextUint32 = mulberry32(seed);
+    if (randomizer !== 'bag') {
+        return () => below(nextUint32, PIECE_COUNT);
+    }
+    const bag = [];
+    return () => {
+        if (bag.length === 0) {
+            // Fisher-Yates 섞기 후 뒤에서부터 꺼냄
+            const pieces = [0, 1, 2, 3, 4, 5, 6];
+            for (let i = PIECE_COUNT - 1; i > 0; i--) {
+                const j = below(nextUint32, i + 1);
+                [pieces[i], pieces[j]] = [pieces[j], pieces[i]];
+            }
+            bag.push(...pieces.reverse());
+        }
+        return bag.pop();
+    };
+}
+
+if (typeof module !== 'undefined') {
+    module.exports = { mulberry32, pieceSource };
+}
@@ -0,0 +1,171 @@
+// 배치 탐색 - 힌트용 (placement_search.py와 같은 평가)
+// 현재 블록의 모든 회전 × 열을 곧바로 떨어뜨린 자리를 평가합니다. 줄이 지워지지 않는
+// 자리는 보드를 바꾸거나 복사하지 않고, 블록이 닿는 열의 비트만으로 높이/구멍/울퉁불퉁함의
+// 변화를 계산합니다. 다음 블록까지 볼 때는 현재 블록을 제자리에 놓았다가 되돌립니다.
+
+// 가중치: 높이 합, 지운 줄, 구멍, 이웃 열 높이 차 합
+const SEARCH_WEIGHTS = { height: -0.510066, lines: 0.760666, holes: -0.35663, bumpiness: -0.184483 };
+
+function popcount(v) {
+    v = v - ((v >>> 1) & 0x55555555);
+    v = (v & 0x33333333) + ((v >>> 2) & 0x33333333);
+    return (((v + (v >>> 4)) & 0x0f0f0f0f) * 0x01010101) >>> 24;
+}
+
+// 열 비트(비트 y = y번째 줄) → 높이 (가장 위 칸부터 바닥까지)
+function columnHeight(col) {
+    return col ? BOARD_HEIGHT - (31 - Math.clz32(col & -col)) : 0;
+}
+
+// cells(칸마다 블록 종류+1) → 비트보드
+function bitboardFromCells(cells) {
+    const bb = createBitboard();
+    for (let y = 0; y < BOARD_HEIGHT; y++) {
+        for (let x = 0; x < BOARD_WIDTH; x++) {
+            if (cells[y * BOARD_WIDTH + x]) {
+                bb.rows[y] |= 1 << x;
+                bb.cols[x] |= 1 << y;
+            }
+        }
+    }
+    return bb;
+}
+
+function createPlacementSearch() {
+    // 보드 지표 (탐색 깊이마다 하나) - 열 높이/구멍과 합계
+    const metrics = [0, 1].map(() => ({
+        heights: new Int32Array(BOARD_WIDTH), holes: new Int32Array(BOARD_WIDTH),
+        height: 0, hole: 0, bumpiness: 0
+    }));
+    // 줄이 지워지는 자리만 쓰는 작업용 보드 (평가 깊이마다 하나, 다음 블록을 볼 때의 현재 블록용)
+    const scratch = [createBitboard(), createBitboard()];
+    const afterCurrent = createBitboard();
+    const scratchMetrics = metrics.map(() => ({
+        heights: new Int32Array(BOARD_WIDTH), holes: new Int32Array(BOARD_WIDTH),
+        height: 0, hole: 0, bumpiness: 0
+    }));
+
+    function analyze(bb, m) {
+        m.height = 0;
+        m.hole = 0;
+        m.bumpiness = 0;
+        for (let x = 0; x < BOARD_WIDTH; x++) {
+            const col = bb.cols[x];
+            const h = columnHeight(col);
+            m.heights[x] = h;
+            m.holes[x] = h - popcount(col);
+            m.height += h;
+            m.hole += m.holes[x];
+            if (x > 0) m.bumpiness += Math.abs(h - m.heights[x - 1]);
+        }
+    }
+
+    function weigh(height, lines, holes, bumpiness) {
+        return SEARCH_WEIGHTS.height * height + SEARCH_WEIGHTS.lines * lines +
+            SEARCH_WEIGHTS.holes * holes + SEARCH_WEIGHTS.bumpiness * bumpiness;
+    }
+
+    function linesCleared(bb, rows, y) {
+        let lines = 0;
+        for (let i = 0; i < rows.length; i++) {
+            if ((bb.rows[y + i] | rows[i]) === FULL_ROW) lines++;
+        }
+        return lines;
+    }
+
+    // bb(지표 m)에 (type, rotation)을 x열, y줄에 놓은 뒤의 평가값 - bb는 그대로
+    function evaluate(bb, m, depth, type, rotation, x, y) {
+        const rows = MASKS[type][rotation][x];
+        const lines = linesCleared(bb, rows, y);
+        if (lines) {
+            const s = scratch[depth];
+            s.rows.set(bb.rows);
+            s.cols.set(bb.cols);
+            bitboardClearRows(s, bitboardPlace(s, type, rotation, x, y));
+            const sm = scratchMetrics[depth];
+            analyze(s, sm);
+            return weigh(sm.height, lines, sm.hole, sm.bumpiness);
+        }
+        // 블록이 닿는 열만 높이/구멍을 다시 계산
+        const skirt = SKIRTS[type][rotation];
+        const left = x;
+        const right = x + skirt.length - 1;
+        let height = m.height;
+        let holes = m.hole;
+        let bumpiness = m.bumpiness;
+        const lo = Math.max(left - 1, 0);
+        const hi = Math.min(right, BOARD_WIDTH - 2);
+        for (let c = lo; c <= hi; c++) bumpiness -= Math.abs(m.heights[c + 1] - m.heights[c]);
+        let before = left > 0 ? m.heights[left - 1] : 0;
+        for (let i = 0; i < skirt.length; i++) {
+            const c = x + skirt[i][0];
+            const col = bb.cols[c] | (skirt[i][2] << y);
+            const h = columnHeight(col);
+            const hole = h - popcount(col);
+            height += h - m.heights[c];
+            holes += hole - m.holes[c];
+            if (c > 0) bumpiness += Math.abs(h - before);
+            before = h;
+        }
+        if (right < BOARD_WIDTH - 1) bumpiness += Math.abs(m.heights[right + 1] - before);
+        return weigh(height, 0, holes, bumpiness);
+    }
+
+    // bb(지표 m)에서 type 블록을 y줄에서 떨어뜨릴 수 있는 자리 중 가장 좋은 자리
+    function bestSingle(bb, m, depth, type, y) {
+        let best = null;
+        for (let rotation = 0; rotation < pieces[type].length; rotation++) {
+            for (let x = 0; x < BOARD_WIDTH; x++) {
+                if (!bitboardFits(bb, type, rotation, x, y)) continue;
+                const landY = y + bitboardDropDistance(bb, type, rotation, x, y);
+                const score = evaluate(bb, m, depth, type, rotation, x, landY);
+                if (best === null || score > best.score) {
+                    best = { type: type, rotation: rotation, x: x, y: landY, score: score };
+                }
+            }
+        }
+        return best;
+    }
+
+    return {
+        // 가장 좋은 자리 {type, rotation, x, y, score, next} (놓을 자리가 없으면 null)
+        // nextType이 있으면 다음 블록(등장 위치 0줄)까지 놓아 본 합계로 고르고 next에 그 자리
+        best(bb, type, y, nextType = null) {
+            analyze(bb, metrics[0]);
+            if (nextType === null) return bestSingle(bb, metrics[0], 0, type, y);
+
+            let best = null;
+            for (let rotation = 0; rotation < pieces[type].length; rotation++) {
+                for (let x = 0; x < BOARD_WIDTH; x++) {
+                    if (!bitboardFits(bb, type, rotation, x, y)) continue;
+                    const landY = y + bitboardDropDistance(bb, type, rotation, x, y);
+                    const rows = MASKS[type][rotation][x];
+                    const lines = linesCleared(bb, rows, landY);
+                    let board = bb;
+                    if (lines) {
+                        board = afterCurrent;
+                        board.rows.set(bb.rows);
+                        board.cols.set(bb.cols);
+                        bitboardClearRows(board, bitboardPlace(board, type, rotation, x, landY));
+                    } else {
+                        bitboardPlace(bb, type, rotation, x, landY);
+                    }
+                    analyze(board, metrics[1]);
+                    const next = bestSingle(board, metrics[1], 1, nextType, 0);
+                    if (!lines) {
+                        // 제자리에 놓았던 블록 되돌리기 (놓기 전에는 빈칸이었음)
+                        for (let i = 0; i < rows.length; i++) bb.rows[landY + i] &= ~rows[i];
+                        const skirt = SKIRTS[type][rotation];
+                        for (let i = 0; i < skirt.length; i++) bb.cols[x + skirt[i][0]] &= ~(skirt[i][2] << landY);
+                    }
+                    // 다음 블록을 놓을 자리가 없으면 게임 오버 - 가장 나쁜 점수
+                    const score = SEARCH_WEIGHTS.lines * lines + (next ? next.score : -1e9);
+                    if (best === null || score > best.score) {
+                        best = { type: type, rotation: rotation, x: x, y: landY, score: score, next: next };
+                    }
+                }
+            }
+            return best;
+        }
+    };
+}
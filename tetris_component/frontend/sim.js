@@ -0,0 +1,398 @@
+// 게임 시뮬레이션 (DOM을 쓰지 않으므로 메인 스레드와 Web Worker 어디서나 실행)
+// 규칙은 tetris_engine.py와 똑같아야 합니다 (서버가 입력 기록을 다시 실행해 검증).
+// 보드는 칸마다 블록 종류+1(빈칸 0)을 담은 Uint8Array 하나로, 화면 쪽에는 이 배열의
+// 복사본을 보드가 바뀔 때만 넘깁니다.
+
+// 게임 속도 설정 (ms)
+const speeds = {
+    'Easy': 800,
+    'Normal': 500,
+    'Hard': 300
+};
+
+// 시뮬레이션 간격 (60Hz) - 중력은 시뮬레이션 시간으로 dropSpeed마다
+const SIM_STEP_MS = 1000 / 60;
+const SPAWN_X = Math.floor(BOARD_WIDTH / 2) - 1;
+
+function createSimulation() {
+    let cells = new Uint8Array(BOARD_WIDTH * BOARD_HEIGHT);
+    let bits = createBitboard();
+    let piece = null;       // {type, rotation, x, y}
+    let nextType = null;
+    let gameMode = 'Normal';
+    let startLevel = 1;
+    let randomizer = 'random';
+    let score = 0;
+    let level = 1;
+    let lines = 0;
+    let dropSpeed = speeds[gameMode];
+    let running = false;
+    let over = false;
+    let gravityElapsed = 0;
+
+    // 서버 검증용 기록: 블록 순서 시드와 입력 기록 (tetris_engine.ACTIONS와 같은 문자)
+    let gameId = 0;
+    let seed = 0;
+    let nextPieceIndex = null;
+    let inputLog = [];
+
+    // 상태가 바뀔 때마다 증가 (boardVersion은 고정 블록이 바뀔 때만)
+    let version = 0;
+    let boardVersion = 0;
+
+    function spawn(type) {
+        piece = { type: type, rotation: 0, x: SPAWN_X, y: 0 };
+    }
+
+    function fits(rotation, x, y) {
+        return bitboardFits(bits, piece.type, rotation, x, y);
+    }
+
+    function dropDistance() {
+        return bitboardDropDistance(bits, piece.type, piece.rotation, piece.x, piece.y);
+    }
+
+    function move(dx, dy) {
+        if (!fits(piece.rotation, piece.x + dx, piece.y + dy)) return false;
+        piece.x += dx;
+        piece.y += dy;
+        version++;
+        return true;
+    }
+
+    function rotate() {
+        const nextRotation = (piece.rotation + 1) % pieces[piece.type].length;
+        if (fits(nextRotation, piece.x, piece.y)) {
+            piece.rotation = nextRotation;
+            version++;
+        }
+    }
+
+    function placePiece() {
+        const shape = pieces[piece.type][piece.rotation];
+        for (let y = 0; y < shape.length; y++) {
+            for (let x = 0; x < shape[y].length; x++) {
+                if (shape[y][x]) {
+                    cells[(piece.y + y) * BOARD_WIDTH + piece.x + x] = piece.type + 1;
+                }
+            }
+        }
+        const fullRows = bitboardPlace(bits, piece.type, piece.rotation, piece.x, piece.y);
+
+        // 라인 체크 및 제거
+        clearLines(fullRows);
+
+        // 새 블록 생성
+        spawn(nextType);
+        nextType = nextPieceIndex();
+        version++;
+        boardVersion++;
+
+        // 게임 오버 체크
+        if (!fits(0, piece.x, piece.y)) {
+            running = false;
+            over = true;
+        }
+    }
+
+    // 방금 고정한 블록으로 가득 찬 줄(fullRows, 위에서부터)만 제거
+    function clearLines(fullRows) {
+        for (const y of fullRows) {
+            cells.copyWithin(BOARD_WIDTH, 0, y * BOARD_WIDTH);
+            cells.fill(0, 0, BOARD_WIDTH);
+        }
+        bitboardClearRows(bits, fullRows);
+
+        const linesCleared = fullRows.length;
+        if (linesCleared > 0) {
+            lines += linesCleared;
+            score += linesCleared * 100 * level;
+            level = Math.floor(lines / 10) + startLevel;
+
+            // 레벨에 따른 속도 조정
+            dropSpeed = Math.max(speeds[gameMode] - (level - startLevel) * 50, 100);
+        }
+    }
+
+    function result(type) {
+        return {
+            type: type,
+            id: gameId,
+            score: score,
+            level: level,
+            lines: lines,
+            mode: gameMode,
+            start_level: startLevel,
+            seed: seed,
+            randomizer: randomizer,
+            log: inputLog.join('')
+        };
+    }
+
+    return {
+        version: () => version,
+
+        // 보드를 비우고 설정(mode, startLevel, randomizer) 적용
+        reset(settings) {
+            gameMode = settings.mode;
+            startLevel = settings.startLevel;
+            randomizer = settings.randomizer;
+            cells = new Uint8Array(BOARD_WIDTH * BOARD_HEIGHT);
+            bits = createBitboard();
+            piece = null;
+            nextType = null;
+            score = 0;
+            level = startLevel;
+            lines = 0;
+            dropSpeed = speeds[gameMode];
+            running = false;
+            over = false;
+            version++;
+            boardVersion++;
+        },
+
+        // 새 게임 시작 (블록이 있으면 일시정지 해제만)
+        start(options) {
+            if (running || over) return;
+            running = true;
+            if (!piece) {
+                gameId = options.id;
+                seed = options.seed;
+                nextPieceIndex = pieceSource(seed, randomizer);
+                inputLog = [];
+                spawn(nextPieceIndex());
+                nextType = nextPieceIndex();
+                gravityElapsed = 0;
+            }
+            version++;
+        },
+
+        togglePause() {
+            if (!piece || over) return;
+            running = !running;
+            version++;
+        },
+
+        isRunning: () => running,
+
+        // 입력 한 번 (L/R/D/U/H, G = 중력) - 게임 중이 아니면 무시
+        act(action) {
+            if (!running || !piece) return;
+            inputLog.push(action);
+            switch (action) {
+                case 'L': move(-1, 0); break;
+                case 'R': move(1, 0); break;
+                case 'D': move(0, 1); break;
+                case 'U': rotate(); break;
+                case 'H':
+                    piece.y += dropDistance();
+                    version++;
+                    break;
+                case 'G':
+                    if (!move(0, 1)) placePiece();
+                    break;
+            }
+        },
+
+        // 키 반복용 이동 (L/R/D) - 막혀서 움직일 수 없으면 기록하지 않고 false
+        repeat(action) {
+            if (!running || !piece) return false;
+            const dx = action === 'L' ? -1 : action === 'R' ? 1 : 0;
+            const dy = action === 'D' ? 1 : 0;
+            if (!fits(piece.rotation, piece.x + dx, piece.y + dy)) return false;
+            this.act(action);
+            return true;
+        },
+
+        // 시뮬레이션 한 간격 진행 → 계속 진행 중인지
+        step() {
+            if (!running) return false;
+            gravityElapsed += SIM_STEP_MS;
+            while (running && gravityElapsed >= dropSpeed) {
+                gravityElapsed -= dropSpeed;
+                this.act('G');
+            }
+            return running;
+        },
+
+        // 화면용 상태 - 보드는 knownBoardVersion 이후 바뀐 경우에만 복사해 담음
+        snapshot(knownBoardVersion) {
+            return {
+                version: version,
+                boardVersion: boardVersion,
+                cells: knownBoardVersion === boardVersion ? null : cells.slice(),
+                piece: piece && {
+                    type: piece.type,
+                    rotation: piece.rotation,
+                    x: piece.x,
+                    y: piece.y,
+                    ghostY: piece.y + dropDistance()
+                },
+                next: nextType,
+                score: score,
+                level: level,
+                lines: lines,
+                mode: gameMode,
+                running: running,
+                over: over,
+                result: over ? result('gameOver') : null
+            };
+        }
+    };
+}
+
+// 누르고 있는 이동 키(L/R/D)의 자동 반복 - 시뮬레이션 간격마다 advance(ms)
+// 누르는 즉시 한 번 움직이고, das ms 뒤부터 arr ms마다 반복 (arr 0이면 끝까지 바로)
+// 운영체제의 키 반복 속도와 상관없이 어느 컴퓨터에서나 같은 속도로 움직입니다.
+function createAutoRepeat(sim) {
+    let das = 170;
+    let arr = 50;
+    let horizontal = null;      // {action, next} - 좌우는 마지막에 누른 쪽만
+    let down = null;
+    const heldHorizontal = [];  // 누르고 있는 좌우 키 (누른 순서)
+
+    function hold(action) {
+        return { action: action, elapsed: 0, next: das };
+    }
+
+    function advance(state, ms) {
+        if (!state) return;
+        state.elapsed += ms;
+        while (state.elapsed >= state.next) {
+            if (arr <= 0) {
+                while (sim.repeat(state.action)) {}
+                state.next = state.elapsed + SIM_STEP_MS;
+                return;
+            }
+            if (!sim.repeat(state.action)) {
+                // 막혀 있는 동안은 기록을 남기지 않고 다음 간격에 다시 시도
+                state.next = state.elapsed + arr;
+                return;
+            }
+            state.next += arr;
+        }
+    }
+
+    return {
+        configure(settings) {
+            das = settings.das;
+            arr = settings.arr;
+        },
+
+        press(action) {
+            sim.act(action);
+            if (action === 'L' || action === 'R') {
+                const i = heldHorizontal.indexOf(action);
+                if (i >= 0) heldHorizontal.splice(i, 1);
+                heldHorizontal.push(action);
+                horizontal = hold(action);
+            } else if (action === 'D') {
+                down = hold(action);
+            }
+        },
+
+        release(action) {
+            if (action === 'L' || action === 'R') {
+                const i = heldHorizontal.indexOf(action);
+                if (i >= 0) heldHorizontal.splice(i, 1);
+                if (horizontal && horizontal.action === action) {
+                    // 반대쪽 키를 아직 누르고 있으면 그쪽으로 다시 DAS부터
+                    const other = heldHorizontal[heldHorizontal.length - 1];
+                    horizontal = other ? hold(other) : null;
+                }
+            } else if (action === 'D') {
+                down = null;
+            }
+        },
+
+        releaseAll() {
+            heldHorizontal.length = 0;
+            horizontal = null;
+            down = null;
+        },
+
+        tick(ms) {
+            advance(horizontal, ms);
+            advance(down, ms);
+        }
+    };
+}
+
+// 명령(reset/start/pause/press/release/input/diagnostics)을 받아 시뮬레이션을 돌리고, 상태가 바뀔 때마다
+// post(message, transfer)로 알림. 메인 스레드에서는 함수 호출로, Worker에서는
+// postMessage로 같은 명령/메시지를 주고받습니다.
+// scheduler는 createFixedStepLoop의 예약 방법 (Worker에는 requestAnimationFrame이 없음)
+function createSimulationRunner(post, scheduler = null) {
+    const sim = createSimulation();
+    const keys = createAutoRepeat(sim);
+    const loop = createFixedStepLoop(SIM_STEP_MS, () => {
+        keys.tick(SIM_STEP_MS);
+        const running = sim.step();
+        publish();
+        return running;
+    }, 1000, scheduler);
+    let epoch = 0;          // 마지막 reset 번호 (그 전 상태 메시지는 화면에서 무시)
+    let ack = 0;            // 마지막으로 처리한 입력 번호 (입력 지연 측정용)
+    let postedVersion = -1;
+    let postedBoardVersion = -1;
+
+    function publish() {
+        if (sim.version() === postedVersion) return;
+        const state = sim.snapshot(postedBoardVersion);
+        postedVersion = state.version;
+        postedBoardVersion = state.boardVersion;
+        state.type = 'state';
+        state.epoch = epoch;
+        state.ack = ack;
+        post(state, state.cells ? [state.cells.buffer] : []);
+    }
+
+    function handle(command) {
+        switch (command.type) {
+            case 'reset':
+                loop.stop();
+                epoch = command.epoch;
+                sim.reset(command.settings);
+                keys.configure(command.settings);
+                keys.releaseAll();
+                postedBoardVersion = -1;
+                break;
+            case 'start':
+                sim.start(command);
+                if (sim.isRunning()) loop.start();
+                break;
+            case 'pause':
+                sim.togglePause();
+                if (sim.isRunning()) {
+                    loop.start();
+                } else {
+                    loop.stop();
+                }
+                break;
+            case 'press':
+                ack = command.seq;
+                keys.press(command.action);
+                break;
+            case 'release':
+                keys.release(command.action);
+                break;
+            case 'releaseAll':
+                keys.releaseAll();
+                break;
+            case 'autoRepeat':
+                keys.configure(command);
+                break;
+            case 'input':
+                // 반복 없는 한 번짜리 입력 (회전, 즉시 낙하)
+                ack = command.seq;
+                sim.act(command.action);
+                break;
+            case 'diagnostics':
+                post({ type: 'diagnostics', loop: loop.diagnostics() }, []);
+                return;
+        }
+        publish();
+    }
+
+    return { handle: handle };
+}
@@ -0,0 +1,10 @@
+// 게임 시뮬레이션 Web Worker - 화면(메인 스레드)과는 명령/상태 메시지로만 주고받음
+importScripts('rng.js', 'bitboard.js', 'loop.js', 'sim.js');
+
+// Worker에는 requestAnimationFrame이 없으므로 타이머로 간격마다 깨어남
+const runner = createSimulationRunner((message, transfer) => postMessage(message, transfer), {
+    request: (frame) => setTimeout(() => frame(performance.now()), SIM_STEP_MS),
+    cancel: clearTimeout
+});
+
+onmessage = (e) => runner.handle(e.data);
@@ -0,0 +1,103 @@
+// 교사용 관전 프레임 - 보드를 비트로 압축해 바뀐 줄만 보냄 (형식은 spectator.py 참고)
+// 줄마다 칸이 차 있는지만 10비트, 프레임은 '바뀐 줄 표시 20비트 + 바뀐 줄마다 10비트'를
+// 낮은 비트부터 채운 바이트열의 base64
+
+const SPECTATE_HISTORY = 16;  // delta 기준으로 남겨 둘 보낸 보드 수
+
+// cells(칸마다 블록 종류+1) → 줄마다 10비트
+function boardRows(cells) {
+    const rows = new Array(BOARD_HEIGHT).fill(0);
+    for (let y = 0; y < BOARD_HEIGHT; y++) {
+        for (let x = 0; x < BOARD_WIDTH; x++) {
+            if (cells[y * BOARD_WIDTH + x]) rows[y] |= 1 << x;
+        }
+    }
+    return rows;
+}
+
+// baseRows(없으면 빈 보드)와 다른 줄만 담은 프레임 문자열
+function packBoardDelta(rows, baseRows) {
+    const fields = [];
+    let mask = 0;
+    for (let y = 0; y < BOARD_HEIGHT; y++) {
+        if (!baseRows || rows[y] !== baseRows[y]) {
+            mask |= 1 << y;
+            fields.push(rows[y]);
+        }
+    }
+    const bytes = new Uint8Array(Math.ceil((BOARD_HEIGHT + fields.length * BOARD_WIDTH) / 8));
+    let offset = 0;
+    const write = (value, width) => {
+        for (let i = 0; i < width; i++, offset++) {
+            if (value >> i & 1) bytes[offset >> 3] |= 1 << (offset & 7);
+        }
+    };
+    write(mask, BOARD_HEIGHT);
+    for (const row of fields) write(row, BOARD_WIDTH);
+    let binary = '';
+    for (const byte of bytes) binary += String.fromCharCode(byte);
+    return btoa(binary);
+}
+
+// 관전 프레임 발행기 - 보드/점수가 바뀌면 intervalMs에 한 번만 프레임을 만들어 send(frame)
+// 서버가 돌려준 ack("stream:seq")의 보드를 기준으로 delta를 만들고, 기준이 없으면 전체 보드
+function createBoardPublisher(getView, send) {
+    const stream = Math.random().toString(36).slice(2, 10);
+    const sent = new Map();  // seq → 보낸 줄 목록
+    let intervalMs = 0;
+    let seq = 0;
+    let ack = 0;
+    let lastSentAt = -Infinity;
+    let timer = null;
+
+    function publish() {
+        timer = null;
+        const state = getView();
+        const rows = boardRows(state.cells);
+        const base = sent.has(ack) ? ack : 0;
+        seq++;
+        sent.set(seq, rows);
+        if (sent.size > SPECTATE_HISTORY) sent.delete(sent.keys().next().value);
+        lastSentAt = performance.now();
+        send({
+            stream: stream,
+            seq: seq,
+            base: base,
+            board: packBoardDelta(rows, base ? sent.get(base) : null),
+            score: state.score,
+            level: state.level,
+            lines: state.lines,
+            mode: state.mode,
+            over: state.over
+        });
+    }
+
+    return {
+        configure(ms) {
+            intervalMs = ms;
+            if (!intervalMs && timer !== null) {
+                clearTimeout(timer);
+                timer = null;
+            }
+        },
+        acknowledge(value) {
+            const [ackStream, ackSeq] = String(value || '').split(':');
+            ack = ackStream === stream ? Number(ackSeq) : 0;
+            for (const key of sent.keys()) {
+                if (key < ack) sent.delete(key);
+            }
+        },
+        // 보드나 점수가 바뀜 - 지난 프레임에서 intervalMs가 지난 뒤에 보냄
+        update() {
+            if (!intervalMs || timer !== null) return;
+            timer = setTimeout(publish, Math.max(0, lastSentAt + intervalMs - performance.now()));
+        },
+        // 기다리는 프레임을 바로 보냄 (게임 종료) → 보냈으면 true
+        flush() {
+            if (timer === null) return false;
+            clearTimeout(timer);
+            publish();
+            return true;
+        }
+    };
+}
@@ -0,0 +1,369 @@
+const CELL_SIZE = 30;
+
+// Streamlit에서 전달받는 설정 (render 이벤트의 args)
+let gameMode = 'Normal';
+let startLevel = 1;
+// 서버가 정한 다음 게임의 시드 {seed, id} - 한 게임에만 쓰고, 서버가 시드를 보내는 동안은
+// 새 시드가 올 때까지 게임을 시작하지 않음 (서버가 시드를 보내지 않으면 직접 생성)
+let assignedSeed = null;
+let seedRequired = false;
+let usedSeedId = null;     // 마지막으로 쓴 시드 번호 (같은 시드가 다시 와도 받지 않음)
+let runningSeedId = null;  // 진행 중인 게임의 시드 번호 (결과에 넣어 보냄)
+let waitingForSeed = false;
+let randomizer = 'random';
+let simulation = 'main';  // 시뮬레이션 실행 위치: main (이 스레드) | worker (Web Worker)
+let autoRepeat = { das: 170, arr: 50 };  // 이동 키 자동 반복 (ms, sim.js의 createAutoRepeat)
+
+// 화면에 그릴 상태 - 시뮬레이션이 보낸 마지막 상태 메시지 (sim.js의 snapshot)
+// cells: 칸마다 블록 종류+1 (빈칸 0), piece: {type, rotation, x, y, ghostY}, next: 다음 블록 종류
+let view = emptyView();
+let epoch = 0;        // reset 번호 - 그 전에 보낸 명령의 상태 메시지는 무시
+let engine = null;
+let lastResult = null;
+
+// 교사용 관전: 보드가 바뀌면 spectate_ms마다 한 번 압축 프레임을 컴포넌트 값으로 보냄 (spectate.js)
+let lastFrame = null;
+const boardPublisher = createBoardPublisher(() => view, (frame) => {
+    lastFrame = frame;
+    sendValue();
+});
+
+// 힌트: 새 블록이 나올 때마다 추천 자리(다음 블록까지 본 자리)를 search.js로 계산
+// hintsAllowed는 서버 설정(hints 인자), hintsEnabled는 H 키/버튼으로 켜고 끔
+let hintsAllowed = false;
+let hintsEnabled = false;
+let hint = null;
+// 이번 게임에서 힌트를 한 번이라도 보여 줬는지 (결과에 hinted로 보냄)
+let hintUsed = false;
+const placementSearch = createPlacementSearch();
+const hintTimes = [];
+
+// 입력 지연 측정: 키 입력 → 그 입력을 반영한 상태 도착까지 (ms)
+let inputSeq = 0;
+const pendingInputs = [];
+const inputLatency = [];
+let loopDiagnostics = null;
+
+function emptyView() {
+    return {
+        cells: new Uint8Array(BOARD_WIDTH * BOARD_HEIGHT),
+        piece: null,
+        next: null,
+        score: 0,
+        level: startLevel,
+        lines: 0,
+        mode: gameMode,
+        running: false,
+        over: false
+    };
+}
+
+// 시뮬레이션 실행기 만들기 - send(command)로 명령을 보내고 onEngineMessage로 상태를 받음
+// Worker를 만들 수 없으면(지원하지 않는 브라우저, 보안 정책) 메인 스레드에서 실행
+function createEngine(where) {
+    if (where === 'worker' && typeof Worker !== 'undefined') {
+        try {
+            const worker = new Worker('sim_worker.js');
+            worker.onmessage = (e) => onEngineMessage(e.data);
+            worker.onerror = (e) => {
+                console.warn('시뮬레이션 Worker 오류, 메인 스레드에서 실행합니다', e.message);
+                switchEngine('main');
+            };
+            return {
+                where: 'worker',
+                send: (command) => worker.postMessage(command),
+                terminate: () => worker.terminate()
+            };
+        } catch (err) {
+            console.warn('시뮬레이션 Worker를 만들 수 없어 메인 스레드에서 실행합니다', err);
+        }
+    }
+    const runner = createSimulationRunner((message) => onEngineMessage(message));
+    return {
+        where: 'main',
+        send: (command) => runner.handle(command),
+        terminate: () => runner.handle({ type: 'reset', epoch: -1, settings: currentSettings() })
+    };
+}
+
+function switchEngine(where) {
+    if (engine) engine.terminate();
+    engine = createEngine(where);
+    restartGame();
+}
+
+function currentSettings() {
+    return {
+        mode: gameMode,
+        startLevel: startLevel,
+        randomizer: randomizer,
+        das: autoRepeat.das,
+        arr: autoRepeat.arr
+    };
+}
+
+function onEngineMessage(message) {
+    if (message.type === 'diagnostics') {
+        loopDiagnostics = message.loop;
+        return;
+    }
+    if (message.epoch !== epoch) return;
+
+    const now = performance.now();
+    while (pendingInputs.length && pendingInputs[0][0] <= message.ack) {
+        const sent = pendingInputs.shift();
+        if (sent[0] === message.ack) {
+            inputLatency.push(now - sent[1]);
+            if (inputLatency.length > 120) inputLatency.shift();
+        }
+    }
+    applyState(message);
+}
+
+// 바뀐 부분만 다시 그리도록 표시
+function applyState(state) {
+    const previous = view;
+    const boardChanged = Boolean(state.cells);
+    if (boardChanged) {
+        Renderer.invalidateBoard();
+    } else {
+        state.cells = previous.cells;
+    }
+    if (!samePiece(previous.piece, state.piece)) Renderer.invalidatePiece();
+    if (previous.next !== state.next) Renderer.invalidateNext();
+    view = state;
+    if (previous.score !== state.score || previous.level !== state.level ||
+            previous.lines !== state.lines || previous.mode !== state.mode) {
+        updateDisplay();
+        boardPublisher.update();
+    } else if (boardChanged) {
+        boardPublisher.update();
+    }
+    if (boardChanged || pieceType(previous) !== pieceType(state) || previous.next !== state.next) {
+        updateHint();
+    }
+    if (state.over && !previous.over) gameOver(state.result);
+}
+
+function pieceType(state) {
+    return state.piece ? state.piece.type : null;
+}
+
+function updateHint() {
+    const previous = hint;
+    hint = null;
+    if (hintsAllowed && hintsEnabled && view.piece && !view.over) {
+        const started = performance.now();
+        hint = placementSearch.best(bitboardFromCells(view.cells), view.piece.type, view.piece.y, view.next);
+        if (hint) hintUsed = true;
+        hintTimes.push(performance.now() - started);
+        if (hintTimes.length > 120) hintTimes.shift();
+    }
+    if (hint || previous) Renderer.invalidateHint();
+}
+
+function toggleHint() {
+    hintsEnabled = !hintsEnabled;
+    updateHintButton();
+    updateHint();
+}
+
+function updateHintButton() {
+    const button = document.getElementById('hintButton');
+    button.style.display = hintsAllowed ? '' : 'none';
+    button.textContent = hintsEnabled ? '힌트 끄기 (H)' : '힌트 켜기 (H)';
+}
+
+function samePiece(a, b) {
+    if (!a || !b) return a === b;
+    return a.type === b.type && a.rotation === b.rotation && a.x === b.x && a.y === b.y &&
+        a.ghostY === b.ghostY;
+}
+
+function updateDisplay() {
+    document.getElementById('score').textContent = view.score;
+    document.getElementById('level').textContent = view.level;
+    document.getElementById('lines').textContent = view.lines;
+    document.getElementById('mode').textContent = view.mode;
+}
+
+// type: press (이동 키, 떼기 전까지 시뮬레이션이 자동 반복) | input (한 번만)
+function sendInput(action, type = 'input') {
+    inputSeq++;
+    pendingInputs.push([inputSeq, performance.now()]);
+    if (pendingInputs.length > 120) pendingInputs.shift();
+    engine.send({ type: type, action: action, seq: inputSeq });
+}
+
+function startGame() {
+    let seed = newSeed();
+    runningSeedId = null;
+    if (seedRequired) {
+        if (assignedSeed === null) {
+            // 지난 게임의 시드로 시작하지 않도록 서버에 새 시드를 청하고 받으면 시작
+            waitingForSeed = true;
+            sendValue();
+            return;
+        }
+        seed = assignedSeed.seed;
+        runningSeedId = usedSeedId = assignedSeed.id;
+        assignedSeed = null;
+    }
+    waitingForSeed = false;
+    hintUsed = false;
+    engine.send({ type: 'start', seed: seed, id: Date.now() });
+}
+
+function pauseGame() {
+    if (!view.piece) {
+        startGame();
+        return;
+    }
+    engine.send({ type: 'pause' });
+}
+
+function restartGame() {
+    epoch++;
+    waitingForSeed = false;
+    view = emptyView();
+    lastResult = null;
+    pendingInputs.length = 0;
+    engine.send({ type: 'reset', epoch: epoch, settings: currentSettings() });
+    document.getElementById('gameOverModal').style.display = 'none';
+    updateDisplay();
+    Renderer.invalidateBoard();
+    Renderer.invalidateNext();
+    updateHint();
+    boardPublisher.update();
+}
+
+// 컴포넌트 값: 게임 결과(끝나기 전에는 null), 마지막 관전 프레임, 새 시드를 기다리면
+// 다 쓴 시드 번호(seed_request)
+function sendValue(result = lastResult) {
+    Streamlit.setComponentValue({
+        result: result,
+        board: lastFrame,
+        seed_request: waitingForSeed ? usedSeedId : null
+    });
+}
+
+function gameOver(result) {
+    // 서버가 이 게임에 준 시드와 비교하도록 시드 번호를, 힌트를 봤으면 hinted를 함께 보냄
+    result = Object.assign({}, result, { seed_id: runningSeedId, hinted: hintUsed });
+    lastResult = result;
+    document.getElementById('finalScore').textContent = result.score;
+    document.getElementById('finalLevel').textContent = result.level;
+    document.getElementById('finalLines').textContent = result.lines;
+    document.getElementById('gameOverModal').style.display = 'block';
+
+    // Streamlit에 게임 결과 전달 (컴포넌트 반환값) - 기다리던 관전 프레임이 있으면 함께
+    boardPublisher.update();
+    if (!boardPublisher.flush()) sendValue();
+}
+
+function saveScore() {
+    if (lastResult) {
+        sendValue(Object.assign({}, lastResult, { type: 'saveScore' }));
+    }
+}
+
+// 키보드 이벤트 - 누름/뗌만 시뮬레이션에 보내고 그리기는 상태 메시지가 오면 프레임당 한 번
+// 운영체제의 키 반복(e.repeat)은 무시하고 시뮬레이션이 DAS/ARR로 반복
+const KEY_ACTIONS = {
+    'ArrowLeft': 'L',
+    'ArrowRight': 'R',
+    'ArrowDown': 'D',
+    'ArrowUp': 'U',
+    ' ': 'H'
+};
+const REPEATING_ACTIONS = 'LRD';
+
+document.addEventListener('keydown', (e) => {
+    if ((e.key === 'h' || e.key === 'H') && !e.repeat && hintsAllowed) {
+        toggleHint();
+        return;
+    }
+    const action = KEY_ACTIONS[e.key];
+    if (!action || !view.running || !view.piece) return;
+    e.preventDefault();
+    if (e.repeat) return;
+    sendInput(action, REPEATING_ACTIONS.includes(action) ? 'press' : 'input');
+});
+
+document.addEventListener('keyup', (e) => {
+    const action = KEY_ACTIONS[e.key];
+    if (action && REPEATING_ACTIONS.includes(action)) {
+        engine.send({ type: 'release', action: action });
+    }
+});
+
+// 창이 포커스를 잃으면 keyup을 받지 못하므로 누른 키를 모두 뗀 것으로 처리
+window.addEventListener('blur', () => engine.send({ type: 'releaseAll' }));
+
+// Streamlit 재실행 시에는 설정이 바뀐 경우에만 게임을 초기화
+// 시드가 바뀐 것만으로는 초기화하지 않고 다음 게임부터 적용 (이미 쓴 시드 번호는 무시)
+Streamlit.onRender((args) => {
+    const newMode = args.game_mode || 'Normal';
+    const newStartLevel = Number(args.start_level) || 1;
+    const newRandomizer = args.randomizer || 'random';
+    const newSimulation = args.simulation || 'main';
+    const newDas = args.das_ms === undefined || args.das_ms === null ? 170 : Number(args.das_ms);
+    const newArr = args.arr_ms === undefined || args.arr_ms === null ? 50 : Number(args.arr_ms);
+    if (newDas !== autoRepeat.das || newArr !== autoRepeat.arr) {
+        autoRepeat = { das: newDas, arr: newArr };
+        engine.send({ type: 'autoRepeat', das: newDas, arr: newArr });
+    }
+    boardPublisher.configure(Number(args.spectate_ms) || 0);
+    boardPublisher.acknowledge(args.board_ack);
+    const newHintsAllowed = args.hints === undefined || args.hints === null ? false : Boolean(args.hints);
+    if (newHintsAllowed !== hintsAllowed) {
+        hintsAllowed = newHintsAllowed;
+        updateHintButton();
+        updateHint();
+    }
+    if (args.seed !== undefined && args.seed !== null) {
+        seedRequired = true;
+        const seedId = args.seed_id === undefined || args.seed_id === null ? Number(args.seed)
+            : args.seed_id;
+        if (seedId !== usedSeedId) {
+            assignedSeed = { seed: Number(args.seed), id: seedId };
+            if (waitingForSeed) startGame();
+        }
+    }
+    if (newMode !== gameMode || newStartLevel !== startLevel || newRandomizer !== randomizer ||
+            newSimulation !== simulation) {
+        gameMode = newMode;
+        startLevel = newStartLevel;
+        randomizer = newRandomizer;
+        if (newSimulation !== simulation) {
+            simulation = newSimulation;
+            switchEngine(simulation);
+        } else {
+            restartGame();
+        }
+    }
+});
+
+// 진단 정보 (개발자 도구 콘솔에서 tetrisDiagnostics())
+// Worker 실행 중에는 루프 정보가 한 번 늦게 갱신됨 (다시 호출하면 최신 값)
+window.tetrisDiagnostics = () => {
+    engine.send({ type: 'diagnostics' });
+    const mean = inputLatency.length ? inputLatency.reduce((a, b) => a + b, 0) / inputLatency.length : 0;
+    const max = inputLatency.length ? Math.max(...inputLatency) : 0;
+    const hintMean = hintTimes.length ? hintTimes.reduce((a, b) => a + b, 0) / hintTimes.length : 0;
+    return {
+        simulation: engine.where,
+        loop: loopDiagnostics,
+        inputLatencyMeanMs: mean,
+        inputLatencyMaxMs: max,
+        hintMeanMs: hintMean,
+        hintMaxMs: hintTimes.length ? Math.max(...hintTimes) : 0,
+        render: Renderer.stats
+    };
+};
+
+// 초기 화면 그리기
+engine = createEngine(simulation);
+restartGame();
+Streamlit.ready();
+Streamlit.setFrameHeight(700);
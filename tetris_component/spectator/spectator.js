@@ -0,0 +1,72 @@
+// 교사용 관전 화면 - 학생 보드 썸네일 격자 (spectator.py의 SpectatorHub.view() 형식)
+// boards: 보드마다 200비트(줄마다 10비트, 낮은 비트부터)를 이어 붙인 base64
+// students: 보드와 같은 순서의 [이름, 점수, 레벨, 라인, 모드, 게임 종료]
+
+const BOARD_WIDTH = 10;
+const BOARD_HEIGHT = 20;
+const BOARD_BYTES = BOARD_WIDTH * BOARD_HEIGHT / 8;
+const THUMB_CELL = 6;
+const THUMB_WIDTH = BOARD_WIDTH * THUMB_CELL;
+const THUMB_HEIGHT = BOARD_HEIGHT * THUMB_CELL;
+const GAP = 12;
+const LABEL_HEIGHT = 30;
+
+const canvas = document.getElementById('grid');
+const ctx = canvas.getContext('2d');
+
+function decodeBoards(text) {
+    const binary = atob(text || '');
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i);
+    return bytes;
+}
+
+function drawBoard(bytes, index, left, top, over) {
+    ctx.fillStyle = '#000';
+    ctx.fillRect(left, top, THUMB_WIDTH, THUMB_HEIGHT);
+    ctx.fillStyle = over ? '#777' : '#4dd0e1';
+    const start = index * BOARD_BYTES * 8;
+    for (let y = 0; y < BOARD_HEIGHT; y++) {
+        for (let x = 0; x < BOARD_WIDTH; x++) {
+            const bit = start + y * BOARD_WIDTH + x;
+            if (bytes[bit >> 3] >> (bit & 7) & 1) {
+                ctx.fillRect(left + x * THUMB_CELL, top + y * THUMB_CELL, THUMB_CELL - 1, THUMB_CELL - 1);
+            }
+        }
+    }
+    ctx.strokeStyle = '#fff';
+    ctx.strokeRect(left - 0.5, top - 0.5, THUMB_WIDTH + 1, THUMB_HEIGHT + 1);
+}
+
+Streamlit.onRender((args) => {
+    const students = args.students || [];
+    const columns = Math.max(1, Number(args.columns) || 10);
+    const bytes = decodeBoards(args.boards);
+    const rowCount = Math.ceil(students.length / columns);
+    document.getElementById('empty').style.display = students.length ? 'none' : 'block';
+
+    const width = columns * (THUMB_WIDTH + GAP) + GAP;
+    const height = rowCount * (THUMB_HEIGHT + LABEL_HEIGHT + GAP) + GAP;
+    if (canvas.width !== width || canvas.height !== height) {
+        canvas.width = width;
+        canvas.height = height;
+        Streamlit.setFrameHeight(height + (students.length ? 0 : 60));
+    }
+    ctx.clearRect(0, 0, width, height);
+    ctx.font = '11px Arial';
+    ctx.textAlign = 'center';
+    students.forEach((student, i) => {
+        const [name, score, level, lines, , over] = student;
+        const left = GAP + (i % columns) * (THUMB_WIDTH + GAP);
+        const top = GAP + Math.floor(i / columns) * (THUMB_HEIGHT + LABEL_HEIGHT + GAP);
+        drawBoard(bytes, i, left, top, over);
+        ctx.fillStyle = '#fff';
+        ctx.fillText(name, left + THUMB_WIDTH / 2, top + THUMB_HEIGHT + 12, THUMB_WIDTH + GAP);
+        ctx.fillStyle = '#aaa';
+        ctx.fillText(score + '점 L' + level + ' ' + lines + '줄', left + THUMB_WIDTH / 2,
+            top + THUMB_HEIGHT + 25, THUMB_WIDTH + GAP);
+    });
+});
+
+Streamlit.ready();
+Streamlit.setFrameHeight(60);
@@ -0,0 +1,29 @@
+// Streamlit 컴포넌트 통신 (frontend/streamlit.js와 같은 파일 - 컴포넌트마다 정적 폴더가 따로라서 복사)
+const Streamlit = (function () {
+    const renderListeners = [];
+
+    function send(type, data) {
+        window.parent.postMessage(Object.assign({ isStreamlitMessage: true, type: type }, data), '*');
+    }
+
+    window.addEventListener('message', (event) => {
+        if (event.data && event.data.type === 'streamlit:render') {
+            renderListeners.forEach((listener) => listener(event.data.args || {}));
+        }
+    });
+
+    return {
+        onRender(listener) {
+            renderListeners.push(listener);
+        },
+        ready() {
+            send('streamlit:componentReady', { apiVersion: 1 });
+        },
+        setFrameHeight(height) {
+            send('streamlit:setFrameHeight', { height: height });
+        },
+        setComponentValue(value) {
+            send('streamlit:setComponentValue', { value: value, dataType: 'json' });
+        }
+    };
+})();
@@ -0,0 +1,300 @@
+"""브라우저 게임과 같은 규칙의 테트리스 엔진 (화면 없이 실행)
+
+보드의 각 줄은 10비트 정수(비트 x = 왼쪽에서 x번째 칸)로 저장하므로 충돌 검사와
+줄 제거가 비트 연산으로 끝납니다. 블록 회전표, 등장 위치, 점수/레벨/속도 계산은
+tetris_component/frontend/tetris.js와 똑같이 맞춰야 합니다.
+"""
+import random
+
+from piece_rng import piece_source
+
+BOARD_WIDTH = 10
+BOARD_HEIGHT = 20
+FULL_ROW = (1 << BOARD_WIDTH) - 1
+SPAWN_X = BOARD_WIDTH // 2 - 1
+
+# 게임 속도 설정 (ms)
+SPEEDS = {
+    "Easy": 800,
+    "Normal": 500,
+    "Hard": 300,
+}
+
+# 테트리스 블록 정의 (tetris.js의 pieces와 같은 순서/회전)
+PIECES = [
+    # I
+    [[[1, 1, 1, 1]]],
+    # O
+    [[[1, 1], [1, 1]]],
+    # T
+    [[[0, 1, 0], [1, 1, 1]], [[1, 0], [1, 1], [1, 0]], [[1, 1, 1], [0, 1, 0]], [[0, 1], [1, 1], [0, 1]]],
+    # S
+    [[[0, 1, 1], [1, 1, 0]], [[1, 0], [1, 1], [0, 1]]],
+    # Z
+    [[[1, 1, 0], [0, 1, 1]], [[0, 1], [1, 1], [1, 0]]],
+    # J
+    [[[1, 0, 0], [1, 1, 1]], [[1, 1], [1, 0], [1, 0]], [[1, 1, 1], [0, 0, 1]], [[0, 1], [0, 1], [1, 1]]],
+    # L
+    [[[0, 0, 1], [1, 1, 1]], [[1, 0], [1, 0], [1, 1]], [[1, 1, 1], [1, 0, 0]], [[1, 1], [0, 1], [0, 1]]],
+]
+
+PIECE_NAMES = "IOTSZJL"
+
+
+def _row_bits(row):
+    return sum(1 << x for x, cell in enumerate(row) if cell)
+
+
+def _build_masks():
+    """MASKS[piece][rotation][x] = 열 x에 놓았을 때의 줄별 비트마스크 (범위 밖이면 None)"""
+    masks = []
+    for rotations in PIECES:
+        piece_masks = []
+        for shape in rotations:
+            width = len(shape[0])
+            bits = [_row_bits(row) for row in shape]
+            piece_masks.append([tuple(b << x for b in bits) if x <= BOARD_WIDTH - width else None
+                                for x in range(BOARD_WIDTH)])
+        masks.append(piece_masks)
+    return masks
+
+
+def _build_skirts():
+    """SKIRTS[piece][rotation] = ((열 오프셋, 그 열의 가장 아래 칸 오프셋, 그 열의 비트), ...)"""
+    skirts = []
+    for rotations in PIECES:
+        piece_skirts = []
+        for shape in rotations:
+            skirt = []
+            for dx in range(len(shape[0])):
+                cells = [dy for dy, row in enumerate(shape) if row[dx]]
+                skirt.append((dx, max(cells), sum(1 << dy for dy in cells)))
+            piece_skirts.append(tuple(skirt))
+        skirts.append(piece_skirts)
+    return skirts
+
+
+MASKS = _build_masks()
+SKIRTS = _build_skirts()
+
+
+def random_source(rng):
+    """Math.random()처럼 0~6을 고르는 블록 생성 함수"""
+    count = len(PIECES)
+    return lambda: rng.randrange(count)
+
+
+class TetrisGame:
+    """한 판의 게임 상태
+
+    next_piece는 다음 블록 번호(0~6)를 돌려주는 함수입니다. 지정하지 않으면
+    브라우저의 Math.random()처럼 무작위로 고릅니다.
+    """
+
+    def __init__(self, mode="Normal", start_level=1, next_piece=None):
+        if next_piece is None:
+            next_piece = random_source(random.Random())
+        self.mode = mode
+        self.start_level = start_level
+        self.board = [0] * BOARD_HEIGHT
+        # 열별 비트마스크 (비트 y = y번째 줄이 차 있음) - 낙하 거리 계산용
+        self.columns = [0] * BOARD_WIDTH
+        self.score = 0
+        self.level = start_level
+        self.lines = 0
+        self.pieces_placed = 0
+        self.over = False
+        self._next_piece = next_piece
+        # startGame()처럼 현재 블록을 먼저, 다음 블록을 나중에 생성
+        self._spawn(next_piece())
+        self.next_piece = next_piece()
+
+    @property
+    def drop_speed(self):
+        """현재 낙하 간격 (ms)"""
+        return max(SPEEDS[self.mode] - (self.level - self.start_level) * 50, 100)
+
+    def _spawn(self, piece):
+        self.piece = piece
+        self.rotation = 0
+        self.x = SPAWN_X
+        self.y = 0
+
+    # ---- 충돌 검사 ----
+
+    def fits(self, rotation, x, y):
+        """블록(현재 종류)을 해당 위치에 놓을 수 있는지"""
+        if x < 0 or x >= BOARD_WIDTH:
+            return False
+        rows = MASKS[self.piece][rotation][x]
+        if rows is None or y + len(rows) > BOARD_HEIGHT:
+            return False
+        board = self.board
+        for i, bits in enumerate(rows):
+            if board[y + i] & bits:
+                return False
+        return True
+
+    def can_move(self, dx, dy, rotation=None):
+        """tetris.js의 canMove와 같은 판정"""
+        if rotation is None:
+            rotation = self.rotation
+        return self.fits(rotation, self.x + dx, self.y + dy)
+
+    def drop_distance(self):
+        """현재 블록이 바로 아래로 떨어질 수 있는 칸 수
+
+        블록이 차지하는 각 열에서 블록 바닥 아래의 첫 번째 찬 칸을 열 비트마스크로
+        바로 찾으므로 줄을 하나씩 내려 보지 않습니다.
+        """
+        columns = self.columns
+        x = self.x
+        y = self.y
+        distance = BOARD_HEIGHT
+        for dx, bottom, _ in SKIRTS[self.piece][self.rotation]:
+            start = y + bottom + 1
+            below = columns[x + dx] >> start
+            if below:
+                gap = (below & -below).bit_length() - 1
+            else:
+                gap = BOARD_HEIGHT - start
+            if gap < distance:
+                distance = gap
+        return distance
+
+    # ---- 조작 ----
+
+    def move_left(self):
+        if not self.over and self.can_move(-1, 0):
+            self.x -= 1
+            return True
+        return False
+
+    def move_right(self):
+        if not self.over and self.can_move(1, 0):
+            self.x += 1
+            return True
+        return False
+
+    def soft_drop(self):
+        if not self.over and self.can_move(0, 1):
+            self.y += 1
+            return True
+        return False
+
+    def rotate(self):
+        if self.over:
+            return False
+        next_rotation = (self.rotation + 1) % len(PIECES[self.piece])
+        if self.can_move(0, 0, next_rotation):
+            self.rotation = next_rotation
+            return True
+        return False
+
+    def hard_drop(self):
+        """바닥까지 내리기 (브라우저와 같이 고정은 다음 tick에서)"""
+        if self.over:
+            return False
+        self.y += self.drop_distance()
+        return True
+
+    def tick(self):
+        """중력 한 번 - 내려갈 수 없으면 블록 고정"""
+        if self.over:
+            return
+        if self.can_move(0, 1):
+            self.y += 1
+        else:
+            self.place_piece()
+
+    # ---- 고정/줄 제거 ----
+
+    def place_piece(self):
+        """tetris.js의 placePiece: 고정 → 줄 제거 → 다음 블록 → 게임 오버 판정"""
+        piece = self.piece
+        rotation = self.rotation
+        x = self.x
+        y = self.y
+        board = self.board
+        columns = self.columns
+        rows = MASKS[piece][rotation][x]
+        full = False
+        for i, bits in enumerate(rows):
+            row = board[y + i] | bits
+            board[y + i] = row
+            if row == FULL_ROW:
+                full = True
+        for dx, _, cells in SKIRTS[piece][rotation]:
+            columns[x + dx] |= cells << y
+        if full:
+            self._clear_lines(y, y + len(rows))
+        self.pieces_placed += 1
+
+        self._spawn(self.next_piece)
+        self.next_piece = self._next_piece()
+        board = self.board
+        for i, bits in enumerate(MASKS[self.piece][0][SPAWN_X]):
+            if board[i] & bits:
+                self.over = True
+                break
+
+    def _clear_lines(self, top, bottom):
+        """top~bottom-1 줄 중 가득 찬 줄 제거 (다른 줄은 바뀌지 않았으므로 검사 생략)"""
+        board = self.board
+        full = [y for y in range(top, bottom) if board[y] == FULL_ROW]
+        if not full:
+            return 0
+        cleared = len(full)
+        self.board = [0] * cleared + [row for row in board if row != FULL_ROW]
+        # 열 비트마스크에서도 지운 줄을 빼고 위쪽 비트를 한 칸씩 내림 (위 줄부터)
+        columns = self.columns
+        for y in full:
+            above = (1 << y) - 1
+            for x in range(BOARD_WIDTH):
+                col = columns[x]
+                columns[x] = ((col & above) << 1) | (col >> (y + 1) << (y + 1))
+
+        self.lines += cleared
+        self.score += cleared * 100 * self.level
+        self.level = self.lines // 10 + self.start_level
+        return cleared
+
+    def drop_at(self, rotation, x):
+        """등장 위치에서 회전/좌우 이동 없이 곧바로 (rotation, x)에 떨어뜨려 고정
+
+        놓을 수 없는 위치면 False. 봇/벤치마크용 빠른 경로입니다.
+        """
+        if self.over or not self.fits(rotation, x, self.y):
+            return False
+        self.rotation = rotation
+        self.x = x
+        self.y += self.drop_distance()
+        self.place_piece()
+        return True
+
+
+# 입력 기록 문자 → 조작 (tetris.js의 recordInput과 같은 문자)
+ACTIONS = {
+    "L": TetrisGame.move_left,
+    "R": TetrisGame.move_right,
+    "D": TetrisGame.soft_drop,
+    "U": TetrisGame.rotate,
+    "H": TetrisGame.hard_drop,
+    "G": TetrisGame.tick,
+}
+
+
+def replay(seed, log, mode="Normal", start_level=1, randomizer="random"):
+    """시드와 입력 기록으로 게임을 다시 실행
+
+    기록이 게임 오버 뒤에도 이어지거나 모르는 문자가 있으면 ValueError.
+    """
+    game = TetrisGame(mode, start_level, piece_source(seed, randomizer))
+    for i, action in enumerate(log):
+        if game.over:
+            raise ValueError("게임 오버 뒤에 입력이 %d개 더 있습니다" % (len(log) - i))
+        try:
+            ACTIONS[action](game)
+        except KeyError:
+            raise ValueError("알 수 없는 입력: %r" % action) from None
+    return game
@@ -0,0 +1,31 @@
+"""프로세스 간 변경 번호 - 저장소가 바뀔 때마다 1씩 늘리는 작은 파일"""
+import os
+
+
+class VersionFile:
+    """여러 프로세스가 함께 보는 변경 번호
+
+    저장소는 파일을 바꿀 때마다 잠금 파일을 잡은 채로 bump()하고, 각 프로세스의
+    캐시는 read()한 값이 지난번과 다르면 다시 읽습니다. 번호는 임시 파일에 쓴 뒤
+    원자적으로 교체하므로 잠금 없이 읽어도 쓰다 만 값을 보지 않습니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def read(self):
+        """지금 번호 (파일이 없으면 0)"""
+        try:
+            with open(self.path, "rb") as f:
+                return int(f.read() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def bump(self):
+        """번호를 1 늘리고 새 번호 반환 (잠금 파일을 잡은 상태에서 호출)"""
+        value = self.read() + 1
+        tmp_path = "%s.%d.tmp" % (self.path, os.getpid())
+        with open(tmp_path, "w") as f:
+            f.write(str(value))
+        os.replace(tmp_path, self.path)
+        return value